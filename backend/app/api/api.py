@@ -5,17 +5,36 @@
 Configuração do roteador principal da API
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
-from app.api.endpoints import pacientes, prontuarios, estabelecimentos, vacinacao, funcionarios, autenticacao
+from app.api import deps
+from app.api.endpoints import pacientes, prontuarios, estabelecimentos, vacinacao, funcionarios, autenticacao, monitoramento
 
 # Roteador principal que agrupa todos os endpoints da API
 api_router = APIRouter()
 
+# O token, quando presente, é verificado nas requisições aos dados, para que a
+# auditoria registre o funcionário que os acessou. O login fica de fora: um
+# token expirado enviado junto com as credenciais não deve impedir um novo login
+_usuario_opcional = [Depends(deps.get_optional_user)]
+
 # Inclusão dos roteadores específicos por entidade/funcionalidade
 api_router.include_router(autenticacao.router, tags=["autenticação"])
-api_router.include_router(pacientes.router, prefix="/pacientes", tags=["pacientes"])
-api_router.include_router(prontuarios.router, prefix="/prontuarios", tags=["prontuários"])
-api_router.include_router(estabelecimentos.router, prefix="/estabelecimentos", tags=["estabelecimentos"])
-api_router.include_router(vacinacao.router, prefix="/vacinacao", tags=["vacinação"])
-api_router.include_router(funcionarios.router, prefix="/funcionarios", tags=["funcionários"]) 
\ No newline at end of file
+api_router.include_router(
+    pacientes.router, prefix="/pacientes", tags=["pacientes"], dependencies=_usuario_opcional
+)
+api_router.include_router(
+    prontuarios.router, prefix="/prontuarios", tags=["prontuários"], dependencies=_usuario_opcional
+)
+api_router.include_router(
+    estabelecimentos.router, prefix="/estabelecimentos", tags=["estabelecimentos"], dependencies=_usuario_opcional
+)
+api_router.include_router(
+    vacinacao.router, prefix="/vacinacao", tags=["vacinação"], dependencies=_usuario_opcional
+)
+api_router.include_router(
+    funcionarios.router, prefix="/funcionarios", tags=["funcionários"], dependencies=_usuario_opcional
+)
+api_router.include_router(
+    monitoramento.router, prefix="/monitoramento", tags=["monitoramento"], dependencies=_usuario_opcional
+) 
\ No newline at end of file
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Carregadores por requisição (no estilo DataLoader) para resolver entidades relacionadas
+"""
+
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Type
+
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.crud.base import CRUDBase
+
+
+class Carregador:
+    """
+    Carrega registros de um modelo pela chave primária, agrupando os pedidos.
+
+    As chaves pedidas enquanto o carregamento não começa (por exemplo, por várias
+    corrotinas em um asyncio.gather) são buscadas juntas, com uma única consulta
+    ``= ANY(array)``; os resultados, inclusive as chaves inexistentes (None),
+    ficam memorizados até o fim da requisição.
+    """
+
+    def __init__(self, db: AsyncSession, crud: CRUDBase, trava: asyncio.Lock):
+        self.db = db
+        self.crud = crud
+        self._trava = trava
+        self._futuros: Dict[Any, asyncio.Future] = {}
+        self._pendentes: Dict[Any, asyncio.Future] = {}
+        self._despacho: Optional[asyncio.Task] = None
+
+    async def carregar(self, id: Any) -> Optional[Any]:
+        """
+        Retorna o registro da chave, ou None se ele não existir.
+        """
+        return (await self.carregar_varios([id]))[0]
+
+    async def carregar_varios(self, ids: Iterable[Any]) -> List[Optional[Any]]:
+        """
+        Retorna os registros das chaves, na mesma ordem (None para as inexistentes
+        e para chaves None).
+        """
+        futuros = [None if id is None else self._pedir(id) for id in ids]
+        await asyncio.gather(*{futuro for futuro in futuros if futuro is not None and not futuro.done()})
+        return [None if futuro is None else futuro.result() for futuro in futuros]
+
+    def _pedir(self, id: Any) -> asyncio.Future:
+        # Uma chave já pedida (carregada, em carregamento ou à espera do lote) reaproveita o mesmo futuro
+        futuro = self._futuros.get(id)
+        if futuro is None:
+            futuro = self._futuros[id] = self._pendentes[id] = asyncio.get_running_loop().create_future()
+            if self._despacho is None:
+                self._despacho = asyncio.create_task(self._despachar())
+        return futuro
+
+    async def _despachar(self):
+        # Cede a vez uma rodada, para que os pedidos das demais corrotinas entrem no lote
+        await asyncio.sleep(0)
+        pendentes, self._pendentes, self._despacho = self._pendentes, {}, None
+        try:
+            # A sessão da requisição não aceita comandos simultâneos
+            async with self._trava:
+                registros = await self.crud.get_many(self.db, pendentes)
+        except Exception as erro:
+            # Falhas não são memorizadas: um novo pedido das mesmas chaves consulta de novo
+            for id, futuro in pendentes.items():
+                del self._futuros[id]
+                futuro.set_exception(erro)
+            return
+        por_id = {getattr(registro, self.crud.pk.key): registro for registro in registros}
+        for id, futuro in pendentes.items():
+            futuro.set_result(por_id.get(id))
+
+
+class Carregadores:
+    """
+    Carregadores de uma requisição, um por modelo, que compartilham a sessão.
+    Obtido pela dependência deps.get_carregadores.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._trava = asyncio.Lock()
+        self._carregadores: Dict[type, Carregador] = {}
+
+    def de(self, model: Type[Any]) -> Carregador:
+        """
+        Retorna o carregador do modelo, criado no primeiro uso.
+        """
+        carregador = self._carregadores.get(model)
+        if carregador is None:
+            carregador = self._carregadores[model] = Carregador(self.db, CRUDBase(model), self._trava)
+        return carregador
+
+    async def preencher(self, objetos: Sequence[Any], relacionamento: str) -> List[Optional[Any]]:
+        """
+        Preenche um relacionamento muitos-para-um (por exemplo, "estabelecimento"
+        de Funcionario) em todos os objetos com uma única consulta, sem o
+        carregamento preguiçoso por linha. Retorna os registros relacionados, na
+        ordem dos objetos.
+        """
+        if not objetos:
+            return []
+        propriedade = inspect(type(objetos[0])).relationships[relacionamento]
+        (coluna,) = propriedade.local_columns
+        chave = propriedade.parent.get_property_by_column(coluna).key
+        relacionados = await self.de(propriedade.mapper.class_).carregar_varios(
+            getattr(objeto, chave) for objeto in objetos
+        )
+        for objeto, relacionado in zip(objetos, relacionados):
+            set_committed_value(objeto, relacionamento, relacionado)
+        return relacionados
@@ -5,36 +5,103 @@
 Dependências para os endpoints da API
 """
 
-from typing import Generator, Optional
+from typing import AsyncGenerator, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.api.carregadores import Carregadores
+from app.db.session import get_async_db
 from app.core.config import settings
+from app.core.documentos import normalizar_cpf, normalizar_sus
+from app.schemas.autenticacao import UsuarioAtual
+from app.services import autenticacao
 
 # Esquema de autenticação OAuth2 com password
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login/access-token")
+# O mesmo esquema, para endpoints que também aceitam requisições sem token
+oauth2_scheme_opcional = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login/access-token", auto_error=False)
 
 
-# Função placeholder para autenticação de usuário
-# Na implementação real, você validaria o token JWT e retornaria o usuário
-def get_current_user():
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    Placeholder para obter o usuário atual.
-    Na implementação real, validaria o token JWT e retornaria o usuário.
+    Dependência que fornece uma sessão assíncrona do banco de dados aos endpoints.
     """
-    # Este é um placeholder - na implementação real você validaria o token
-    # e retornaria o usuário correspondente
-    return {"id": "placeholder", "is_active": True, "is_superuser": False}
+    async for db in get_async_db():
+        yield db
 
 
-def get_current_active_user(current_user = Depends(get_current_user)):
+def get_carregadores(db: AsyncSession = Depends(get_db)) -> Carregadores:
+    """
+    Carregadores da requisição (um por modelo), que agrupam e memorizam as
+    buscas de entidades relacionadas; a mesma instância serve a todas as
+    dependências da requisição.
+    """
+    return Carregadores(db)
+
+
+async def _usuario_da_requisicao(request: Request, token: str) -> UsuarioAtual:
+    usuario = await autenticacao.usuario_do_token(token)
+    if usuario is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido ou expirado",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    # Funcionário registrado na auditoria dos acessos (app.services.auditoria)
+    request.state.funcionario_id = usuario.funcionario_id
+    return usuario
+
+
+async def get_current_user(request: Request, token: str = Depends(oauth2_scheme)) -> UsuarioAtual:
+    """
+    Retorna o funcionário autenticado pelo token de acesso (401 sem token ou com token inválido).
+    """
+    return await _usuario_da_requisicao(request, token)
+
+
+async def get_optional_user(
+    request: Request, token: Optional[str] = Depends(oauth2_scheme_opcional)
+) -> Optional[UsuarioAtual]:
+    """
+    Retorna o funcionário autenticado, ou None se a requisição não tiver token.
+    Um token presente mas inválido é recusado (401).
+    """
+    if token is None:
+        return None
+    return await _usuario_da_requisicao(request, token)
+
+
+def _documento_normalizado(normalizar, valor: str) -> str:
+    try:
+        return normalizar(valor)
+    except ValueError as erro:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(erro),
+        )
+
+
+def cpf_normalizado(cpf: str) -> str:
+    """
+    CPF do caminho, com ou sem pontuação, no formato gravado no banco (422 se inválido).
+    """
+    return _documento_normalizado(normalizar_cpf, cpf)
+
+
+def sus_normalizado(sus_numero: str) -> str:
+    """
+    Número do SUS do caminho, com ou sem separadores, no formato gravado no banco (422 se inválido).
+    """
+    return _documento_normalizado(normalizar_sus, sus_numero)
+
+
+def get_current_active_user(current_user: UsuarioAtual = Depends(get_current_user)) -> UsuarioAtual:
     """
     Verifica se o usuário atual está ativo.
     """
-    if not current_user.get("is_active", False):
+    if not current_user.ativo:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Usuário inativo",
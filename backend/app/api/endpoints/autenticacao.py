@@ -7,25 +7,43 @@ Endpoints para autenticação
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.core.documentos import normalizar_cpf
+from app.core.security import criar_token_acesso
+from app.schemas.autenticacao import Token, UsuarioAtual
+from app.services import autenticacao
 
 router = APIRouter()
 
 
-@router.post("/login/access-token")
-async def login_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
+@router.post("/login/access-token", response_model=Token)
+async def login_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    Autenticação OAuth2 de um funcionário: o usuário é o CPF (com ou sem pontuação) e a senha é
+    verificada com o hash bcrypt. Retorna um token JWT de acesso.
+    """
+    try:
+        cpf = normalizar_cpf(form_data.username)
+    except ValueError:
+        cpf = form_data.username
+    funcionario = await autenticacao.autenticar(db, cpf, form_data.password)
+    if funcionario is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Credenciais inválidas",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return Token(access_token=criar_token_acesso(funcionario.funcionario_id))
+
+
+@router.post("/login/test-token", response_model=UsuarioAtual)
+async def testar_token(usuario: UsuarioAtual = Depends(deps.get_current_active_user)):
     """
-    Endpoint simples para autenticação OAuth2 (placeholder)
+    Retorna o funcionário do token de acesso
     """
-    # Em uma implementação real, verificaríamos as credenciais no banco de dados
-    # e retornaríamos um token JWT
-    if form_data.username == "admin" and form_data.password == "admin":
-        return {
-            "access_token": "placeholder_token",
-            "token_type": "bearer",
-        }
-    
-    raise HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Credenciais inválidas",
-        headers={"WWW-Authenticate": "Bearer"},
-    ) 
\ No newline at end of file
+    return usuario
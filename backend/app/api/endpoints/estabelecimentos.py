@@ -6,133 +6,206 @@ Endpoints para gerenciamento de estabelecimentos
 """
 
 from typing import List, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import TypeAdapter
 
+from app import crud
 from app.api import deps
+from app.api.lote import buscar_lote
+from app.api.paginacao import fechar_pagina, paginar_por_chave
+from app.api.respostas import resposta_em_cache, resposta_json
+from app.core import cache
+from app.db.busca import consulta_busca
+from app.db.erros import restricao_violada
 from app.db.models.estabelecimento import Estabelecimento
 from app.schemas import estabelecimento as schemas
+from app.schemas.lote import IdsLote, ResultadoLote
+from app.services.exportacao import resposta_exportacao
 
 router = APIRouter()
 
+_estabelecimento_adapter = TypeAdapter(schemas.Estabelecimento)
+_estabelecimentos_adapter = TypeAdapter(List[schemas.EstabelecimentoList])
+_lote_estabelecimentos_adapter = TypeAdapter(ResultadoLote[schemas.Estabelecimento])
+
+
+def _invalidar_cache_estabelecimentos(estabelecimento_id: Optional[UUID] = None):
+    """
+    Remove do cache o estabelecimento alterado e todas as listagens de estabelecimentos.
+    """
+    if estabelecimento_id is not None:
+        cache.estabelecimentos.invalidar(("id", estabelecimento_id))
+    cache.estabelecimentos.invalidar_grupo("lista")
+
+
+def _traduzir_erro_estabelecimento(erro: IntegrityError):
+    if restricao_violada(erro) == "estabelecimentos_cnes_key":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Já existe um estabelecimento com este CNES"
+        )
+    raise erro
+
 
 @router.get("/", response_model=List[schemas.EstabelecimentoList])
 async def listar_estabelecimentos(
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
-    tipo: Optional[str] = Query(None, description="Filtrar por tipo (POSTO, HOSPITAL, UPA, OUTRO)")
+    tipo: Optional[str] = Query(None, description="Filtrar por tipo (POSTO, HOSPITAL, UPA, OUTRO)"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)")
 ):
     """
-    Retorna a lista de estabelecimentos de saúde.
+    Retorna a lista de estabelecimentos de saúde, ordenada por nome.
     Opcionalmente filtra por tipo.
     """
-    query = db.query(Estabelecimento)
+    query = select(Estabelecimento)
+    
+    if tipo:
+        query = query.where(Estabelecimento.tipo == tipo)
+    
+    chave = ("lista", tipo, skip, limit, cursor)
+    return await _paginar_estabelecimentos(db, query, request, response, chave, cursor=cursor, skip=skip, limit=limit)
+
+
+@router.get("/busca", response_model=List[schemas.EstabelecimentoList])
+async def buscar_estabelecimentos(
+    termo: str = Query(..., min_length=2, description="Trecho ou nome aproximado do estabelecimento"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(deps.get_db)
+):
+    """
+    Busca estabelecimentos por nome, tolerando erros de digitação e acentos,
+    dos mais parecidos com o termo para os menos parecidos.
+    """
+    query = consulta_busca(select(Estabelecimento), Estabelecimento.nome, termo, limit)
+    return (await db.execute(query)).scalars().all()
+
+
+@router.get("/exportar")
+async def exportar_estabelecimentos(
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson ou csv"),
+    tipo: Optional[str] = Query(None, description="Filtrar por tipo (POSTO, HOSPITAL, UPA, OUTRO)")
+):
+    """
+    Exporta os estabelecimentos em streaming, ordenados por nome.
+    Declarado antes de /{estabelecimento_id} para não ser capturado por ele.
+    """
+    query = select(*Estabelecimento.__table__.columns)
     
     if tipo:
-        query = query.filter(Estabelecimento.tipo == tipo)
+        query = query.where(Estabelecimento.tipo == tipo)
+    
+    query = query.order_by(Estabelecimento.nome, Estabelecimento.estabelecimento_id)
     
-    estabelecimentos = query.offset(skip).limit(limit).all()
-    return estabelecimentos
+    return resposta_exportacao(query, formato, _estabelecimento_adapter, "estabelecimentos")
+
+
+@router.post("/lote", response_model=ResultadoLote[schemas.Estabelecimento])
+async def ler_estabelecimentos_em_lote(
+    lote: IdsLote,
+    db: AsyncSession = Depends(deps.get_db)
+):
+    """
+    Obtém vários estabelecimentos pelos IDs em uma única consulta, na ordem pedida.
+    IDs inexistentes são devolvidos em nao_encontrados.
+    """
+    return resposta_json(_lote_estabelecimentos_adapter, await buscar_lote(db, crud.estabelecimento, lote.ids))
 
 
 @router.get("/{estabelecimento_id}", response_model=schemas.Estabelecimento)
 async def ler_estabelecimento(
-    estabelecimento_id: str,
-    db: Session = Depends(deps.get_db)
+    estabelecimento_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
     Obtém um estabelecimento pelo ID.
     """
-    estabelecimento = db.query(Estabelecimento).filter(Estabelecimento.estabelecimento_id == estabelecimento_id).first()
-    if not estabelecimento:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Estabelecimento não encontrado"
-        )
-    return estabelecimento
+    async def gerar():
+        estabelecimento = await crud.estabelecimento.get(db, estabelecimento_id)
+        if not estabelecimento:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Estabelecimento não encontrado"
+            )
+        return resposta_json(_estabelecimento_adapter, estabelecimento)
+    
+    return await resposta_em_cache(cache.estabelecimentos, ("id", estabelecimento_id), gerar, request)
 
 
 @router.post("/", response_model=schemas.Estabelecimento, status_code=status.HTTP_201_CREATED)
 async def criar_estabelecimento(
     estabelecimento_in: schemas.EstabelecimentoCreate,
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
     Cria um novo estabelecimento de saúde.
+    A unicidade do CNES é garantida pela restrição da tabela.
     """
-    # Verificar se já existe estabelecimento com o mesmo CNES
-    db_estabelecimento = db.query(Estabelecimento).filter(Estabelecimento.cnes == estabelecimento_in.cnes).first()
-    if db_estabelecimento:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Já existe um estabelecimento com este CNES"
-        )
-    
-    # Criar novo estabelecimento
-    novo_estabelecimento = Estabelecimento(
-        nome=estabelecimento_in.nome,
-        tipo=estabelecimento_in.tipo,
-        cnes=estabelecimento_in.cnes,
-        endereco=estabelecimento_in.endereco,
-        telefone=estabelecimento_in.telefone,
-        email=estabelecimento_in.email,
-        horario_funcionamento=estabelecimento_in.horario_funcionamento
-    )
-    
-    db.add(novo_estabelecimento)
-    db.commit()
-    db.refresh(novo_estabelecimento)
+    try:
+        novo_estabelecimento = await crud.estabelecimento.create(db, obj_in=estabelecimento_in)
+    except IntegrityError as erro:
+        await db.rollback()
+        _traduzir_erro_estabelecimento(erro)
+    _invalidar_cache_estabelecimentos()
     
     return novo_estabelecimento
 
 
 @router.put("/{estabelecimento_id}", response_model=schemas.Estabelecimento)
 async def atualizar_estabelecimento(
-    estabelecimento_id: str,
+    estabelecimento_id: UUID,
     estabelecimento_in: schemas.EstabelecimentoUpdate,
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
     Atualiza um estabelecimento de saúde.
     """
-    estabelecimento = db.query(Estabelecimento).filter(Estabelecimento.estabelecimento_id == estabelecimento_id).first()
+    try:
+        estabelecimento = await crud.estabelecimento.update(db, id=estabelecimento_id, obj_in=estabelecimento_in)
+    except IntegrityError as erro:
+        await db.rollback()
+        _traduzir_erro_estabelecimento(erro)
     if not estabelecimento:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Estabelecimento não encontrado"
         )
-    
-    # Atualizar campos
-    update_data = estabelecimento_in.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(estabelecimento, key, value)
-    
-    db.add(estabelecimento)
-    db.commit()
-    db.refresh(estabelecimento)
+    _invalidar_cache_estabelecimentos(estabelecimento_id)
     
     return estabelecimento
 
 
 @router.delete("/{estabelecimento_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remover_estabelecimento(
-    estabelecimento_id: str,
-    db: Session = Depends(deps.get_db)
+    estabelecimento_id: UUID,
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
-    Remove um estabelecimento de saúde.
+    Remove um estabelecimento de saúde sem registros vinculados.
     """
-    estabelecimento = db.query(Estabelecimento).filter(Estabelecimento.estabelecimento_id == estabelecimento_id).first()
+    try:
+        estabelecimento = await crud.estabelecimento.remove(db, id=estabelecimento_id)
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Não é possível remover este estabelecimento pois ele possui funcionários, prontuários ou registros de vacinação"
+        )
     if not estabelecimento:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Estabelecimento não encontrado"
         )
-    
-    db.delete(estabelecimento)
-    db.commit()
+    _invalidar_cache_estabelecimentos(estabelecimento_id)
     
     return None
 
@@ -140,9 +213,12 @@ async def remover_estabelecimento(
 @router.get("/tipo/{tipo}", response_model=List[schemas.EstabelecimentoList])
 async def listar_estabelecimentos_por_tipo(
     tipo: str,
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)")
 ):
     """
     Retorna a lista de estabelecimentos de saúde por tipo específico.
@@ -154,5 +230,25 @@ async def listar_estabelecimentos_por_tipo(
             detail="Tipo de estabelecimento inválido. Use POSTO, HOSPITAL, UPA ou OUTRO"
         )
     
-    estabelecimentos = db.query(Estabelecimento).filter(Estabelecimento.tipo == tipo).offset(skip).limit(limit).all()
-    return estabelecimentos 
\ No newline at end of file
+    query = select(Estabelecimento).where(Estabelecimento.tipo == tipo)
+    chave = ("lista", tipo, skip, limit, cursor)
+    return await _paginar_estabelecimentos(db, query, request, response, chave, cursor=cursor, skip=skip, limit=limit)
+
+
+async def _paginar_estabelecimentos(
+    db: AsyncSession, query, request: Request, response: Response, chave_cache, *, cursor, skip, limit
+):
+    """
+    Aplica a paginação por chave (nome, estabelecimento_id) às listagens de estabelecimentos.
+    As páginas ficam no cache de estabelecimentos até a próxima alteração de um estabelecimento.
+    """
+    async def gerar():
+        chave = [Estabelecimento.nome, Estabelecimento.estabelecimento_id]
+        paginada = paginar_por_chave(query, chave, cursor=cursor, skip=skip, limit=limit)
+        estabelecimentos = (await db.execute(paginada)).scalars().all()
+        pagina = fechar_pagina(
+            estabelecimentos, limit, lambda e: (e.nome, e.estabelecimento_id), response
+        )
+        return resposta_json(_estabelecimentos_adapter, pagina, response)
+    
+    return await resposta_em_cache(cache.estabelecimentos, chave_cache, gerar, request)
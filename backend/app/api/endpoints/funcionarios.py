@@ -5,19 +5,63 @@
 Endpoints para gerenciamento de funcionários
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from uuid import UUID
 
+from fastapi import APIRouter, Depends, Query, Response
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
 from app.api import deps
+from app.api.carregadores import Carregadores
+from app.api.lote import buscar_lote
+from app.api.paginacao import fechar_pagina, paginar_por_chave
+from app.api.respostas import resposta_json
+from app.db.models.funcionario import Funcionario
+from app.schemas import funcionario as schemas
+from app.schemas.lote import IdsLote, ResultadoLote
 
 router = APIRouter()
 
+_funcionarios_adapter = TypeAdapter(List[schemas.FuncionarioDetalhado])
+_lote_funcionarios_adapter = TypeAdapter(ResultadoLote[schemas.Funcionario])
+
 
-@router.get("/")
+@router.get("/", response_model=List[schemas.FuncionarioDetalhado])
 async def listar_funcionarios(
-    db: Session = Depends(deps.get_db),
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
+    carregadores: Carregadores = Depends(deps.get_carregadores),
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    estabelecimento_id: Optional[UUID] = Query(None, description="Filtrar por estabelecimento"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)"),
+):
+    """
+    Retorna a lista de funcionários, ordenada por nome, com o estabelecimento
+    de cada um. Os estabelecimentos da página são lidos com uma única consulta.
+    """
+    query = select(Funcionario)
+    if estabelecimento_id:
+        query = query.where(Funcionario.estabelecimento_id == estabelecimento_id)
+    query = paginar_por_chave(
+        query, [Funcionario.nome, Funcionario.funcionario_id], cursor=cursor, skip=skip, limit=limit
+    )
+    funcionarios = (await db.execute(query)).scalars().all()
+    pagina = fechar_pagina(funcionarios, limit, lambda f: (f.nome, f.funcionario_id), response)
+    await carregadores.preencher(pagina, "estabelecimento")
+    return resposta_json(_funcionarios_adapter, pagina, response)
+
+
+@router.post("/lote", response_model=ResultadoLote[schemas.Funcionario])
+async def ler_funcionarios_em_lote(
+    lote: IdsLote,
+    db: AsyncSession = Depends(deps.get_db),
 ):
     """
-    Endpoint placeholder para listar funcionários
+    Obtém vários funcionários pelos IDs em uma única consulta, na ordem pedida.
+    IDs inexistentes são devolvidos em nao_encontrados.
     """
-    return {"message": "Endpoint para listar funcionários (placeholder)"} 
\ No newline at end of file
+    return resposta_json(_lote_funcionarios_adapter, await buscar_lote(db, crud.funcionario, lote.ids))
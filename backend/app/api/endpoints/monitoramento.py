@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Endpoints para monitoramento da aplicação
+"""
+
+from fastapi import APIRouter
+
+from app.core.cache import estatisticas_caches
+from app.core.config import settings
+from app.db.session import estatisticas_pools
+from app.services.auditoria import registro_auditoria
+from app.services.invalidacao_cache import ouvinte_alteracoes
+from app.services.particoes import manutencao_particoes
+from app.services.resumo_prontuarios import atualizador_resumo
+
+router = APIRouter()
+
+
+@router.get("/pool")
+async def metricas_pool():
+    """
+    Retorna a configuração e as métricas de uso dos pools de conexões do processo.
+    Útil para dimensionar DB_POOL_SIZE e DB_MAX_OVERFLOW a partir de dados reais.
+    """
+    return {
+        "configuracao": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        },
+        "pools": estatisticas_pools(),
+    }
+
+
+@router.get("/cache")
+async def metricas_cache():
+    """
+    Retorna a ocupação, os limites e os acertos/falhas dos caches em memória do processo
+    e o estado da escuta das notificações de alteração (invalidação entre workers).
+    """
+    return {
+        "caches": estatisticas_caches(),
+        "invalidacao": ouvinte_alteracoes.resumo(),
+    }
+
+
+@router.get("/visoes")
+async def metricas_visoes():
+    """
+    Retorna o estado da atualização periódica das views materializadas,
+    incluindo o momento da última atualização (feita por qualquer worker).
+    """
+    return {atualizador_resumo.visao: await atualizador_resumo.resumo()}
+
+
+@router.get("/particoes")
+async def metricas_particoes():
+    """
+    Retorna o estado da manutenção das partições mensais (criação das próximas e
+    arquivamento das antigas) e as partições atuais de cada tabela.
+    """
+    return await manutencao_particoes.resumo()
+
+
+@router.get("/auditoria")
+async def metricas_auditoria():
+    """
+    Retorna a profundidade da fila de auditoria e os contadores de eventos
+    registrados, gravados, descartados (fila cheia) e perdidos (falhas de gravação).
+    """
+    return registro_auditoria.resumo()
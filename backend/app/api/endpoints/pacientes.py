@@ -5,97 +5,201 @@
 Endpoints para gerenciamento de pacientes
 """
 
-from typing import Any, List
+from typing import List, Optional
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app import crud
 from app.api import deps
-from app.db import models
+from app.api.lote import buscar_lote
+from app.api.paginacao import fechar_pagina, paginar_por_chave
+from app.api.respostas import resposta_json
+from app.db.erros import restricao_violada
+from app.db.models.paciente import Paciente
 from app.schemas import paciente as schemas
+from app.schemas.lote import IdsLote, ResultadoLote
+from app.services.auditoria import auditar
 
 router = APIRouter()
 
+_paciente_adapter = TypeAdapter(schemas.Paciente)
+_pacientes_adapter = TypeAdapter(List[schemas.Paciente])
+_lote_pacientes_adapter = TypeAdapter(ResultadoLote[schemas.Paciente])
 
-@router.get("/")
+# Violações de restrição de pacientes traduzidas em respostas HTTP
+_ERROS_PACIENTE = {
+    "pacientes_cpf_key": (status.HTTP_400_BAD_REQUEST, "Já existe um paciente com este CPF"),
+    "pacientes_sus_numero_key": (status.HTTP_400_BAD_REQUEST, "Já existe um paciente com este número do SUS"),
+}
+
+
+def _traduzir_erro_paciente(erro: IntegrityError):
+    restricao = restricao_violada(erro)
+    if restricao in _ERROS_PACIENTE:
+        status_code, detail = _ERROS_PACIENTE[restricao]
+        raise HTTPException(status_code=status_code, detail=detail)
+    raise erro
+
+
+async def _paciente_ou_404(request: Request, paciente: Optional[Paciente]) -> Response:
+    if paciente is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Paciente não encontrado"
+        )
+    await auditar(request, "leitura_paciente", (paciente.paciente_id,))
+    return resposta_json(_paciente_adapter, paciente, request=request)
+
+
+@router.get("/", response_model=List[schemas.Paciente])
 async def listar_pacientes(
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)"),
 ):
     """
-    Retorna a lista de pacientes.
+    Retorna a lista de pacientes, ordenada por nome.
     """
-    # Por enquanto, retornamos uma resposta estática
-    return {"message": "Endpoint para listar pacientes (placeholder)"}
+    chave = [Paciente.nome, Paciente.paciente_id]
+    query = paginar_por_chave(select(Paciente), chave, cursor=cursor, skip=skip, limit=limit)
+    pacientes = (await db.execute(query)).scalars().all()
+    pagina = fechar_pagina(pacientes, limit, lambda p: (p.nome, p.paciente_id), response)
+    await auditar(request, "listagem_pacientes", (paciente.paciente_id for paciente in pagina))
+    return resposta_json(_pacientes_adapter, pagina, response)
 
 
-@router.post("/")
+@router.post("/", response_model=schemas.Paciente, status_code=status.HTTP_201_CREATED)
 async def criar_paciente(
-    *,
-    db: Session = Depends(deps.get_db),
+    paciente_in: schemas.PacienteCreate,
+    db: AsyncSession = Depends(deps.get_db),
 ):
     """
-    Cria um novo paciente.
+    Cria um novo paciente. CPF e número do SUS são gravados normalizados,
+    e a unicidade de ambos é garantida pelas restrições da tabela.
     """
-    return {"message": "Endpoint para criar paciente (placeholder)"}
+    try:
+        return await crud.paciente.create(db, obj_in=paciente_in)
+    except IntegrityError as erro:
+        await db.rollback()
+        _traduzir_erro_paciente(erro)
+
+
+@router.get("/busca", response_model=List[schemas.Paciente])
+async def buscar_pacientes(
+    request: Request,
+    termo: str = Query(..., min_length=2, description="Trecho ou nome aproximado do paciente"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    Busca pacientes por nome, tolerando erros de digitação e acentos,
+    dos mais parecidos com o termo para os menos parecidos.
+    """
+    pacientes = await crud.paciente.search(db, termo, limit=limit)
+    await auditar(request, "busca_paciente", (paciente.paciente_id for paciente in pacientes))
+    return pacientes
 
 
-@router.get("/{paciente_id}")
-async def ler_paciente(
-    *,
-    paciente_id: str,
-    db: Session = Depends(deps.get_db),
+@router.post("/lote", response_model=ResultadoLote[schemas.Paciente])
+async def ler_pacientes_em_lote(
+    request: Request,
+    lote: IdsLote,
+    db: AsyncSession = Depends(deps.get_db),
 ):
     """
-    Obtém um paciente por ID.
+    Obtém vários pacientes pelos IDs em uma única consulta, na ordem pedida.
+    IDs inexistentes são devolvidos em nao_encontrados.
     """
-    return {"message": f"Endpoint para ler paciente com ID {paciente_id} (placeholder)"}
+    resultado = await buscar_lote(db, crud.paciente, lote.ids)
+    await auditar(request, "leitura_paciente", (paciente.paciente_id for paciente in resultado["itens"]))
+    return resposta_json(_lote_pacientes_adapter, resultado)
 
 
-@router.put("/{paciente_id}")
-async def atualizar_paciente(
-    *,
-    paciente_id: str,
-    db: Session = Depends(deps.get_db),
+@router.get("/cpf/{cpf}", response_model=schemas.Paciente)
+async def ler_paciente_por_cpf(
+    request: Request,
+    cpf: str = Depends(deps.cpf_normalizado),
+    db: AsyncSession = Depends(deps.get_db),
 ):
     """
-    Atualiza um paciente.
+    Obtém um paciente por CPF, com ou sem pontuação.
     """
-    return {"message": f"Endpoint para atualizar paciente com ID {paciente_id} (placeholder)"}
+    return await _paciente_ou_404(request, await crud.paciente.get_by_cpf(db, cpf))
 
 
-@router.delete("/{paciente_id}")
-async def remover_paciente(
-    *,
-    paciente_id: str,
-    db: Session = Depends(deps.get_db),
+@router.get("/sus/{sus_numero}", response_model=schemas.Paciente)
+async def ler_paciente_por_sus(
+    request: Request,
+    sus_numero: str = Depends(deps.sus_normalizado),
+    db: AsyncSession = Depends(deps.get_db),
 ):
     """
-    Remove um paciente.
+    Obtém um paciente por número do SUS, com ou sem separadores.
     """
-    return {"message": f"Endpoint para remover paciente com ID {paciente_id} (placeholder)"}
+    return await _paciente_ou_404(request, await crud.paciente.get_by_sus_numero(db, sus_numero))
 
 
-@router.get("/cpf/{cpf}")
-async def ler_paciente_por_cpf(
-    *,
-    cpf: str,
-    db: Session = Depends(deps.get_db),
+@router.get("/{paciente_id}", response_model=schemas.Paciente)
+async def ler_paciente(
+    request: Request,
+    paciente_id: UUID,
+    db: AsyncSession = Depends(deps.get_db),
 ):
     """
-    Obtém um paciente por CPF.
+    Obtém um paciente por ID.
     """
-    return {"message": f"Endpoint para ler paciente com CPF {cpf} (placeholder)"}
+    return await _paciente_ou_404(request, await crud.paciente.get(db, paciente_id))
 
 
-@router.get("/sus/{sus_numero}")
-async def ler_paciente_por_sus(
-    *,
-    sus_numero: str,
-    db: Session = Depends(deps.get_db),
+@router.put("/{paciente_id}", response_model=schemas.Paciente)
+async def atualizar_paciente(
+    paciente_id: UUID,
+    paciente_in: schemas.PacienteUpdate,
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    Atualiza um paciente.
+    """
+    try:
+        paciente = await crud.paciente.update(db, id=paciente_id, obj_in=paciente_in)
+    except IntegrityError as erro:
+        await db.rollback()
+        _traduzir_erro_paciente(erro)
+    if paciente is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Paciente não encontrado"
+        )
+    return paciente
+
+
+@router.delete("/{paciente_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remover_paciente(
+    paciente_id: UUID,
+    db: AsyncSession = Depends(deps.get_db),
 ):
     """
-    Obtém um paciente por número do SUS.
+    Remove um paciente sem prontuários, vacinações ou acessos registrados.
     """
-    return {"message": f"Endpoint para ler paciente com número SUS {sus_numero} (placeholder)"} 
\ No newline at end of file
+    try:
+        paciente = await crud.paciente.remove(db, id=paciente_id)
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Paciente possui prontuários, vacinações ou acessos registrados e não pode ser removido"
+        )
+    if paciente is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Paciente não encontrado"
+        )
+    return None
@@ -5,19 +5,152 @@
 Endpoints para gerenciamento de prontuários
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
+from app.api.respostas import resposta_json
+from app.schemas import prontuario as schemas
+from app.services.auditoria import auditar
+from app.services.prontuario_completo import obter_prontuario_completo
+from app.services.resumo_prontuarios import obter_resumo
 
 router = APIRouter()
 
+_DESCRICAO_TEMPO_REAL = (
+    "Usa os totais mantidos a cada escrita em vez da view materializada "
+    "(atualizada periodicamente)"
+)
+
+_prontuario_completo_adapter = TypeAdapter(schemas.ProntuarioCompleto)
+
+# Limites das listas do prontuário completo (os registros mais recentes primeiro)
+_LIMITE_ATENDIMENTOS = Query(50, ge=1, le=500, description="Máximo de atendimentos, dos mais recentes")
+_LIMITE_VACINACOES = Query(100, ge=1, le=500, description="Máximo de vacinações, das mais recentes")
+
 
 @router.get("/")
 async def listar_prontuarios(
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
 ):
     """
     Endpoint placeholder para listar prontuários
     """
-    return {"message": "Endpoint para listar prontuários (placeholder)"} 
\ No newline at end of file
+    return {"message": "Endpoint para listar prontuários (placeholder)"}
+
+
+@router.get("/resumo/{paciente_id}", response_model=schemas.ResumoProntuario)
+async def ler_resumo_prontuario(
+    request: Request,
+    paciente_id: UUID,
+    tempo_real: bool = Query(False, description=_DESCRICAO_TEMPO_REAL),
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    Obtém o resumo do prontuário de um paciente pelo ID.
+    """
+    return await _resumo_ou_404(request, db, "paciente_id", paciente_id, tempo_real)
+
+
+@router.get("/resumo/cpf/{cpf}", response_model=schemas.ResumoProntuario)
+async def ler_resumo_prontuario_por_cpf(
+    request: Request,
+    cpf: str = Depends(deps.cpf_normalizado),
+    tempo_real: bool = Query(False, description=_DESCRICAO_TEMPO_REAL),
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    Obtém o resumo do prontuário de um paciente pelo CPF.
+    """
+    return await _resumo_ou_404(request, db, "cpf", cpf, tempo_real)
+
+
+@router.get("/resumo/sus/{sus_numero}", response_model=schemas.ResumoProntuario)
+async def ler_resumo_prontuario_por_sus(
+    request: Request,
+    sus_numero: str = Depends(deps.sus_normalizado),
+    tempo_real: bool = Query(False, description=_DESCRICAO_TEMPO_REAL),
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    Obtém o resumo do prontuário de um paciente pelo número do SUS.
+    """
+    return await _resumo_ou_404(request, db, "sus_numero", sus_numero, tempo_real)
+
+
+async def _resumo_ou_404(request: Request, db: AsyncSession, campo: str, valor, tempo_real: bool):
+    resumo = await obter_resumo(db, campo, valor, tempo_real)
+    if resumo is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Prontuário do paciente não encontrado"
+        )
+    await auditar(request, "resumo_prontuario", [resumo["paciente_id"]], resumo["prontuario_id"])
+    return resumo
+
+
+@router.get("/completo/{paciente_id}", response_model=schemas.ProntuarioCompleto)
+async def ler_prontuario_completo(
+    request: Request,
+    paciente_id: UUID,
+    limite_atendimentos: int = _LIMITE_ATENDIMENTOS,
+    limite_vacinacoes: int = _LIMITE_VACINACOES,
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    Obtém o prontuário completo de um paciente pelo ID: atendimentos (com
+    prescrições e exames) e vacinações.
+    """
+    return await _prontuario_completo_ou_404(
+        request, db, "paciente_id", paciente_id, limite_atendimentos, limite_vacinacoes
+    )
+
+
+@router.get("/completo/cpf/{cpf}", response_model=schemas.ProntuarioCompleto)
+async def ler_prontuario_completo_por_cpf(
+    request: Request,
+    cpf: str = Depends(deps.cpf_normalizado),
+    limite_atendimentos: int = _LIMITE_ATENDIMENTOS,
+    limite_vacinacoes: int = _LIMITE_VACINACOES,
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    Obtém o prontuário completo de um paciente pelo CPF.
+    """
+    return await _prontuario_completo_ou_404(
+        request, db, "cpf", cpf, limite_atendimentos, limite_vacinacoes
+    )
+
+
+@router.get("/completo/sus/{sus_numero}", response_model=schemas.ProntuarioCompleto)
+async def ler_prontuario_completo_por_sus(
+    request: Request,
+    sus_numero: str = Depends(deps.sus_normalizado),
+    limite_atendimentos: int = _LIMITE_ATENDIMENTOS,
+    limite_vacinacoes: int = _LIMITE_VACINACOES,
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    Obtém o prontuário completo de um paciente pelo número do SUS.
+    """
+    return await _prontuario_completo_ou_404(
+        request, db, "sus_numero", sus_numero, limite_atendimentos, limite_vacinacoes
+    )
+
+
+async def _prontuario_completo_ou_404(
+    request: Request, db: AsyncSession, campo: str, valor, limite_atendimentos: int, limite_vacinacoes: int
+):
+    prontuario = await obter_prontuario_completo(
+        db, campo, valor, limite_atendimentos=limite_atendimentos, limite_vacinacoes=limite_vacinacoes
+    )
+    if prontuario is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Paciente não encontrado"
+        )
+    await auditar(request, "prontuario_completo", [prontuario["paciente"]["paciente_id"]])
+    return resposta_json(_prontuario_completo_adapter, prontuario, request=request)
@@ -5,161 +5,225 @@
 Endpoints para gerenciamento de vacinação
 """
 
-from typing import List, Optional
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from fastapi import APIRouter, Body, Depends, File, HTTPException, Request, Response, UploadFile, status, Query
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from pydantic import TypeAdapter
 
+from app import crud
 from app.api import deps
+from app.api.lote import buscar_lote
+from app.api.paginacao import fechar_pagina, paginar_por_chave
+from app.api.respostas import resposta_em_cache, resposta_json
+from app.core import cache
+from app.core.config import settings
+from app.db.busca import consulta_busca, contem
 from app.db.models.vacina import Vacina
-from app.db.models.carteira_vacinacao import CarteiraVacinacao
+from app.db.erros import restricao_violada
+from app.db.models.carteira_vacinacao import CarteiraVacinacao, UQ_CARTEIRA_VACINACAO_DOSE
 from app.db.models.paciente import Paciente
 from app.db.models.estabelecimento import Estabelecimento
 from app.db.models.funcionario import Funcionario
 from app.schemas import vacina as vacina_schemas
 from app.schemas import carteira_vacinacao as vacinacao_schemas
+from app.schemas.lote import IdsLote, ResultadoLote
+from app.services.auditoria import auditar
+from app.services.exportacao import resposta_exportacao
+from app.services.importacao_vacinacao import importar_vacinacoes, registros_csv
 
 router = APIRouter()
 
 # ENDPOINTS PARA VACINAS
 
+_vacina_adapter = TypeAdapter(vacina_schemas.Vacina)
+_vacinas_adapter = TypeAdapter(List[vacina_schemas.Vacina])
+_lote_vacinas_adapter = TypeAdapter(ResultadoLote[vacina_schemas.Vacina])
+
+
+def _invalidar_cache_vacinas(vacina_id: Optional[UUID] = None):
+    """
+    Remove do cache a vacina alterada e todas as listagens de vacinas.
+    """
+    if vacina_id is not None:
+        cache.vacinas.invalidar(("id", vacina_id))
+    cache.vacinas.invalidar_grupo("lista")
+
+
 @router.get("/vacinas/", response_model=List[vacina_schemas.Vacina])
 async def listar_vacinas(
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
     skip: int = 0,
     limit: int = 100,
     nome: Optional[str] = Query(None, description="Filtrar por nome da vacina"),
-    fabricante: Optional[str] = Query(None, description="Filtrar por fabricante")
+    fabricante: Optional[str] = Query(None, description="Filtrar por fabricante"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)")
 ):
     """
-    Retorna a lista de vacinas disponíveis.
-    Opcionalmente filtra por nome ou fabricante.
+    Retorna a lista de vacinas disponíveis, ordenada por nome.
+    Opcionalmente filtra por trecho do nome ou do fabricante, sem diferenciar acentos.
+    As páginas ficam no cache de vacinas até a próxima alteração de uma vacina.
     """
-    query = db.query(Vacina)
-    
-    if nome:
-        query = query.filter(Vacina.nome.ilike(f"%{nome}%"))
-    
-    if fabricante:
-        query = query.filter(Vacina.fabricante.ilike(f"%{fabricante}%"))
+    async def gerar():
+        query = select(Vacina)
+        
+        if nome:
+            query = query.where(contem(Vacina.nome, nome))
+        
+        if fabricante:
+            query = query.where(contem(Vacina.fabricante, fabricante))
+        
+        query = paginar_por_chave(
+            query, [Vacina.nome, Vacina.vacina_id], cursor=cursor, skip=skip, limit=limit
+        )
+        vacinas = (await db.execute(query)).scalars().all()
+        pagina = fechar_pagina(vacinas, limit, lambda v: (v.nome, v.vacina_id), response)
+        return resposta_json(_vacinas_adapter, pagina, response)
     
-    vacinas = query.offset(skip).limit(limit).all()
-    return vacinas
+    chave = ("lista", nome, fabricante, skip, limit, cursor)
+    return await resposta_em_cache(cache.vacinas, chave, gerar, request)
+
+
+@router.get("/vacinas/busca", response_model=List[vacina_schemas.Vacina])
+async def buscar_vacinas(
+    termo: str = Query(..., min_length=2, description="Trecho ou nome aproximado da vacina"),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(deps.get_db)
+):
+    """
+    Busca vacinas por nome, tolerando erros de digitação e acentos,
+    das mais parecidas com o termo para as menos parecidas.
+    """
+    query = consulta_busca(select(Vacina), Vacina.nome, termo, limit)
+    return (await db.execute(query)).scalars().all()
+
+
+@router.post("/vacinas/lote", response_model=ResultadoLote[vacina_schemas.Vacina])
+async def ler_vacinas_em_lote(
+    lote: IdsLote,
+    db: AsyncSession = Depends(deps.get_db)
+):
+    """
+    Obtém várias vacinas pelos IDs em uma única consulta, na ordem pedida.
+    IDs inexistentes são devolvidos em nao_encontrados.
+    """
+    return resposta_json(_lote_vacinas_adapter, await buscar_lote(db, crud.vacina, lote.ids))
 
 
 @router.get("/vacinas/{vacina_id}", response_model=vacina_schemas.Vacina)
 async def ler_vacina(
-    vacina_id: str,
-    db: Session = Depends(deps.get_db)
+    vacina_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
     Obtém uma vacina pelo ID.
     """
-    vacina = db.query(Vacina).filter(Vacina.vacina_id == vacina_id).first()
-    if not vacina:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Vacina não encontrada"
-        )
-    return vacina
+    async def gerar():
+        vacina = await crud.vacina.get(db, vacina_id)
+        if not vacina:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Vacina não encontrada"
+            )
+        return resposta_json(_vacina_adapter, vacina)
+    
+    return await resposta_em_cache(cache.vacinas, ("id", vacina_id), gerar, request)
 
 
 @router.post("/vacinas/", response_model=vacina_schemas.Vacina, status_code=status.HTTP_201_CREATED)
 async def criar_vacina(
     vacina_in: vacina_schemas.VacinaCreate,
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
     Cria uma nova vacina.
     """
-    nova_vacina = Vacina(
-        nome=vacina_in.nome,
-        fabricante=vacina_in.fabricante,
-        lote=vacina_in.lote,
-        validade=vacina_in.validade
-    )
-    
-    db.add(nova_vacina)
-    db.commit()
-    db.refresh(nova_vacina)
+    nova_vacina = await crud.vacina.create(db, obj_in=vacina_in)
+    _invalidar_cache_vacinas()
     
     return nova_vacina
 
 
 @router.put("/vacinas/{vacina_id}", response_model=vacina_schemas.Vacina)
 async def atualizar_vacina(
-    vacina_id: str,
+    vacina_id: UUID,
     vacina_in: vacina_schemas.VacinaUpdate,
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
     Atualiza uma vacina.
     """
-    vacina = db.query(Vacina).filter(Vacina.vacina_id == vacina_id).first()
+    vacina = await crud.vacina.update(db, id=vacina_id, obj_in=vacina_in)
     if not vacina:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Vacina não encontrada"
         )
-    
-    # Atualizar campos
-    update_data = vacina_in.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(vacina, key, value)
-    
-    db.add(vacina)
-    db.commit()
-    db.refresh(vacina)
+    _invalidar_cache_vacinas(vacina_id)
     
     return vacina
 
 
 @router.delete("/vacinas/{vacina_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remover_vacina(
-    vacina_id: str,
-    db: Session = Depends(deps.get_db)
+    vacina_id: UUID,
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
-    Remove uma vacina.
+    Remove uma vacina. O uso da vacina na carteira de vacinação é verificado
+    pela chave estrangeira, no próprio DELETE.
     """
-    vacina = db.query(Vacina).filter(Vacina.vacina_id == vacina_id).first()
+    try:
+        vacina = await crud.vacina.remove(db, id=vacina_id)
+    except IntegrityError as erro:
+        await db.rollback()
+        if restricao_violada(erro) == "carteira_vacinacao_vacina_id_fkey":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Não é possível remover esta vacina pois ela está sendo utilizada em registros de vacinação"
+            )
+        raise
     if not vacina:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Vacina não encontrada"
         )
-    
-    # Verificar se a vacina está sendo usada na carteira de vacinação
-    vacinacao = db.query(CarteiraVacinacao).filter(CarteiraVacinacao.vacina_id == vacina_id).first()
-    if vacinacao:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Não é possível remover esta vacina pois ela está sendo utilizada em registros de vacinação"
-        )
-    
-    db.delete(vacina)
-    db.commit()
+    _invalidar_cache_vacinas(vacina_id)
     
     return None
 
 
 # ENDPOINTS PARA CARTEIRA DE VACINAÇÃO
 
-@router.get("/carteira/", response_model=List[vacinacao_schemas.CarteiraVacinacaoCompleta])
-async def listar_vacinacoes(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
-    paciente_id: Optional[str] = Query(None, description="Filtrar por ID do paciente")
-):
+# Adaptadores que validam e serializam as linhas projetadas em uma única passagem
+_carteira_completa_adapter = TypeAdapter(List[vacinacao_schemas.CarteiraVacinacaoCompleta])
+_carteira_paciente_adapter = TypeAdapter(vacinacao_schemas.CarteiraVacinacaoPaciente)
+_carteira_exportacao_adapter = TypeAdapter(vacinacao_schemas.CarteiraVacinacaoCompleta)
+
+
+def _consulta_carteira_completa():
     """
-    Retorna os registros de vacinação.
-    Opcionalmente filtra por paciente.
+    Consulta da carteira de vacinação com os nomes das entidades relacionadas.
+    Projeta apenas as colunas do schema CarteiraVacinacaoCompleta, sem carregar
+    objetos ORM, para que as linhas possam ser serializadas diretamente.
     """
-    query = db.query(
-        CarteiraVacinacao,
+    return select(
+        CarteiraVacinacao.vacinacao_id,
+        CarteiraVacinacao.paciente_id,
+        CarteiraVacinacao.vacina_id,
+        CarteiraVacinacao.funcionario_id,
+        CarteiraVacinacao.estabelecimento_id,
+        CarteiraVacinacao.data_aplicacao,
+        CarteiraVacinacao.dose,
+        CarteiraVacinacao.observacoes,
+        CarteiraVacinacao.data_cadastro,
         Paciente.nome.label("nome_paciente"),
         Vacina.nome.label("nome_vacina"),
         Estabelecimento.nome.label("nome_estabelecimento"),
@@ -174,39 +238,90 @@ async def listar_vacinacoes(
     ).join(
         Funcionario, CarteiraVacinacao.funcionario_id == Funcionario.funcionario_id
     )
+
+
+@router.get("/carteira/", response_model=List[vacinacao_schemas.CarteiraVacinacaoCompleta])
+async def listar_vacinacoes(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(deps.get_db),
+    skip: int = 0,
+    limit: int = 100,
+    paciente_id: Optional[UUID] = Query(None, description="Filtrar por ID do paciente"),
+    cursor: Optional[str] = Query(None, description="Cursor da próxima página (cabeçalho X-Next-Cursor)")
+):
+    """
+    Retorna os registros de vacinação, dos mais recentes para os mais antigos.
+    Opcionalmente filtra por paciente.
+    Com o cursor, o custo de qualquer página é o mesmo da primeira.
+    """
+    query = _consulta_carteira_completa()
     
     if paciente_id:
-        query = query.filter(CarteiraVacinacao.paciente_id == paciente_id)
+        query = query.where(CarteiraVacinacao.paciente_id == paciente_id)
     
-    result = query.offset(skip).limit(limit).all()
+    query = paginar_por_chave(
+        query,
+        [CarteiraVacinacao.data_aplicacao, CarteiraVacinacao.vacinacao_id],
+        cursor=cursor,
+        skip=skip,
+        limit=limit,
+        descendente=True,
+    )
+    vacinacoes = fechar_pagina(
+        (await db.execute(query)).mappings().all(),
+        limit,
+        lambda row: (row["data_aplicacao"], row["vacinacao_id"]),
+        response,
+    )
     
-    # Transformar resultados em objetos CarteiraVacinacaoCompleta
-    vacinacoes = []
-    for row in result:
-        vacinacao = row[0]  # CarteiraVacinacao
-        vacinacao_completa = vacinacao_schemas.CarteiraVacinacaoCompleta(
-            **vacinacao.__dict__,
-            nome_paciente=row.nome_paciente,
-            nome_vacina=row.nome_vacina,
-            nome_estabelecimento=row.nome_estabelecimento,
-            tipo_estabelecimento=row.tipo_estabelecimento,
-            nome_funcionario=row.nome_funcionario
-        )
-        vacinacoes.append(vacinacao_completa)
+    await auditar(request, "carteira_vacinacao", (vacinacao["paciente_id"] for vacinacao in vacinacoes))
+    return resposta_json(_carteira_completa_adapter, vacinacoes, response, request)
+
+
+@router.get("/carteira/exportar")
+async def exportar_vacinacoes(
+    formato: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson ou csv"),
+    estabelecimento_id: Optional[UUID] = Query(None, description="Filtrar por estabelecimento"),
+    vacina_id: Optional[UUID] = Query(None, description="Filtrar por vacina"),
+    data_inicio: Optional[date] = Query(None, description="Aplicações a partir desta data (inclusive)"),
+    data_fim: Optional[date] = Query(None, description="Aplicações até esta data (inclusive)")
+):
+    """
+    Exporta os registros de vacinação em streaming, em ordem de aplicação.
+    As linhas são lidas do banco em partições por um cursor do lado do servidor,
+    então a memória não cresce com o volume exportado.
+    """
+    query = _consulta_carteira_completa()
+    
+    if estabelecimento_id:
+        query = query.where(CarteiraVacinacao.estabelecimento_id == estabelecimento_id)
     
-    return vacinacoes
+    if vacina_id:
+        query = query.where(CarteiraVacinacao.vacina_id == vacina_id)
+    
+    if data_inicio:
+        query = query.where(CarteiraVacinacao.data_aplicacao >= datetime.combine(data_inicio, time.min))
+    
+    if data_fim:
+        query = query.where(CarteiraVacinacao.data_aplicacao < datetime.combine(data_fim + timedelta(days=1), time.min))
+    
+    query = query.order_by(CarteiraVacinacao.data_aplicacao, CarteiraVacinacao.vacinacao_id)
+    
+    return resposta_exportacao(query, formato, _carteira_exportacao_adapter, "carteira_vacinacao")
 
 
 @router.get("/carteira/paciente/{paciente_id}", response_model=vacinacao_schemas.CarteiraVacinacaoPaciente)
 async def ler_carteira_paciente(
-    paciente_id: str,
-    db: Session = Depends(deps.get_db)
+    paciente_id: UUID,
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
     Obtém a carteira de vacinação completa de um paciente.
     """
     # Verificar se o paciente existe
-    paciente = db.query(Paciente).filter(Paciente.paciente_id == paciente_id).first()
+    paciente = await crud.paciente.get(db, paciente_id)
     if not paciente:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -214,118 +329,88 @@ async def ler_carteira_paciente(
         )
     
     # Buscar todas as vacinas do paciente
-    query = db.query(
-        CarteiraVacinacao,
-        Paciente.nome.label("nome_paciente"),
-        Vacina.nome.label("nome_vacina"),
-        Estabelecimento.nome.label("nome_estabelecimento"),
-        Estabelecimento.tipo.label("tipo_estabelecimento"),
-        Funcionario.nome.label("nome_funcionario")
-    ).join(
-        Paciente, CarteiraVacinacao.paciente_id == Paciente.paciente_id
-    ).join(
-        Vacina, CarteiraVacinacao.vacina_id == Vacina.vacina_id
-    ).join(
-        Estabelecimento, CarteiraVacinacao.estabelecimento_id == Estabelecimento.estabelecimento_id
-    ).join(
-        Funcionario, CarteiraVacinacao.funcionario_id == Funcionario.funcionario_id
-    ).filter(
+    query = _consulta_carteira_completa().where(
         CarteiraVacinacao.paciente_id == paciente_id
     ).order_by(
         CarteiraVacinacao.data_aplicacao.desc()
     )
     
-    result = query.all()
-    
-    # Transformar resultados em objetos CarteiraVacinacaoCompleta
-    vacinacoes = []
-    for row in result:
-        vacinacao = row[0]  # CarteiraVacinacao
-        vacinacao_completa = vacinacao_schemas.CarteiraVacinacaoCompleta(
-            **vacinacao.__dict__,
-            nome_paciente=row.nome_paciente,
-            nome_vacina=row.nome_vacina,
-            nome_estabelecimento=row.nome_estabelecimento,
-            tipo_estabelecimento=row.tipo_estabelecimento,
-            nome_funcionario=row.nome_funcionario
-        )
-        vacinacoes.append(vacinacao_completa)
+    vacinacoes = (await db.execute(query)).mappings().all()
+    await auditar(request, "carteira_vacinacao", [paciente_id])
     
     # Retornar paciente e suas vacinações
-    return vacinacao_schemas.CarteiraVacinacaoPaciente(
-        paciente=paciente,
-        vacinacoes=vacinacoes
+    return resposta_json(
+        _carteira_paciente_adapter,
+        {"paciente": paciente, "vacinacoes": vacinacoes},
+        request=request,
     )
 
 
+# Restrições da tabela carteira_vacinacao e as respostas correspondentes
+_ERROS_REGISTRO_VACINACAO = {
+    "carteira_vacinacao_paciente_id_fkey": (status.HTTP_404_NOT_FOUND, "Paciente não encontrado"),
+    "carteira_vacinacao_vacina_id_fkey": (status.HTTP_404_NOT_FOUND, "Vacina não encontrada"),
+    "carteira_vacinacao_funcionario_id_fkey": (status.HTTP_404_NOT_FOUND, "Funcionário não encontrado"),
+    "carteira_vacinacao_estabelecimento_id_fkey": (status.HTTP_404_NOT_FOUND, "Estabelecimento não encontrado"),
+}
+
+
 @router.post("/carteira/", response_model=vacinacao_schemas.CarteiraVacinacao, status_code=status.HTTP_201_CREATED)
 async def registrar_vacinacao(
     vacinacao_in: vacinacao_schemas.CarteiraVacinacaoCreate,
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
     Registra uma nova aplicação de vacina na carteira de vacinação.
+
+    A existência de paciente, vacina, funcionário e estabelecimento e a unicidade
+    da dose são garantidas pelas restrições da tabela: o registro é feito com um
+    único INSERT ... RETURNING e as violações são traduzidas em respostas HTTP.
     """
-    # Verificar se o paciente existe
-    paciente = db.query(Paciente).filter(Paciente.paciente_id == vacinacao_in.paciente_id).first()
-    if not paciente:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Paciente não encontrado"
-        )
-    
-    # Verificar se a vacina existe
-    vacina = db.query(Vacina).filter(Vacina.vacina_id == vacinacao_in.vacina_id).first()
-    if not vacina:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Vacina não encontrada"
-        )
-    
-    # Verificar se o funcionário existe
-    funcionario = db.query(Funcionario).filter(Funcionario.funcionario_id == vacinacao_in.funcionario_id).first()
-    if not funcionario:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Funcionário não encontrado"
-        )
-    
-    # Verificar se o estabelecimento existe
-    estabelecimento = db.query(Estabelecimento).filter(Estabelecimento.estabelecimento_id == vacinacao_in.estabelecimento_id).first()
-    if not estabelecimento:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Estabelecimento não encontrado"
-        )
-    
-    # Verificar se já existe um registro igual (mesma vacina, mesma dose e mesmo paciente)
-    vacinacao_existente = db.query(CarteiraVacinacao).filter(
-        and_(
-            CarteiraVacinacao.paciente_id == vacinacao_in.paciente_id,
-            CarteiraVacinacao.vacina_id == vacinacao_in.vacina_id,
-            CarteiraVacinacao.dose == vacinacao_in.dose
-        )
-    ).first()
-    
-    if vacinacao_existente:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Paciente já recebeu esta dose ({vacinacao_in.dose}) desta vacina"
-        )
-    
-    # Criar novo registro de vacinação
-    nova_vacinacao = CarteiraVacinacao(
-        paciente_id=vacinacao_in.paciente_id,
-        vacina_id=vacinacao_in.vacina_id,
-        funcionario_id=vacinacao_in.funcionario_id,
-        estabelecimento_id=vacinacao_in.estabelecimento_id,
-        data_aplicacao=vacinacao_in.data_aplicacao,
-        dose=vacinacao_in.dose,
-        observacoes=vacinacao_in.observacoes
-    )
+    try:
+        nova_vacinacao = await crud.carteira_vacinacao.create(db, obj_in=vacinacao_in)
+    except IntegrityError as erro:
+        await db.rollback()
+        restricao = restricao_violada(erro)
+        
+        # Verificar se já existe um registro igual (mesma vacina, mesma dose e mesmo paciente)
+        if restricao == UQ_CARTEIRA_VACINACAO_DOSE:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Paciente já recebeu esta dose ({vacinacao_in.dose}) desta vacina"
+            )
+        if restricao in _ERROS_REGISTRO_VACINACAO:
+            status_code, detail = _ERROS_REGISTRO_VACINACAO[restricao]
+            raise HTTPException(status_code=status_code, detail=detail)
+        raise
     
-    db.add(nova_vacinacao)
-    db.commit()
-    db.refresh(nova_vacinacao)
-    
-    return nova_vacinacao 
\ No newline at end of file
+    return nova_vacinacao
+
+
+@router.post("/carteira/lote", response_model=vacinacao_schemas.ResultadoImportacao)
+async def importar_vacinacoes_json(
+    registros: List[Dict[str, Any]] = Body(..., description="Registros no formato de CarteiraVacinacaoCreate"),
+    db: AsyncSession = Depends(deps.get_db)
+):
+    """
+    Importa em lote registros de vacinação enviados como um array JSON.
+    Registros inválidos não interrompem a importação: são devolvidos com o
+    número da linha (posição no array, a partir de 1) e o motivo.
+    """
+    return await importar_vacinacoes(db, registros, settings.IMPORTACAO_TAMANHO_LOTE)
+
+
+@router.post("/carteira/lote/csv", response_model=vacinacao_schemas.ResultadoImportacao)
+async def importar_vacinacoes_csv(
+    arquivo: UploadFile = File(..., description="CSV com cabeçalho contendo os campos de CarteiraVacinacaoCreate"),
+    db: AsyncSession = Depends(deps.get_db)
+):
+    """
+    Importa em lote registros de vacinação enviados em um arquivo CSV.
+    O número da linha dos erros corresponde ao registro (a primeira linha após o cabeçalho é 1).
+    """
+    try:
+        registros = registros_csv(await arquivo.read())
+    except ValueError as erro:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(erro))
+    return await importar_vacinacoes(db, registros, settings.IMPORTACAO_TAMANHO_LOTE)
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Busca em lote por ID para os endpoints POST .../lote
+"""
+
+from typing import Any, Dict, List, Sequence
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+
+
+async def buscar_lote(db: AsyncSession, crud: CRUDBase, ids: Sequence[UUID]) -> Dict[str, List[Any]]:
+    """
+    Busca os registros dos IDs com uma única consulta e monta o ResultadoLote:
+    os registros na ordem dos IDs pedidos (sem repetições) e os IDs inexistentes,
+    que não invalidam o restante do lote.
+    """
+    itens = await crud.get_many(db, ids)
+    encontrados = {getattr(item, crud.pk.key) for item in itens}
+    nao_encontrados = [id for id in dict.fromkeys(ids) if id not in encontrados]
+    return {"itens": itens, "nao_encontrados": nao_encontrados}
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Paginação por chave (keyset/cursor) para as listagens da API
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+from uuid import UUID
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import literal, tuple_
+from sqlalchemy.sql import Select
+
+# Cabeçalho em que o cursor da próxima página é devolvido ao cliente
+CABECALHO_PROXIMO_CURSOR = "X-Next-Cursor"
+
+
+def _serializar(valor: Any) -> Any:
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    if isinstance(valor, UUID):
+        return str(valor)
+    return valor
+
+
+def _converter(coluna, valor: Any) -> Any:
+    tipo = coluna.type.python_type
+    if tipo is datetime:
+        return datetime.fromisoformat(valor)
+    if tipo is date:
+        return date.fromisoformat(valor)
+    if tipo is UUID:
+        return UUID(valor)
+    return tipo(valor)
+
+
+def codificar_cursor(valores: Sequence[Any]) -> str:
+    """
+    Codifica os valores da chave da última linha em um cursor opaco
+    """
+    dados = json.dumps([_serializar(v) for v in valores], separators=(",", ":"))
+    return base64.urlsafe_b64encode(dados.encode()).decode().rstrip("=")
+
+
+def decodificar_cursor(cursor: str, colunas: Sequence) -> List[Any]:
+    """
+    Decodifica um cursor opaco nos valores tipados das colunas da chave
+    """
+    try:
+        preenchimento = "=" * (-len(cursor) % 4)
+        valores = json.loads(base64.urlsafe_b64decode(cursor + preenchimento))
+        if len(valores) != len(colunas):
+            raise ValueError(cursor)
+        return [_converter(coluna, valor) for coluna, valor in zip(colunas, valores)]
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginação inválido"
+        )
+
+
+def paginar_por_chave(
+    query: Select,
+    colunas: Sequence,
+    *,
+    cursor: Optional[str],
+    skip: int,
+    limit: int,
+    descendente: bool = False,
+) -> Select:
+    """
+    Ordena a consulta pelas colunas da chave e aplica o cursor, se informado.
+    Sem cursor, mantém a paginação por deslocamento (skip) para compatibilidade.
+    Busca uma linha a mais para saber se existe próxima página.
+    """
+    if cursor:
+        valores = decodificar_cursor(cursor, colunas)
+        chave = tuple_(*colunas)
+        limite = tuple_(*[literal(v, type_=c.type) for c, v in zip(colunas, valores)])
+        query = query.where(chave < limite if descendente else chave > limite)
+    elif skip:
+        query = query.offset(skip)
+
+    ordem = [c.desc() if descendente else c.asc() for c in colunas]
+    return query.order_by(*ordem).limit(limit + 1)
+
+
+def fechar_pagina(
+    linhas: Sequence,
+    limit: int,
+    chave: Callable[[Any], Tuple],
+    response: Response,
+) -> List:
+    """
+    Descarta a linha excedente e, se houver próxima página, devolve seu cursor
+    no cabeçalho X-Next-Cursor da resposta.
+    """
+    if len(linhas) <= limit:
+        return list(linhas)
+
+    pagina = list(linhas[:limit])
+    if pagina:
+        response.headers[CABECALHO_PROXIMO_CURSOR] = codificar_cursor(chave(pagina[-1]))
+    return pagina
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Serialização rápida de respostas JSON a partir de linhas do banco de dados
+"""
+
+import hashlib
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+
+from app.api.paginacao import CABECALHO_PROXIMO_CURSOR
+from app.core.cache import CacheTTL
+from app.core.instrumentacao import medir_serializacao
+
+# Cabeçalhos guardados no cache junto com o corpo da resposta
+_CABECALHOS_EM_CACHE = (CABECALHO_PROXIMO_CURSOR,)
+
+
+def etag_do_corpo(corpo: bytes) -> str:
+    """
+    ETag forte calculado a partir do conteúdo serializado da resposta.
+    """
+    return '"' + hashlib.blake2b(corpo, digest_size=16).hexdigest() + '"'
+
+
+def _etag_corresponde(if_none_match: str, etag: str) -> bool:
+    """
+    Comparação fraca do If-None-Match (RFC 9110): ignora o prefixo W/ e aceita "*".
+    """
+    for candidata in if_none_match.split(","):
+        candidata = candidata.strip()
+        if candidata == "*" or candidata.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def _montar_resposta(
+    corpo: bytes,
+    cabecalhos: Dict[str, str],
+    request: Optional[Request] = None,
+    etag: Optional[str] = None,
+) -> Response:
+    """
+    Monta a resposta JSON. Com o ``request``, inclui o ETag e responde 304 Not
+    Modified, sem corpo, se o cliente já tiver a mesma versão (If-None-Match).
+    """
+    if request is None:
+        return Response(content=corpo, media_type="application/json", headers=cabecalhos)
+
+    cabecalhos = {**cabecalhos, "ETag": etag or etag_do_corpo(corpo), "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_corresponde(if_none_match, cabecalhos["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cabecalhos)
+    return Response(content=corpo, media_type="application/json", headers=cabecalhos)
+
+
+def resposta_json(
+    adapter: TypeAdapter,
+    dados: Any,
+    response: Optional[Response] = None,
+    request: Optional[Request] = None,
+) -> Response:
+    """
+    Valida os dados uma única vez no schema e os serializa diretamente em bytes JSON.
+
+    Ao devolver um Response pronto, o FastAPI não revalida o conteúdo pelo
+    response_model (que continua declarado na rota apenas para a documentação).
+    Os cabeçalhos definidos no ``response`` injetado no endpoint (por exemplo,
+    X-Next-Cursor) são copiados para a resposta final. Com o ``request``, a
+    resposta é condicional (ETag / If-None-Match). A validação e a serialização
+    entram como "ser" no Server-Timing da requisição.
+    """
+    with medir_serializacao():
+        conteudo = adapter.dump_json(adapter.validate_python(dados))
+    cabecalhos = {}
+    if response is not None:
+        for nome, valor in response.headers.items():
+            if nome != "content-length":
+                cabecalhos[nome] = valor
+    return _montar_resposta(conteudo, cabecalhos, request)
+
+
+async def resposta_em_cache(
+    cache: CacheTTL,
+    chave: Tuple,
+    gerar: Callable[[], Awaitable[Response]],
+    request: Optional[Request] = None,
+) -> Response:
+    """
+    Devolve a resposta JSON guardada no cache para a chave ou a gera com ``gerar``
+    e guarda seu corpo (já serializado), seu ETag e o cabeçalho X-Next-Cursor.
+    Assim, a verificação If-None-Match de um item em cache não consulta o banco.
+    Erros (HTTPException) levantados por ``gerar`` não são guardados.
+    """
+    item = cache.obter(chave)
+    if item is None:
+        geracao = cache.geracao
+        resposta = await gerar()
+        cabecalhos = {nome: resposta.headers[nome] for nome in _CABECALHOS_EM_CACHE if nome in resposta.headers}
+        item = (resposta.body, cabecalhos, etag_do_corpo(resposta.body))
+        cache.guardar(chave, item, len(resposta.body), geracao)
+    corpo, cabecalhos, etag = item
+    return _montar_resposta(corpo, cabecalhos, request, etag)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache em memória (TTL + LRU) para dados de referência lidos com frequência
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+
+
+class CacheTTL:
+    """
+    Cache por processo com expiração (TTL) e descarte dos itens menos usados (LRU).
+
+    A memória é limitada pelo número de itens e pela soma dos tamanhos informados
+    em ``guardar`` (por exemplo, o tamanho em bytes de uma resposta serializada).
+    As chaves são tuplas cujo primeiro elemento é o grupo (``("id", ...)``,
+    ``("lista", ...)``), o que permite invalidar um grupo inteiro de uma vez.
+    """
+
+    def __init__(self, nome: str, *, ttl: float, max_itens: int, max_bytes: int):
+        self.nome = nome
+        self.ttl = ttl
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # chave -> (valor, tamanho, expira_em), do menos para o mais recentemente usado
+        self._itens: "OrderedDict[Tuple, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        # Incrementada a cada invalidação, para descartar valores lidos antes dela
+        self.geracao = 0
+        self.acertos = 0
+        self.falhas = 0
+        self.expiracoes = 0
+        self.descartes = 0
+        self.invalidacoes = 0
+
+    def obter(self, chave: Tuple) -> Optional[Any]:
+        """
+        Retorna o valor da chave, ou None se ausente ou expirado
+        """
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.falhas += 1
+                return None
+            valor, tamanho, expira_em = item
+            if expira_em <= time.monotonic():
+                self._remover(chave)
+                self.expiracoes += 1
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return valor
+
+    def guardar(self, chave: Tuple, valor: Any, tamanho: int = 0, geracao: Optional[int] = None):
+        """
+        Guarda o valor, descartando os itens menos usados se os limites forem excedidos.
+        Se ``geracao`` for informada e houve invalidação desde então, o valor
+        (possivelmente desatualizado) não é guardado.
+        """
+        if tamanho > self.max_bytes:
+            return
+        with self._lock:
+            if geracao is not None and geracao != self.geracao:
+                return
+            if chave in self._itens:
+                self._remover(chave)
+            self._itens[chave] = (valor, tamanho, time.monotonic() + self.ttl)
+            self._bytes += tamanho
+            while len(self._itens) > self.max_itens or self._bytes > self.max_bytes:
+                self._remover(next(iter(self._itens)))
+                self.descartes += 1
+
+    def invalidar(self, chave: Tuple):
+        """
+        Remove uma chave do cache
+        """
+        with self._lock:
+            self.geracao += 1
+            self.invalidacoes += 1
+            if chave in self._itens:
+                self._remover(chave)
+
+    def invalidar_grupo(self, grupo: Hashable):
+        """
+        Remove todas as chaves de um grupo (por exemplo, todas as listagens)
+        """
+        with self._lock:
+            self.geracao += 1
+            self.invalidacoes += 1
+            for chave in [chave for chave in self._itens if chave[0] == grupo]:
+                self._remover(chave)
+
+    def limpar(self):
+        """
+        Remove todos os itens do cache
+        """
+        with self._lock:
+            self.geracao += 1
+            self.invalidacoes += 1
+            self._itens.clear()
+            self._bytes = 0
+
+    def _remover(self, chave: Tuple):
+        _, tamanho, _ = self._itens.pop(chave)
+        self._bytes -= tamanho
+
+    def resumo(self) -> Dict[str, Any]:
+        """
+        Retorna os limites, a ocupação atual e os contadores do cache
+        """
+        with self._lock:
+            consultas = self.acertos + self.falhas
+            return {
+                "itens": len(self._itens),
+                "bytes": self._bytes,
+                "max_itens": self.max_itens,
+                "max_bytes": self.max_bytes,
+                "ttl_segundos": self.ttl,
+                "acertos": self.acertos,
+                "falhas": self.falhas,
+                "taxa_acerto": self.acertos / consultas if consultas else 0.0,
+                "expiracoes": self.expiracoes,
+                "descartes": self.descartes,
+                "invalidacoes": self.invalidacoes,
+            }
+
+
+def _novo_cache(nome: str) -> CacheTTL:
+    return CacheTTL(
+        nome,
+        ttl=settings.CACHE_TTL,
+        max_itens=settings.CACHE_MAX_ITENS,
+        max_bytes=settings.CACHE_MAX_BYTES,
+    )
+
+
+# Caches dos dados de referência (um por entidade)
+vacinas = _novo_cache("vacinas")
+estabelecimentos = _novo_cache("estabelecimentos")
+
+# Tokens de acesso já verificados e o funcionário autenticado por cada um
+tokens = CacheTTL(
+    "tokens",
+    ttl=settings.AUTENTICACAO_CACHE_TTL,
+    max_itens=settings.AUTENTICACAO_CACHE_MAX_ITENS,
+    max_bytes=settings.CACHE_MAX_BYTES,
+)
+
+caches: Dict[str, CacheTTL] = {cache.nome: cache for cache in (vacinas, estabelecimentos, tokens)}
+
+
+def estatisticas_caches() -> Dict[str, Dict[str, Any]]:
+    """
+    Retorna o resumo de cada cache do processo
+    """
+    return {nome: cache.resumo() for nome, cache in caches.items()}
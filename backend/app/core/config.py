@@ -24,9 +24,16 @@ class Settings(BaseSettings):
     """
     
     API_V1_STR: str = "/api/v1"
-    SECRET_KEY: str = secrets.token_urlsafe(32)
+    # Chave de assinatura dos tokens JWT, que deve ser a mesma em todos os workers e hosts.
+    # Se não for definida, é lida de SECRET_KEY_ARQUIVO (criado com uma chave aleatória na
+    # primeira execução), o que basta para vários workers no mesmo host.
+    SECRET_KEY_ARQUIVO: str = ".secret_key"
+    SECRET_KEY: Optional[str] = None
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
+    # Tempo (segundos) em que um token já verificado e seu funcionário ficam em cache
+    AUTENTICACAO_CACHE_TTL: float = 60.0
+    AUTENTICACAO_CACHE_MAX_ITENS: int = 10000
     
     # Nome do projeto
     PROJECT_NAME: str = "Sistema de Compartilhamento de Dados de Pacientes do SUS"
@@ -41,6 +48,66 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = os.getenv("POSTGRES_DB", "sus_db")
     POSTGRES_PORT: str = os.getenv("POSTGRES_PORT", "5432")
     DATABASE_URI: Optional[PostgresDsn] = None
+    ASYNC_DATABASE_URI: Optional[str] = None
+
+    # Pool de conexões (aplicado a cada engine, por processo/worker)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    # Recicla conexões mais antigas que este valor (segundos); -1 desativa
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Importação em lote da carteira de vacinação: registros por transação/COPY
+    IMPORTACAO_TAMANHO_LOTE: int = 5000
+
+    # Exportação em streaming: linhas buscadas por vez no cursor do servidor
+    EXPORTACAO_TAMANHO_PARTICAO: int = 1000
+
+    # Máximo de IDs por requisição nos endpoints de busca em lote (POST .../lote)
+    LOTE_MAX_IDS: int = 500
+
+    # Cache em memória dos dados de referência (vacinas, estabelecimentos), por cache
+    CACHE_TTL: float = 300.0
+    CACHE_MAX_ITENS: int = 1000
+    CACHE_MAX_BYTES: int = 8 * 1024 * 1024
+    # Escuta (LISTEN) as alterações notificadas pelo banco para invalidar os caches
+    # de todos os workers, não apenas do que atendeu a escrita
+    CACHE_INVALIDACAO_NOTIFY: bool = True
+
+    # Intervalo (segundos) entre as atualizações da view mv_resumo_prontuarios; 0 desativa
+    RESUMO_INTERVALO_ATUALIZACAO: float = 300.0
+
+    # Manutenção das partições mensais de atendimentos e historico_acesso: intervalo
+    # (segundos; 0 desativa), meses criados à frente e meses mantidos antes do atual
+    # (as partições mais antigas são arquivadas; 0 nunca arquiva). Prontuários devem ser
+    # guardados por no mínimo 20 anos, e arquivar atendimentos deixaria prescrições e
+    # exames sem o atendimento, por isso eles não são arquivados por padrão.
+    PARTICOES_INTERVALO_MANUTENCAO: float = 3600.0
+    PARTICOES_MESES_FUTUROS: int = 3
+    PARTICOES_RETENCAO_ATENDIMENTOS: int = 0
+    PARTICOES_RETENCAO_HISTORICO_ACESSO: int = 24
+
+    # Auditoria dos acessos aos dados dos pacientes (historico_acesso), gravada em lotes
+    # por uma tarefa de fundo: capacidade da fila em memória, eventos por lote (COPY),
+    # intervalo máximo (segundos) entre gravações e espera máxima (segundos) por espaço
+    # na fila cheia antes de descartar o evento (0 descarta sem atrasar a resposta)
+    AUDITORIA_HABILITADA: bool = True
+    AUDITORIA_CAPACIDADE_FILA: int = 50000
+    AUDITORIA_TAMANHO_LOTE: int = 1000
+    AUDITORIA_INTERVALO: float = 1.0
+    AUDITORIA_ESPERA_MAXIMA: float = 0.0
+
+    # Instrumentação das requisições (app.core.instrumentacao): cabeçalho Server-Timing
+    # com os tempos no banco, na serialização e no handler, uma linha de log JSON por
+    # requisição (nível INFO) e log dos comandos SQL mais lentos que o limite (ms;
+    # 0 desativa), com os parâmetros ocultados
+    INSTRUMENTACAO_SERVER_TIMING: bool = True
+    INSTRUMENTACAO_LOG_REQUISICOES: bool = True
+    CONSULTA_LENTA_MS: float = 500.0
+
+    # Tempo máximo (segundos) da verificação do banco pela sonda de prontidão (GET /ready)
+    PRONTIDAO_TIMEOUT: float = 2.0
     
     @validator("BACKEND_CORS_ORIGINS", pre=True)
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> Union[List[str], str]:
@@ -53,6 +120,15 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
     
+    @validator("SECRET_KEY", pre=True, always=True)
+    def carregar_secret_key(cls, v: Optional[str], values: Dict[str, Any]) -> str:
+        """
+        Usa a chave definida no ambiente ou a chave compartilhada do arquivo.
+        """
+        if v:
+            return v
+        return _chave_compartilhada(values["SECRET_KEY_ARQUIVO"])
+
     @validator("DATABASE_URI", pre=True)
     def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
         """
@@ -73,11 +149,43 @@ class Settings(BaseSettings):
             
         # Constrói a DSN do PostgreSQL
         return f"postgresql://{user}:{password}@{server}:{port}/{db}"
+
+    @validator("ASYNC_DATABASE_URI", pre=True)
+    def assemble_async_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
+        """
+        Constrói a string de conexão assíncrona (driver asyncpg) a partir da DSN síncrona.
+        """
+        if isinstance(v, str):
+            return v
+
+        uri = str(values.get("DATABASE_URI"))
+        return uri.replace("postgresql://", "postgresql+asyncpg://", 1)
     
     class Config:
         env_file = ".env"
         case_sensitive = True
 
 
+def _chave_compartilhada(caminho: str) -> str:
+    """
+    Lê a chave do arquivo, criando-o antes se não existir. A chave é escrita em um
+    arquivo temporário e ligada ao caminho final com os.link, que falha se outro
+    worker já o tiver criado; assim, todos leem a mesma chave, sempre completa.
+    """
+    if not os.path.exists(caminho):
+        temporario = f"{caminho}.{os.getpid()}"
+        with open(temporario, "w") as arquivo:
+            arquivo.write(secrets.token_urlsafe(32))
+        os.chmod(temporario, 0o600)
+        try:
+            os.link(temporario, caminho)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(temporario)
+    with open(caminho) as arquivo:
+        return arquivo.read().strip()
+
+
 # Instância das configurações para uso no aplicativo
 settings = Settings() 
\ No newline at end of file
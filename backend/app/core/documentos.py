@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Normalização dos documentos usados como chave de busca (CPF e número do SUS)
+"""
+
+
+def _digitos(valor: str) -> str:
+    return "".join(filter(str.isdigit, valor))
+
+
+def normalizar_cpf(valor: str) -> str:
+    """
+    Retorna o CPF no formato gravado no banco (000.000.000-00), aceitando-o
+    com ou sem pontuação. Levanta ValueError se não tiver 11 dígitos.
+    """
+    digitos = _digitos(valor)
+    if len(digitos) != 11:
+        raise ValueError("CPF deve conter 11 dígitos")
+    return f"{digitos[:3]}.{digitos[3:6]}.{digitos[6:9]}-{digitos[9:]}"
+
+
+def normalizar_sus(valor: str) -> str:
+    """
+    Retorna o número do SUS no formato gravado no banco (15 dígitos, sem
+    espaços ou pontuação). Levanta ValueError se não tiver 15 dígitos.
+    """
+    digitos = _digitos(valor)
+    if len(digitos) != 15:
+        raise ValueError("Número do SUS deve conter 15 dígitos")
+    return digitos
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Instrumentação por requisição: comandos SQL, tempo no banco, serialização e handler
+"""
+
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Optional
+
+from app.core.config import settings
+from app.core.metricas import metricas_requisicoes
+
+logger = logging.getLogger(__name__)
+
+
+class MedicaoRequisicao:
+    """
+    Tempos acumulados durante uma requisição. O tempo do handler (código Python da
+    aplicação) é o total menos o tempo no banco e o da serialização.
+    """
+
+    __slots__ = ("inicio", "consultas", "tempo_banco", "tempo_serializacao")
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.consultas = 0
+        self.tempo_banco = 0.0
+        self.tempo_serializacao = 0.0
+
+    def tempos_ms(self) -> dict:
+        """
+        Retorna os tempos (ms) até agora: banco, serialização, handler e total.
+        """
+        total = (time.perf_counter() - self.inicio) * 1000
+        banco = self.tempo_banco * 1000
+        serializacao = self.tempo_serializacao * 1000
+        return {
+            "banco_ms": round(banco, 3),
+            "serializacao_ms": round(serializacao, 3),
+            "handler_ms": round(max(total - banco - serializacao, 0.0), 3),
+            "total_ms": round(total, 3),
+        }
+
+    def server_timing(self) -> str:
+        """
+        Valor do cabeçalho Server-Timing com os tempos até agora.
+        """
+        tempos = self.tempos_ms()
+        return (
+            f'db;dur={tempos["banco_ms"]};desc="consultas: {self.consultas}", '
+            f'ser;dur={tempos["serializacao_ms"]}, '
+            f'app;dur={tempos["handler_ms"]}, '
+            f'total;dur={tempos["total_ms"]}'
+        )
+
+
+# Medição da requisição em andamento; None fora de requisições (tarefas de fundo, scripts)
+_medicao_atual: ContextVar[Optional[MedicaoRequisicao]] = ContextVar("medicao_requisicao", default=None)
+
+
+def medicao_atual() -> Optional[MedicaoRequisicao]:
+    """
+    Retorna a medição da requisição em andamento, ou None.
+    """
+    return _medicao_atual.get()
+
+
+@contextmanager
+def medir_serializacao():
+    """
+    Soma o tempo do bloco ao tempo de serialização da requisição em andamento.
+    """
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicao = _medicao_atual.get()
+        if medicao is not None:
+            medicao.tempo_serializacao += time.perf_counter() - inicio
+
+
+def _redigir(parametros: Any) -> Any:
+    """
+    Troca os valores dos parâmetros pelos seus tipos, mantendo a estrutura, para
+    que dados dos pacientes (CPF, nomes etc.) não cheguem aos logs.
+    """
+    if isinstance(parametros, dict):
+        return {nome: _redigir(valor) for nome, valor in parametros.items()}
+    if isinstance(parametros, (list, tuple)):
+        return [_redigir(valor) for valor in parametros]
+    return None if parametros is None else f"<{type(parametros).__name__}>"
+
+
+def registrar_consulta(comando: str, parametros: Any, executemany: bool, duracao: float):
+    """
+    Soma a execução de um comando SQL à requisição em andamento e registra no
+    log os comandos mais lentos que settings.CONSULTA_LENTA_MS, com os
+    parâmetros ocultados.
+    """
+    medicao = _medicao_atual.get()
+    if medicao is not None:
+        medicao.consultas += 1
+        medicao.tempo_banco += duracao
+    limite = settings.CONSULTA_LENTA_MS
+    if limite > 0 and duracao * 1000 >= limite:
+        logger.warning(json.dumps({
+            "evento": "consulta_lenta",
+            "duracao_ms": round(duracao * 1000, 3),
+            "sql": " ".join(comando.split()),
+            # Em executemany, os parâmetros de uma linha bastam para identificar o comando
+            "parametros": _redigir(parametros[0] if executemany and parametros else parametros),
+            "linhas": len(parametros) if executemany else None,
+        }, ensure_ascii=False))
+
+
+def rota_da_requisicao(scope: dict) -> str:
+    """
+    Modelo da rota que atendeu a requisição (por exemplo,
+    /api/v1/pacientes/{paciente_id}), com o prefixo das montagens, para agrupar
+    as medições por rota. Requisições que não correspondem a nenhuma rota com
+    modelo conhecido são agrupadas em "<não encontrada>", para que o número de
+    rótulos distintos não dependa dos caminhos pedidos.
+    """
+    rota = scope.get("route")
+    if rota is not None:
+        # O Mount acrescenta o caminho montado a root_path e guarda o original em app_root_path
+        root_path = scope.get("root_path", "")
+        prefixo = root_path[len(scope["app_root_path"]):] if "app_root_path" in scope else ""
+        return prefixo + rota.path_format
+    # Rotas do Starlette sem parâmetros (documentação, OpenAPI) não registram o modelo
+    if "endpoint" in scope and not scope.get("path_params"):
+        return scope["path"]
+    return "<não encontrada>"
+
+
+class MiddlewareInstrumentacao:
+    """
+    Middleware ASGI que mede cada requisição HTTP: inclui na resposta o cabeçalho
+    Server-Timing (db, ser, app e total, medidos até o envio dos cabeçalhos) e,
+    ao final, registra no log uma linha JSON com a rota, o status, o número de
+    comandos SQL e os tempos, e soma a requisição às métricas do processo
+    (app.core.metricas).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        medicao = MedicaoRequisicao()
+        marca = _medicao_atual.set(medicao)
+        status_code = 500
+        metricas_requisicoes.iniciar()
+
+        async def enviar(mensagem):
+            nonlocal status_code
+            if mensagem["type"] == "http.response.start":
+                status_code = mensagem["status"]
+                if settings.INSTRUMENTACAO_SERVER_TIMING:
+                    mensagem["headers"] = [
+                        *mensagem.get("headers", ()), (b"server-timing", medicao.server_timing().encode("latin-1"))
+                    ]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _medicao_atual.reset(marca)
+            rota = rota_da_requisicao(scope)
+            metricas_requisicoes.registrar(
+                scope["method"], rota, status_code, time.perf_counter() - medicao.inicio,
+                medicao.consultas, medicao.tempo_banco,
+            )
+            if settings.INSTRUMENTACAO_LOG_REQUISICOES and logger.isEnabledFor(logging.INFO):
+                logger.info(json.dumps({
+                    "evento": "requisicao",
+                    "metodo": scope["method"],
+                    "rota": rota,
+                    "status": status_code,
+                    "consultas": medicao.consultas,
+                    **medicao.tempos_ms(),
+                }, ensure_ascii=False))
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Métricas do processo no formato de texto do Prometheus
+"""
+
+import bisect
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
+
+# Limites (segundos) das faixas do histograma de latência das requisições
+LIMITES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# O Starlette acrescenta "; charset=utf-8" aos tipos text/*
+TIPO_CONTEUDO = "text/plain; version=0.0.4"
+
+
+class _Histograma:
+    __slots__ = ("faixas", "soma", "total")
+
+    def __init__(self):
+        # Contagem por faixa (não acumulada); a última é a acima do maior limite (+Inf)
+        self.faixas = [0] * (len(LIMITES_LATENCIA) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+
+class MetricasRequisicoes:
+    """
+    Contadores das requisições HTTP do processo, por método, rota e status, e
+    histograma da latência por método e rota. Alimentado pelo middleware de
+    instrumentação (app.core.instrumentacao).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.em_andamento = 0
+        self._contagens: Dict[Tuple[str, str, str], int] = {}
+        self._latencias: Dict[Tuple[str, str], _Histograma] = {}
+        self._comandos_sql: Dict[Tuple[str, str], int] = {}
+        self._tempo_banco: Dict[Tuple[str, str], float] = {}
+
+    def iniciar(self):
+        """
+        Registra o início de uma requisição.
+        """
+        with self._lock:
+            self.em_andamento += 1
+
+    def registrar(self, metodo: str, rota: str, status: int, duracao: float, comandos_sql: int, tempo_banco: float):
+        """
+        Registra o fim de uma requisição, com a duração total e o tempo no banco (segundos).
+        """
+        chave = (metodo, rota)
+        with self._lock:
+            self.em_andamento -= 1
+            contagem = (metodo, rota, str(status))
+            self._contagens[contagem] = self._contagens.get(contagem, 0) + 1
+            histograma = self._latencias.get(chave)
+            if histograma is None:
+                histograma = self._latencias[chave] = _Histograma()
+            histograma.faixas[bisect.bisect_left(LIMITES_LATENCIA, duracao)] += 1
+            histograma.soma += duracao
+            histograma.total += 1
+            self._comandos_sql[chave] = self._comandos_sql.get(chave, 0) + comandos_sql
+            self._tempo_banco[chave] = self._tempo_banco.get(chave, 0.0) + tempo_banco
+
+    def linhas(self) -> List[str]:
+        """
+        Retorna as métricas das requisições no formato de texto do Prometheus.
+        """
+        with self._lock:
+            linhas = _cabecalho("http_requests_in_progress", "gauge", "Requisições HTTP em andamento")
+            linhas.append(f"http_requests_in_progress {self.em_andamento}")
+
+            linhas += _cabecalho("http_requests_total", "counter", "Requisições HTTP concluídas")
+            for (metodo, rota, status), total in sorted(self._contagens.items()):
+                linhas.append(f"http_requests_total{_rotulos(method=metodo, route=rota, status=status)} {total}")
+
+            linhas += _cabecalho(
+                "http_request_duration_seconds", "histogram", "Duração das requisições HTTP (segundos)"
+            )
+            for (metodo, rota), histograma in sorted(self._latencias.items()):
+                acumulado = 0
+                for limite, quantidade in zip((*LIMITES_LATENCIA, "+Inf"), histograma.faixas):
+                    acumulado += quantidade
+                    rotulos = _rotulos(method=metodo, route=rota, le=str(limite))
+                    linhas.append(f"http_request_duration_seconds_bucket{rotulos} {acumulado}")
+                rotulos = _rotulos(method=metodo, route=rota)
+                linhas.append(f"http_request_duration_seconds_sum{rotulos} {histograma.soma:.6f}")
+                linhas.append(f"http_request_duration_seconds_count{rotulos} {histograma.total}")
+
+            linhas += _cabecalho(
+                "http_request_sql_statements_total", "counter", "Comandos SQL executados pelas requisições"
+            )
+            for (metodo, rota), total in sorted(self._comandos_sql.items()):
+                linhas.append(f"http_request_sql_statements_total{_rotulos(method=metodo, route=rota)} {total}")
+
+            linhas += _cabecalho(
+                "http_request_db_seconds_total", "counter", "Tempo das requisições no banco (segundos)"
+            )
+            for (metodo, rota), total in sorted(self._tempo_banco.items()):
+                linhas.append(f"http_request_db_seconds_total{_rotulos(method=metodo, route=rota)} {total:.6f}")
+        return linhas
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _rotulos(**rotulos: str) -> str:
+    return "{" + ",".join(f'{nome}="{_escapar(str(valor))}"' for nome, valor in rotulos.items()) + "}"
+
+
+def _numero(valor: Any) -> str:
+    return str(valor) if isinstance(valor, int) else repr(float(valor))
+
+
+def _cabecalho(nome: str, tipo: str, descricao: str) -> List[str]:
+    return [f"# HELP {nome} {descricao}", f"# TYPE {nome} {tipo}"]
+
+
+def _serie(nome: str, tipo: str, descricao: str, rotulo: str, valores: Iterable[Tuple[str, Any]]) -> List[str]:
+    linhas = _cabecalho(nome, tipo, descricao)
+    for valor_rotulo, valor in valores:
+        linhas.append(f"{nome}{_rotulos(**{rotulo: valor_rotulo})} {_numero(valor)}")
+    return linhas
+
+
+def linhas_pools(pools: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Métricas dos pools de conexões (app.db.session.estatisticas_pools), por engine.
+    """
+    metricas = (
+        ("db_pool_size", "gauge", "Tamanho configurado do pool", "tamanho"),
+        ("db_pool_connections_in_use", "gauge", "Conexões em uso", "conexoes_em_uso"),
+        ("db_pool_connections_idle", "gauge", "Conexões livres no pool", "conexoes_livres"),
+        ("db_pool_overflow", "gauge", "Conexões abertas além do tamanho do pool", "overflow_atual"),
+        ("db_pool_checkouts_total", "counter", "Conexões obtidas do pool", "checkouts"),
+        ("db_pool_wait_seconds_total", "counter", "Tempo total de espera por conexões (segundos)",
+         "espera_total_segundos"),
+        ("db_pool_wait_seconds_max", "gauge", "Maior espera por uma conexão (segundos)", "espera_maxima_segundos"),
+        ("db_pool_overflow_events_total", "counter", "Conexões abertas além do tamanho do pool", "eventos_overflow"),
+        ("db_pool_timeouts_total", "counter", "Esperas por conexão encerradas por timeout", "timeouts"),
+    )
+    linhas = []
+    for nome, tipo, descricao, campo in metricas:
+        linhas += _serie(nome, tipo, descricao, "engine", ((engine, dados[campo]) for engine, dados in pools.items()))
+    return linhas
+
+
+def linhas_caches(caches: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Métricas dos caches em memória (app.core.cache.estatisticas_caches), por cache.
+    """
+    metricas = (
+        ("cache_hits_total", "counter", "Leituras atendidas pelo cache", "acertos"),
+        ("cache_misses_total", "counter", "Leituras não atendidas pelo cache", "falhas"),
+        ("cache_hit_ratio", "gauge", "Fração das leituras atendidas pelo cache", "taxa_acerto"),
+        ("cache_items", "gauge", "Itens no cache", "itens"),
+        ("cache_bytes", "gauge", "Tamanho dos itens no cache (bytes)", "bytes"),
+        ("cache_expirations_total", "counter", "Itens expirados (TTL)", "expiracoes"),
+        ("cache_evictions_total", "counter", "Itens descartados por falta de espaço (LRU)", "descartes"),
+        ("cache_invalidations_total", "counter", "Invalidações do cache", "invalidacoes"),
+    )
+    linhas = []
+    for nome, tipo, descricao, campo in metricas:
+        linhas += _serie(nome, tipo, descricao, "cache", ((cache, dados[campo]) for cache, dados in caches.items()))
+    return linhas
+
+
+def texto_prometheus(pools: Dict[str, Dict[str, Any]], caches: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Exposição completa das métricas do processo: requisições, pools e caches.
+    """
+    return "\n".join([*metricas_requisicoes.linhas(), *linhas_pools(pools), *linhas_caches(caches)]) + "\n"
+
+
+# Métricas das requisições do processo
+metricas_requisicoes = MetricasRequisicoes()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Senhas (bcrypt) e tokens de acesso (JWT)
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+import bcrypt
+import jwt
+
+from app.core.config import settings
+
+ALGORITMO = "HS256"
+
+# Hash de uma senha qualquer, verificado quando o usuário não existe, para que o tempo
+# de resposta do login não revele quais CPFs estão cadastrados
+_HASH_FICTICIO = b"$2b$12$7ZPCtfuKf7ih6StXrmoUxuXsi4rtGpMwGMZmNYKirtDlPqlrinOCW"
+
+
+def gerar_hash_senha(senha: str) -> str:
+    """
+    Gera o hash bcrypt da senha, para gravar em funcionarios.senha_hash
+    """
+    return bcrypt.hashpw(senha.encode(), bcrypt.gensalt()).decode()
+
+
+def verificar_senha(senha: str, senha_hash: Optional[str]) -> bool:
+    """
+    Confere a senha com o hash bcrypt (lento por construção: use fora do event loop)
+    """
+    if not senha_hash:
+        bcrypt.checkpw(senha.encode(), _HASH_FICTICIO)
+        return False
+    return bcrypt.checkpw(senha.encode(), senha_hash.encode())
+
+
+def criar_token_acesso(funcionario_id: UUID, expira_em: Optional[timedelta] = None) -> str:
+    """
+    Cria o token JWT assinado do funcionário
+    """
+    agora = datetime.now(timezone.utc)
+    expiracao = agora + (expira_em or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+    return jwt.encode(
+        {"sub": str(funcionario_id), "iat": agora, "exp": expiracao},
+        settings.SECRET_KEY,
+        algorithm=ALGORITMO,
+    )
+
+
+def decodificar_token(token: str) -> Optional[Dict[str, Any]]:
+    """
+    Verifica a assinatura e a expiração do token e retorna suas declarações,
+    ou None se ele for inválido
+    """
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITMO], options={"require": ["sub", "exp"]})
+    except jwt.PyJWTError:
+        return None
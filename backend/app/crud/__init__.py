@@ -5,5 +5,8 @@
 Importação de instâncias CRUD para facilitar o acesso
 """
 
+from app.crud.crud_carteira_vacinacao import carteira_vacinacao
+from app.crud.crud_estabelecimento import estabelecimento
+from app.crud.crud_funcionario import funcionario
 from app.crud.crud_paciente import paciente
-# Importar outros CRUDs conforme forem implementados 
\ No newline at end of file
+from app.crud.crud_vacina import vacina
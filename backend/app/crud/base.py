@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Base genérica das operações CRUD, com operações em lote
+"""
+
+from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, Type, TypeVar, Union
+
+from pydantic import BaseModel
+from sqlalchemy import any_, bindparam, column, delete, inspect, select, update, values
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import Base
+
+ModelType = TypeVar("ModelType", bound=Base)
+CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
+UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
+
+# As linhas retornadas por RETURNING substituem o estado dos objetos já carregados na sessão
+_ATUALIZAR_SESSAO = {"populate_existing": True}
+
+
+class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    Operações CRUD de um modelo com chave primária simples.
+
+    As escritas usam RETURNING em vez de um SELECT posterior, e as operações em
+    lote enviam as linhas em um único comando (ou em poucos comandos de várias
+    linhas) em vez de um comando por linha. As escritas fazem commit; as
+    violações de restrição chegam ao chamador como IntegrityError.
+    """
+
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+        self.pk = inspect(model).primary_key[0]
+
+    def _valores_criacao(self, obj_in: Union[CreateSchemaType, Dict[str, Any]]) -> Dict[str, Any]:
+        return obj_in if isinstance(obj_in, dict) else obj_in.model_dump()
+
+    def _valores_atualizacao(self, obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> Dict[str, Any]:
+        return obj_in if isinstance(obj_in, dict) else obj_in.model_dump(exclude_unset=True)
+
+    async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        """
+        Obtém um registro pela chave primária
+        """
+        return await db.get(self.model, id)
+
+    async def get_many(self, db: AsyncSession, ids: Iterable[Any]) -> List[ModelType]:
+        """
+        Obtém os registros das chaves informadas com uma única consulta
+        (``= ANY(array)``), na ordem das chaves e sem repetições. Chaves
+        inexistentes são omitidas.
+        """
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+        parametro = bindparam("ids", ids, type_=ARRAY(self.pk.type))
+        result = await db.execute(select(self.model).where(self.pk == any_(parametro)))
+        por_id = {getattr(obj, self.pk.key): obj for obj in result.scalars()}
+        return [por_id[id] for id in ids if id in por_id]
+
+    async def get_multi(self, db: AsyncSession, *, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        """
+        Obtém múltiplos registros com paginação por deslocamento
+        """
+        result = await db.execute(select(self.model).order_by(self.pk).offset(skip).limit(limit))
+        return list(result.scalars().all())
+
+    async def create(self, db: AsyncSession, *, obj_in: Union[CreateSchemaType, Dict[str, Any]]) -> ModelType:
+        """
+        Cria um registro (INSERT ... RETURNING)
+        """
+        return (await self.create_many(db, [obj_in]))[0]
+
+    async def create_many(
+        self, db: AsyncSession, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]
+    ) -> List[ModelType]:
+        """
+        Cria os registros com INSERTs de várias linhas (até mil linhas por comando,
+        pelo modo "insertmanyvalues" do SQLAlchemy), retornando-os na ordem de
+        ``objs_in``. Uma violação de restrição desfaz o lote inteiro.
+        """
+        if not objs_in:
+            return []
+        linhas = [self._valores_criacao(obj_in) for obj_in in objs_in]
+        comando = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        criados = list((await db.execute(comando, linhas, execution_options=_ATUALIZAR_SESSAO)).scalars().all())
+        await db.commit()
+        return criados
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        id: Any,
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+    ) -> Optional[ModelType]:
+        """
+        Atualiza um registro (UPDATE ... RETURNING). Retorna None se ele não existir.
+        """
+        atualizados = await self.update_many(db, [(id, obj_in)])
+        return atualizados[0] if atualizados else None
+
+    async def update_many(
+        self,
+        db: AsyncSession,
+        atualizacoes: Sequence[tuple],
+    ) -> List[ModelType]:
+        """
+        Atualiza vários registros, cada um com os seus valores, a partir de pares
+        (chave, valores). As atualizações que alteram as mesmas colunas são feitas
+        com um único ``UPDATE ... FROM (VALUES ...)``. Retorna os registros
+        atualizados na ordem de ``atualizacoes``; chaves inexistentes são omitidas.
+        """
+        grupos: Dict[tuple, List[Dict[str, Any]]] = {}
+        sem_alteracao = []
+        for id, obj_in in atualizacoes:
+            dados = self._valores_atualizacao(obj_in)
+            if dados:
+                grupos.setdefault(tuple(sorted(dados)), []).append({self.pk.key: id, **dados})
+            else:
+                sem_alteracao.append(id)
+
+        por_id = {getattr(obj, self.pk.key): obj for obj in await self.get_many(db, sem_alteracao)}
+        tabela = self.model.__table__
+        for colunas, linhas in grupos.items():
+            nomes = (self.pk.key, *colunas)
+            origem = values(
+                *(column(nome, tabela.c[nome].type) for nome in nomes), name="novos"
+            ).data([tuple(linha[nome] for nome in nomes) for linha in linhas])
+            comando = (
+                update(self.model)
+                .where(self.pk == origem.c[self.pk.key])
+                .values({nome: origem.c[nome] for nome in colunas})
+                .returning(self.model)
+            )
+            result = await db.execute(comando, execution_options=_ATUALIZAR_SESSAO)
+            por_id.update((getattr(obj, self.pk.key), obj) for obj in result.scalars())
+        if grupos:
+            await db.commit()
+        return [por_id[id] for id, _ in atualizacoes if id in por_id]
+
+    async def upsert(
+        self,
+        db: AsyncSession,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        *,
+        index_elements: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None,
+    ) -> List[ModelType]:
+        """
+        Cria ou atualiza os registros com um único ``INSERT ... ON CONFLICT DO UPDATE``.
+        ``index_elements`` são as colunas da restrição UNIQUE que identifica o
+        registro; ``update_columns`` (por padrão, todas as informadas, exceto a chave
+        primária e as do conflito) são as colunas atualizadas quando ele já existe.
+        """
+        if not objs_in:
+            return []
+        linhas = [self._valores_criacao(obj_in) for obj_in in objs_in]
+        if update_columns is None:
+            ignoradas = {self.pk.key, *index_elements}
+            update_columns = [nome for nome in linhas[0] if nome not in ignoradas]
+        comando = insert(self.model).values(linhas)
+        comando = comando.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={nome: comando.excluded[nome] for nome in update_columns},
+        ).returning(self.model)
+        registros = list((await db.execute(comando, execution_options=_ATUALIZAR_SESSAO)).scalars().all())
+        await db.commit()
+        return registros
+
+    async def remove(self, db: AsyncSession, *, id: Any) -> Optional[ModelType]:
+        """
+        Remove um registro (DELETE ... RETURNING). Retorna None se ele não existir.
+        """
+        comando = delete(self.model).where(self.pk == id).returning(self.model)
+        removido = (await db.execute(comando)).scalars().first()
+        await db.commit()
+        return removido
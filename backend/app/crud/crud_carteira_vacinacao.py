@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CRUD para operações com a Carteira de Vacinação
+"""
+
+from app.crud.base import CRUDBase
+from app.db.models.carteira_vacinacao import CarteiraVacinacao
+from app.schemas.carteira_vacinacao import CarteiraVacinacaoCreate, CarteiraVacinacaoUpdate
+
+
+class CRUDCarteiraVacinacao(CRUDBase[CarteiraVacinacao, CarteiraVacinacaoCreate, CarteiraVacinacaoUpdate]):
+    """
+    Implementação de operações CRUD para registros da Carteira de Vacinação
+    """
+    pass
+
+
+# Instância do CRUD para importação de outros módulos
+carteira_vacinacao = CRUDCarteiraVacinacao(CarteiraVacinacao)
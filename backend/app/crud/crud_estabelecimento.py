@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CRUD para operações com Estabelecimentos
+"""
+
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.base import CRUDBase
+from app.db.models.estabelecimento import Estabelecimento
+from app.schemas.estabelecimento import EstabelecimentoCreate, EstabelecimentoUpdate
+
+
+class CRUDEstabelecimento(CRUDBase[Estabelecimento, EstabelecimentoCreate, EstabelecimentoUpdate]):
+    """
+    Implementação de operações CRUD para Estabelecimento
+    """
+
+    async def get_by_cnes(self, db: AsyncSession, cnes: str) -> Optional[Estabelecimento]:
+        """
+        Obtém um estabelecimento pelo CNES
+        """
+        result = await db.execute(select(Estabelecimento).where(Estabelecimento.cnes == cnes))
+        return result.scalars().first()
+
+
+# Instância do CRUD para importação de outros módulos
+estabelecimento = CRUDEstabelecimento(Estabelecimento)
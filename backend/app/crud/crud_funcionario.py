@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CRUD para operações com Funcionários
+"""
+
+from pydantic import BaseModel
+
+from app.crud.base import CRUDBase
+from app.db.models.funcionario import Funcionario
+
+
+class CRUDFuncionario(CRUDBase[Funcionario, BaseModel, BaseModel]):
+    """
+    Implementação de operações CRUD para Funcionário (por enquanto, apenas leitura)
+    """
+    pass
+
+
+# Instância do CRUD para importação de outros módulos
+funcionario = CRUDFuncionario(Funcionario)
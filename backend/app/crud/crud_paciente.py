@@ -6,98 +6,47 @@ CRUD para operações com Pacientes
 """
 
 from typing import Any, Dict, List, Optional, Union
-from uuid import UUID
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.crud.base import CRUDBase
+from app.db.busca import consulta_busca
 from app.db.models.paciente import Paciente
 from app.schemas.paciente import PacienteCreate, PacienteUpdate
 
 
-class CRUDPaciente:
+class CRUDPaciente(CRUDBase[Paciente, PacienteCreate, PacienteUpdate]):
     """
     Implementação de operações CRUD para Paciente
     """
 
-    def get(self, db: Session, id: UUID) -> Optional[Paciente]:
-        """
-        Obtém um paciente por ID
-        """
-        return db.query(Paciente).filter(Paciente.paciente_id == id).first()
-
-    def get_by_cpf(self, db: Session, cpf: str) -> Optional[Paciente]:
-        """
-        Obtém um paciente por CPF
-        """
-        return db.query(Paciente).filter(Paciente.cpf == cpf).first()
-
-    def get_by_sus_numero(self, db: Session, sus_numero: str) -> Optional[Paciente]:
-        """
-        Obtém um paciente por número do SUS
-        """
-        return db.query(Paciente).filter(Paciente.sus_numero == sus_numero).first()
-
-    def get_multi(
-        self, db: Session, *, skip: int = 0, limit: int = 100
-    ) -> List[Paciente]:
-        """
-        Obtém múltiplos pacientes com paginação
-        """
-        return db.query(Paciente).offset(skip).limit(limit).all()
+    def _valores_atualizacao(self, obj_in: Union[PacienteUpdate, Dict[str, Any]]) -> Dict[str, Any]:
+        # Campos enviados como nulos são mantidos, e não apagados
+        dados = super()._valores_atualizacao(obj_in)
+        return {campo: valor for campo, valor in dados.items() if valor is not None}
 
-    def create(self, db: Session, *, obj_in: PacienteCreate) -> Paciente:
+    async def get_by_cpf(self, db: AsyncSession, cpf: str) -> Optional[Paciente]:
         """
-        Cria um novo paciente
+        Obtém um paciente por CPF (normalizado, ver app.core.documentos)
         """
-        db_obj = Paciente(
-            nome=obj_in.nome,
-            cpf=obj_in.cpf,
-            data_nascimento=obj_in.data_nascimento,
-            sexo=obj_in.sexo,
-            endereco=obj_in.endereco,
-            telefone=obj_in.telefone,
-            email=obj_in.email,
-            tipo_sanguineo=obj_in.tipo_sanguineo,
-            sus_numero=obj_in.sus_numero,
-        )
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        result = await db.execute(select(Paciente).where(Paciente.cpf == cpf))
+        return result.scalars().first()
 
-    def update(
-        self,
-        db: Session,
-        *,
-        db_obj: Paciente,
-        obj_in: Union[PacienteUpdate, Dict[str, Any]]
-    ) -> Paciente:
+    async def get_by_sus_numero(self, db: AsyncSession, sus_numero: str) -> Optional[Paciente]:
         """
-        Atualiza um paciente existente
+        Obtém um paciente por número do SUS (normalizado, ver app.core.documentos)
         """
-        if isinstance(obj_in, dict):
-            update_data = obj_in
-        else:
-            update_data = obj_in.dict(exclude_unset=True)
-        
-        for field in update_data:
-            if update_data[field] is not None:
-                setattr(db_obj, field, update_data[field])
-        
-        db.add(db_obj)
-        db.commit()
-        db.refresh(db_obj)
-        return db_obj
+        result = await db.execute(select(Paciente).where(Paciente.sus_numero == sus_numero))
+        return result.scalars().first()
 
-    def remove(self, db: Session, *, id: UUID) -> Paciente:
+    async def search(self, db: AsyncSession, termo: str, *, limit: int = 20) -> List[Paciente]:
         """
-        Remove um paciente
+        Busca pacientes por nome (aproximado e sem acentos), ordenados por relevância
         """
-        obj = db.query(Paciente).get(id)
-        db.delete(obj)
-        db.commit()
-        return obj
+        result = await db.execute(consulta_busca(select(Paciente), Paciente.nome, termo, limit))
+        return list(result.scalars().all())
 
 
 # Instância do CRUD para importação de outros módulos
-paciente = CRUDPaciente() 
\ No newline at end of file
+paciente = CRUDPaciente(Paciente)
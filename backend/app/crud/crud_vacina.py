@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+CRUD para operações com Vacinas
+"""
+
+from app.crud.base import CRUDBase
+from app.db.models.vacina import Vacina
+from app.schemas.vacina import VacinaCreate, VacinaUpdate
+
+
+class CRUDVacina(CRUDBase[Vacina, VacinaCreate, VacinaUpdate]):
+    """
+    Implementação de operações CRUD para Vacina
+    """
+    pass
+
+
+# Instância do CRUD para importação de outros módulos
+vacina = CRUDVacina(Vacina)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Busca aproximada por nome com índices de trigramas (pg_trgm), sem diferenciar acentos
+"""
+
+from sqlalchemy import func, or_
+
+# Caracteres especiais do LIKE, escapados com a barra invertida (escape padrão do PostgreSQL)
+_ESPECIAIS_LIKE = str.maketrans({"\\": "\\\\", "%": "\\%", "_": "\\_"})
+
+
+def sem_acento(expressao):
+    """
+    Aplica a função sem_acento() do banco, a mesma expressão dos índices de trigramas.
+    """
+    return func.sem_acento(expressao)
+
+
+def contem(coluna, termo: str):
+    """
+    Condição "a coluna contém o termo", sem diferenciar maiúsculas e acentos.
+    Atendida pelo índice GIN de trigramas de sem_acento(coluna).
+    """
+    padrao = f"%{termo.translate(_ESPECIAIS_LIKE)}%"
+    return sem_acento(coluna).ilike(sem_acento(padrao))
+
+
+def filtro_busca(coluna, termo: str):
+    """
+    Condição da busca: a coluna contém o termo ou tem uma palavra parecida com ele
+    (similaridade de palavra acima de pg_trgm.word_similarity_threshold).
+    Os dois lados da condição usam o mesmo índice de trigramas.
+    """
+    return or_(
+        sem_acento(coluna).op("%>")(sem_acento(termo)),
+        contem(coluna, termo),
+    )
+
+
+def relevancia(coluna, termo: str):
+    """
+    Relevância do resultado (0 a 1), para ordenar os mais parecidos primeiro.
+    """
+    return func.word_similarity(sem_acento(termo), sem_acento(coluna))
+
+
+def consulta_busca(query, coluna, termo: str, limit: int):
+    """
+    Restringe a consulta aos registros encontrados pela busca, dos mais relevantes
+    para os menos relevantes (com o próprio valor da coluna como desempate).
+    """
+    return query.where(filtro_busca(coluna, termo)).order_by(
+        relevancia(coluna, termo).desc(), coluna
+    ).limit(limit)
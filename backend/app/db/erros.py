@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tradução de erros de integridade do PostgreSQL
+"""
+
+from typing import Optional
+
+from sqlalchemy.exc import IntegrityError
+
+
+def restricao_violada(erro: IntegrityError) -> Optional[str]:
+    """
+    Retorna o nome da restrição (FK, UNIQUE, CHECK) violada, se disponível.
+    Funciona com os drivers asyncpg e psycopg2.
+    """
+    original = erro.orig
+    # asyncpg: o erro original do driver é a causa do erro adaptado pelo SQLAlchemy
+    causa = getattr(original, "__cause__", None)
+    nome = getattr(causa, "constraint_name", None)
+    if nome:
+        return nome
+    # psycopg2: o nome está no diagnóstico do erro
+    diag = getattr(original, "diag", None)
+    return getattr(diag, "constraint_name", None)
@@ -5,5 +5,9 @@
 Importação de todos os modelos para facilitar o acesso
 """
 
+from app.db.models.carteira_vacinacao import CarteiraVacinacao
+from app.db.models.estabelecimento import Estabelecimento
+from app.db.models.funcionario import Funcionario
 from app.db.models.paciente import Paciente
+from app.db.models.vacina import Vacina
 # Importar outros modelos conforme forem criados 
\ No newline at end of file
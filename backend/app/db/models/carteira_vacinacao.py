@@ -8,18 +8,24 @@ Modelo SQLAlchemy para Carteira de Vacinação
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 
 from app.db.session import Base
 
+# Nome da restrição que impede registrar duas vezes a mesma dose de uma vacina
+UQ_CARTEIRA_VACINACAO_DOSE = "uq_carteira_vacinacao_paciente_vacina_dose"
+
 
 class CarteiraVacinacao(Base):
     """
     Modelo de Carteira de Vacinação correspondente à tabela 'carteira_vacinacao' no banco de dados
     """
     __tablename__ = "carteira_vacinacao"
+    __table_args__ = (
+        UniqueConstraint("paciente_id", "vacina_id", "dose", name=UQ_CARTEIRA_VACINACAO_DOSE),
+    )
 
     # Campos correspondentes à tabela no banco de dados
     vacinacao_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -32,11 +38,15 @@ class CarteiraVacinacao(Base):
     observacoes = Column(Text)
     data_cadastro = Column(DateTime, default=datetime.now)
 
-    # Relacionamentos (caso precise acessar os objetos relacionados)
-    paciente = relationship("Paciente", backref="vacinacoes")
-    vacina = relationship("Vacina", backref="aplicacoes")
-    funcionario = relationship("Funcionario", backref="vacinacoes_aplicadas")
-    estabelecimento = relationship("Estabelecimento", backref="vacinacoes_realizadas")
+    # Relacionamentos (caso precise acessar os objetos relacionados). Não são carregados
+    # sob demanda, o que faria uma consulta por linha: use selectinload/joinedload na
+    # consulta ou os carregadores da requisição (app.api.carregadores)
+    paciente = relationship("Paciente", lazy="raise", backref=backref("vacinacoes", lazy="raise"))
+    vacina = relationship("Vacina", lazy="raise", backref=backref("aplicacoes", lazy="raise"))
+    funcionario = relationship("Funcionario", lazy="raise", backref=backref("vacinacoes_aplicadas", lazy="raise"))
+    estabelecimento = relationship(
+        "Estabelecimento", lazy="raise", backref=backref("vacinacoes_realizadas", lazy="raise")
+    )
 
     def __repr__(self):
         return f"<CarteiraVacinacao(paciente_id='{self.paciente_id}', vacina_id='{self.vacina_id}', dose='{self.dose}')>" 
\ No newline at end of file
@@ -10,7 +10,7 @@ from datetime import datetime, date
 
 from sqlalchemy import Column, String, Date, DateTime, Boolean, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import backref, relationship
 
 from app.db.session import Base
 
@@ -32,11 +32,12 @@ class Funcionario(Base):
     telefone = Column(String(20))
     email = Column(String(100))
     ativo = Column(Boolean, default=True)
+    senha_hash = Column(String(60))
     data_cadastro = Column(DateTime, default=datetime.now)
     ultima_atualizacao = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
-    # Relacionamentos
-    estabelecimento = relationship("Estabelecimento", backref="funcionarios")
+    # Relacionamentos (sem carregamento sob demanda; ver CarteiraVacinacao)
+    estabelecimento = relationship("Estabelecimento", lazy="raise", backref=backref("funcionarios", lazy="raise"))
 
     def __repr__(self):
         return f"<Funcionario(nome='{self.nome}', cargo='{self.cargo}', registro='{self.registro_profissional}')>" 
\ No newline at end of file
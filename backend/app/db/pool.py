@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Pools de conexões instrumentados para dimensionamento a partir de métricas
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class EstatisticasPool:
+    """
+    Contadores acumulados de uso de um pool de conexões
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+        self.eventos_overflow = 0
+        self.timeouts = 0
+
+    def registrar_checkout(self, espera: float):
+        """
+        Registra a obtenção de uma conexão e o tempo de espera por ela
+        """
+        with self._lock:
+            self.checkouts += 1
+            self.espera_total += espera
+            self.espera_maxima = max(self.espera_maxima, espera)
+
+    def registrar_overflow(self):
+        """
+        Registra a abertura de uma conexão além de pool_size
+        """
+        with self._lock:
+            self.eventos_overflow += 1
+
+    def registrar_timeout(self, espera: float):
+        """
+        Registra uma espera que terminou em timeout (erro 'QueuePool limit')
+        """
+        with self._lock:
+            self.timeouts += 1
+            self.espera_total += espera
+            self.espera_maxima = max(self.espera_maxima, espera)
+
+    def resumo(self, pool: Pool) -> Dict[str, Any]:
+        """
+        Combina os contadores acumulados com o estado atual do pool
+        """
+        with self._lock:
+            return {
+                "tamanho": pool.size(),
+                "conexoes_em_uso": pool.checkedout(),
+                "conexoes_livres": pool.checkedin(),
+                "overflow_atual": max(pool.overflow(), 0),
+                "checkouts": self.checkouts,
+                "espera_total_segundos": round(self.espera_total, 6),
+                "espera_media_segundos": round(self.espera_total / self.checkouts, 6) if self.checkouts else 0.0,
+                "espera_maxima_segundos": round(self.espera_maxima, 6),
+                "eventos_overflow": self.eventos_overflow,
+                "timeouts": self.timeouts,
+            }
+
+
+class _PoolMonitorado:
+    """
+    Mixin que mede o tempo de espera por conexões e os eventos de overflow
+    """
+
+    estatisticas: EstatisticasPool
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexao = super()._do_get()
+        except exc.TimeoutError:
+            self.estatisticas.registrar_timeout(time.perf_counter() - inicio)
+            raise
+        self.estatisticas.registrar_checkout(time.perf_counter() - inicio)
+        return conexao
+
+    def _inc_overflow(self):
+        # Não há I/O entre o incremento e a leitura, então o valor lido
+        # corresponde à conexão que está sendo aberta
+        incrementado = super()._inc_overflow()
+        if incrementado and self._overflow > 0:
+            self.estatisticas.registrar_overflow()
+        return incrementado
+
+
+class QueuePoolMonitorado(_PoolMonitorado, QueuePool):
+    """
+    QueuePool instrumentado, usado pelo engine síncrono
+    """
+
+    estatisticas = EstatisticasPool()
+
+
+class AsyncQueuePoolMonitorado(_PoolMonitorado, AsyncAdaptedQueuePool):
+    """
+    AsyncAdaptedQueuePool instrumentado, usado pelo engine assíncrono
+    """
+
+    estatisticas = EstatisticasPool()
+
+
+def opcoes_pool(settings) -> Dict[str, Any]:
+    """
+    Argumentos de pool comuns aos engines, a partir das configurações
+    """
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
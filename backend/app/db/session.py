@@ -5,18 +5,65 @@
 Configuração da sessão do banco de dados
 """
 
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.instrumentacao import registrar_consulta
+from app.db.pool import AsyncQueuePoolMonitorado, QueuePoolMonitorado, opcoes_pool
 
 # Criação do engine SQLAlchemy para conexão com o PostgreSQL
-engine = create_engine(str(settings.DATABASE_URI))
+# (usado na criação das tabelas e em scripts fora do ciclo de requisições)
+engine = create_engine(
+    str(settings.DATABASE_URI),
+    poolclass=QueuePoolMonitorado,
+    **opcoes_pool(settings),
+)
 
 # Fábrica de sessões para interação com o banco de dados
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrono (asyncpg) usado pelos endpoints, para não bloquear o event loop
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URI,
+    poolclass=AsyncQueuePoolMonitorado,
+    **opcoes_pool(settings),
+)
+
+# Fábrica de sessões assíncronas. expire_on_commit=False evita recarregamentos
+# implícitos (que exigiriam I/O fora de um await) após o commit
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+
+def _instrumentar(engine_sync):
+    """
+    Mede cada comando SQL do engine (para as métricas da requisição em andamento
+    e o log de consultas lentas, em app.core.instrumentacao).
+    """
+    @event.listens_for(engine_sync, "before_cursor_execute")
+    def _antes(conn, cursor, statement, parameters, context, executemany):
+        context._inicio_instrumentacao = time.perf_counter()
+
+    @event.listens_for(engine_sync, "after_cursor_execute")
+    def _depois(conn, cursor, statement, parameters, context, executemany):
+        registrar_consulta(
+            statement, parameters, executemany, time.perf_counter() - context._inicio_instrumentacao
+        )
+
+
+_instrumentar(engine)
+_instrumentar(async_engine.sync_engine)
+
 # Classe base para os modelos SQLAlchemy
 Base = declarative_base()
 
@@ -33,8 +80,27 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """
+    Dependência para obter uma sessão assíncrona do banco de dados.
+    Garante que a sessão seja fechada após o uso.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def estatisticas_pools():
+    """
+    Retorna as métricas de uso dos pools de conexões dos dois engines.
+    """
+    return {
+        "sync": QueuePoolMonitorado.estatisticas.resumo(engine.pool),
+        "async": AsyncQueuePoolMonitorado.estatisticas.resumo(async_engine.sync_engine.pool),
+    }
+
+
 def create_tables():
     """
     Cria todas as tabelas no banco de dados.
     """
-    Base.metadata.create_all(bind=engine) 
\ No newline at end of file
+    Base.metadata.create_all(bind=engine)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Schemas Pydantic para autenticação
+"""
+
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class Token(BaseModel):
+    """
+    Token de acesso retornado pelo login
+    """
+    access_token: str
+    token_type: str = "bearer"
+
+
+class UsuarioAtual(BaseModel):
+    """
+    Funcionário autenticado na requisição
+    """
+    funcionario_id: UUID
+    nome: str
+    cargo: str
+    estabelecimento_id: UUID
+    ativo: bool
+
+    class Config:
+        from_attributes = True
@@ -80,6 +80,23 @@ class CarteiraVacinacaoCompleta(CarteiraVacinacao):
         from_attributes = False
 
 
+class ErroImportacao(BaseModel):
+    """
+    Erro de um registro rejeitado na importação em lote (linha começa em 1)
+    """
+    linha: int
+    erro: str
+
+
+class ResultadoImportacao(BaseModel):
+    """
+    Resumo de uma importação em lote de registros de vacinação
+    """
+    recebidos: int
+    importados: int
+    erros: List[ErroImportacao]
+
+
 class CarteiraVacinacaoPaciente(BaseModel):
     """
     Schema para retornar todas as vacinas de um paciente
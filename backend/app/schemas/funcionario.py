@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Schemas Pydantic para validação e serialização de dados de Funcionário
+"""
+
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.schemas.estabelecimento import EstabelecimentoList
+
+
+class Funcionario(BaseModel):
+    """
+    Schema de retorno de um funcionário (sem o hash da senha)
+    """
+    funcionario_id: UUID
+    estabelecimento_id: UUID
+    nome: str
+    cpf: str
+    cargo: str
+    registro_profissional: Optional[str] = None
+    data_contratacao: date
+    telefone: Optional[str] = None
+    email: Optional[str] = None
+    ativo: bool
+    data_cadastro: datetime
+    ultima_atualizacao: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class FuncionarioDetalhado(Funcionario):
+    """
+    Schema de retorno de um funcionário com o estabelecimento em que trabalha
+    """
+    estabelecimento: Optional[EstabelecimentoList] = None
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Schemas Pydantic das buscas em lote por ID
+"""
+
+from typing import Generic, List, TypeVar
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class IdsLote(BaseModel):
+    """
+    IDs a buscar em uma única requisição
+    """
+    ids: List[UUID] = Field(..., min_length=1, max_length=settings.LOTE_MAX_IDS)
+
+
+class ResultadoLote(BaseModel, Generic[T]):
+    """
+    Registros encontrados, na ordem dos IDs pedidos (sem repetições), e os IDs
+    que não existem
+    """
+    itens: List[T]
+    nao_encontrados: List[UUID]
@@ -11,6 +11,8 @@ from uuid import UUID
 
 from pydantic import BaseModel, EmailStr, Field, validator
 
+from app.core.documentos import normalizar_cpf, normalizar_sus
+
 
 class PacienteBase(BaseModel):
     """
@@ -40,31 +42,30 @@ class PacienteCreate(PacienteBase):
     @validator('cpf')
     def validar_cpf(cls, v):
         """
-        Valida o formato do CPF (simplificado)
+        Valida o CPF e o normaliza no formato gravado no banco (000.000.000-00)
         """
-        # Remove caracteres não numéricos
-        cpf = ''.join(filter(str.isdigit, v))
-        if len(cpf) != 11:
-            raise ValueError('CPF deve conter 11 dígitos')
-        return v
+        return normalizar_cpf(v)
 
     @validator('sus_numero')
     def validar_sus(cls, v):
         """
-        Valida o formato do número do SUS (simplificado)
+        Valida o número do SUS e o normaliza no formato gravado no banco (só dígitos)
         """
-        # Remove caracteres não numéricos
-        sus = ''.join(filter(str.isdigit, v))
-        if len(sus) != 15:
-            raise ValueError('Número do SUS deve conter 15 dígitos')
-        return v
+        return normalizar_sus(v)
 
 
 class PacienteUpdate(PacienteBase):
     """
     Atributos que podem ser atualizados em um Paciente
     """
-    pass
+
+    @validator('cpf')
+    def validar_cpf(cls, v):
+        return normalizar_cpf(v) if v is not None else v
+
+    @validator('sus_numero')
+    def validar_sus(cls, v):
+        return normalizar_sus(v) if v is not None else v
 
 
 class PacienteInDBBase(PacienteBase):
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Schemas Pydantic para validação e serialização de dados de Prontuário
+"""
+
+from datetime import date, datetime
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class ResumoProntuario(BaseModel):
+    """
+    Resumo do prontuário de um paciente: identificação e totais de atendimentos,
+    vacinações e exames
+    """
+    paciente_id: UUID
+    nome: str
+    cpf: str
+    sus_numero: str
+    data_nascimento: date
+    tipo_sanguineo: Optional[str] = None
+    prontuario_id: UUID
+    total_atendimentos: int
+    ultimo_atendimento: Optional[datetime] = None
+    total_vacinas: int
+    total_exames: int
+    # Momento a que os totais se referem (última atualização da view materializada)
+    atualizado_em: Optional[datetime] = None
+
+
+class PacienteProntuario(BaseModel):
+    """
+    Identificação do paciente no prontuário completo
+    """
+    paciente_id: UUID
+    nome: str
+    cpf: str
+    sus_numero: str
+    data_nascimento: date
+    sexo: Optional[str] = None
+    tipo_sanguineo: Optional[str] = None
+
+
+class PrescricaoProntuario(BaseModel):
+    """
+    Prescrição de um atendimento
+    """
+    medicamento: str
+    principio_ativo: str
+    dosagem: str
+    frequencia: str
+    duracao: Optional[str] = None
+    data_prescricao: Optional[datetime] = None
+
+
+class ExameProntuario(BaseModel):
+    """
+    Exame solicitado em um atendimento
+    """
+    exame_id: UUID
+    tipo_exame: str
+    data_solicitacao: datetime
+    data_realizacao: Optional[datetime] = None
+    resultado: Optional[str] = None
+
+
+class AtendimentoProntuario(BaseModel):
+    """
+    Atendimento com suas prescrições e exames
+    """
+    atendimento_id: UUID
+    prontuario_id: UUID
+    data_atendimento: datetime
+    tipo_atendimento: str
+    descricao: Optional[str] = None
+    diagnostico: Optional[str] = None
+    medico: str
+    prescricoes: List[PrescricaoProntuario] = []
+    exames: List[ExameProntuario] = []
+
+
+class VacinacaoProntuario(BaseModel):
+    """
+    Vacina aplicada ao paciente
+    """
+    vacinacao_id: UUID
+    vacina: str
+    fabricante: Optional[str] = None
+    data_aplicacao: datetime
+    dose: str
+
+
+class ProntuarioCompleto(BaseModel):
+    """
+    Prontuário completo do paciente. As listas de atendimentos e vacinações
+    trazem apenas os registros mais recentes; os totais indicam se foram limitadas.
+    """
+    paciente: PacienteProntuario
+    atendimentos: List[AtendimentoProntuario]
+    vacinacoes: List[VacinacaoProntuario]
+    total_atendimentos: int
+    total_vacinas: int
+    total_exames: int
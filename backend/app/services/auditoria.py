@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Auditoria assíncrona dos acessos aos dados dos pacientes (historico_acesso)
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import asyncpg
+from fastapi import Request
+
+from app.core.config import settings
+from app.db.session import async_engine
+
+logger = logging.getLogger(__name__)
+
+_COLUNAS = ("paciente_id", "prontuario_id", "funcionario_id", "data_acesso", "tipo_acesso", "ip_acesso")
+
+# Chaves estrangeiras de historico_acesso, na ordem das primeiras colunas de _COLUNAS
+_REFERENCIAS = (("pacientes", "paciente_id"), ("prontuarios", "prontuario_id"), ("funcionarios", "funcionario_id"))
+
+# Tentativas de gravação de um lote antes de descartá-lo
+TENTATIVAS = 3
+
+
+class RegistroAuditoria:
+    """
+    Fila em memória dos acessos, gravada em lotes por uma tarefa de fundo.
+
+    Os endpoints enfileiram os acessos sem esperar pelo banco; a tarefa os grava
+    com COPY a cada ``intervalo`` segundos ou assim que a fila tiver
+    ``tamanho_lote`` eventos. A fila é limitada a ``capacidade`` eventos: cheia
+    (o banco não acompanha o ritmo dos acessos), ``registrar`` espera até
+    ``espera_maxima`` segundos por espaço, atrasando a resposta, e então descarta
+    o evento. Um lote que falha é tentado de novo nas rodadas seguintes, até
+    TENTATIVAS vezes. Ao parar, a tarefa grava todos os eventos ainda na fila.
+    Acessos a pacientes, prontuários ou funcionários removidos antes da gravação
+    são descartados.
+    """
+
+    def __init__(self, *, capacidade: int, tamanho_lote: int, intervalo: float, espera_maxima: float):
+        self.capacidade = capacidade
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.espera_maxima = espera_maxima
+        self._fila: "asyncio.Queue[Tuple]" = asyncio.Queue(maxsize=capacidade)
+        self._lote_cheio = asyncio.Event()
+        self._pendente: Optional[List[Tuple]] = None
+        self._tentativas = 0
+        self._tarefa: Optional[asyncio.Task] = None
+        self._parando = False
+        self.registrados = 0
+        self.gravados = 0
+        self.descartados = 0
+        self.perdidos = 0
+        self.lotes = 0
+        self.falhas = 0
+        self.maior_profundidade = 0
+        self.ultima_duracao: Optional[float] = None
+        self.ultimo_erro: Optional[str] = None
+
+    def iniciar(self):
+        if self._tarefa is None:
+            self._parando = False
+            self._tarefa = asyncio.create_task(self._executar())
+
+    async def parar(self):
+        """
+        Encerra a tarefa e grava os eventos restantes na fila.
+        """
+        if self._tarefa is None:
+            return
+        self._parando = True
+        self._lote_cheio.set()
+        await self._tarefa
+        self._tarefa = None
+        while self._pendente is not None or not self._fila.empty():
+            if not await self.descarregar():
+                restantes = len(self._pendente or []) + self._fila.qsize()
+                self.perdidos += restantes
+                logger.error("%d eventos de auditoria não gravados no encerramento", restantes)
+                break
+
+    async def registrar(
+        self,
+        tipo_acesso: str,
+        paciente_id: UUID,
+        *,
+        prontuario_id: Optional[UUID] = None,
+        funcionario_id: Optional[UUID] = None,
+        ip_acesso: Optional[str] = None,
+    ):
+        """
+        Enfileira um acesso. Só espera se a fila estiver cheia e ``espera_maxima`` > 0.
+        """
+        evento = (paciente_id, prontuario_id, funcionario_id, datetime.now(), tipo_acesso, ip_acesso)
+        try:
+            self._fila.put_nowait(evento)
+        except asyncio.QueueFull:
+            try:
+                if self.espera_maxima <= 0:
+                    raise asyncio.TimeoutError
+                await asyncio.wait_for(self._fila.put(evento), self.espera_maxima)
+            except asyncio.TimeoutError:
+                self.descartados += 1
+                if self.descartados % 1000 == 1:
+                    logger.warning("Fila de auditoria cheia: %d eventos descartados até agora", self.descartados)
+                return
+        self.registrados += 1
+        profundidade = self._fila.qsize()
+        self.maior_profundidade = max(self.maior_profundidade, profundidade)
+        if profundidade >= self.tamanho_lote:
+            self._lote_cheio.set()
+
+    async def descarregar(self) -> bool:
+        """
+        Grava um lote: o que falhou na rodada anterior ou até ``tamanho_lote``
+        eventos da fila. Retorna False se a gravação falhou.
+        """
+        lote = self._pendente
+        if lote is None:
+            lote = []
+            while len(lote) < self.tamanho_lote and not self._fila.empty():
+                lote.append(self._fila.get_nowait())
+            if not lote:
+                return True
+
+        inicio = time.perf_counter()
+        try:
+            gravados = await self._gravar(lote)
+        except Exception as erro:
+            self.falhas += 1
+            self.ultimo_erro = str(erro)
+            self._tentativas += 1
+            if self._tentativas < TENTATIVAS:
+                self._pendente = lote
+                logger.warning("Falha ao gravar %d eventos de auditoria: %s", len(lote), erro)
+            else:
+                self.perdidos += len(lote)
+                self._pendente = None
+                self._tentativas = 0
+                logger.error("%d eventos de auditoria descartados após %d tentativas: %s", len(lote), TENTATIVAS, erro)
+            return False
+
+        self._pendente = None
+        self._tentativas = 0
+        self.gravados += gravados
+        self.perdidos += len(lote) - gravados
+        self.lotes += 1
+        self.ultima_duracao = time.perf_counter() - inicio
+        return True
+
+    async def _gravar(self, lote: List[Tuple]) -> int:
+        # Um único COPY por lote, atômico, na partição do mês de cada acesso
+        async with async_engine.connect() as conexao:
+            bruta = (await conexao.get_raw_connection()).driver_connection
+            try:
+                await bruta.copy_records_to_table("historico_acesso", records=lote, columns=_COLUNAS)
+                return len(lote)
+            except asyncpg.ForeignKeyViolationError:
+                # Paciente, prontuário ou funcionário removido entre o acesso e a
+                # gravação: grava os acessos que ainda referenciam registros existentes
+                existentes = []
+                for posicao, (tabela, coluna) in enumerate(_REFERENCIAS):
+                    ids = list({evento[posicao] for evento in lote if evento[posicao] is not None})
+                    linhas = await bruta.fetch(f"SELECT {coluna} FROM {tabela} WHERE {coluna} = ANY($1::uuid[])", ids)
+                    existentes.append({linha[coluna] for linha in linhas})
+                validos = [
+                    evento for evento in lote
+                    if all(
+                        evento[posicao] is None or evento[posicao] in existentes[posicao]
+                        for posicao in range(len(_REFERENCIAS))
+                    )
+                ]
+                if validos:
+                    await bruta.copy_records_to_table("historico_acesso", records=validos, columns=_COLUNAS)
+                return len(validos)
+
+    async def _executar(self):
+        while not self._parando:
+            # Espera o intervalo, a menos que a fila já tenha um lote completo; depois
+            # de uma falha, espera sempre, para não insistir com o banco indisponível
+            if self._pendente is not None or self._fila.qsize() < self.tamanho_lote:
+                self._lote_cheio.clear()
+                try:
+                    await asyncio.wait_for(self._lote_cheio.wait(), self.intervalo)
+                except asyncio.TimeoutError:
+                    pass
+            if not self._parando:
+                await self.descarregar()
+
+    def resumo(self) -> Dict[str, Any]:
+        return {
+            "ativa": self._tarefa is not None,
+            "profundidade": self._fila.qsize(),
+            "maior_profundidade": self.maior_profundidade,
+            "capacidade": self.capacidade,
+            "tamanho_lote": self.tamanho_lote,
+            "intervalo_segundos": self.intervalo,
+            "espera_maxima_segundos": self.espera_maxima,
+            "registrados": self.registrados,
+            "gravados": self.gravados,
+            "descartados": self.descartados,
+            "perdidos": self.perdidos,
+            "pendentes": len(self._pendente or []),
+            "lotes": self.lotes,
+            "falhas": self.falhas,
+            "ultima_duracao_segundos": self.ultima_duracao,
+            "ultimo_erro": self.ultimo_erro,
+        }
+
+
+# Registro do processo, iniciado e parado com a aplicação
+registro_auditoria = RegistroAuditoria(
+    capacidade=settings.AUDITORIA_CAPACIDADE_FILA,
+    tamanho_lote=settings.AUDITORIA_TAMANHO_LOTE,
+    intervalo=settings.AUDITORIA_INTERVALO,
+    espera_maxima=settings.AUDITORIA_ESPERA_MAXIMA,
+)
+
+
+async def auditar(
+    request: Request,
+    tipo_acesso: str,
+    pacientes: Iterable[UUID],
+    prontuario_id: Optional[UUID] = None,
+):
+    """
+    Registra o acesso da requisição aos dados de cada paciente (sem repetições).
+    O funcionário é o autenticado na requisição (request.state.funcionario_id), se houver.
+    """
+    if not settings.AUDITORIA_HABILITADA:
+        return
+    funcionario_id = getattr(request.state, "funcionario_id", None)
+    ip_acesso = request.client.host if request.client else None
+    for paciente_id in dict.fromkeys(pacientes):
+        await registro_auditoria.registrar(
+            tipo_acesso,
+            paciente_id,
+            prontuario_id=prontuario_id,
+            funcionario_id=funcionario_id,
+            ip_acesso=ip_acesso,
+        )
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Autenticação dos funcionários: login por CPF e senha e verificação dos tokens de acesso
+"""
+
+import time
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core import cache
+from app.core.security import decodificar_token, verificar_senha
+from app.db.models.funcionario import Funcionario
+from app.db.session import AsyncSessionLocal
+from app.schemas.autenticacao import UsuarioAtual
+
+
+async def autenticar(db: AsyncSession, cpf: str, senha: str) -> Optional[Funcionario]:
+    """
+    Retorna o funcionário ativo com o CPF e a senha informados, ou None.
+
+    O bcrypt é executado fora do event loop, e também quando o funcionário não
+    existe ou não tem senha, para que o tempo de resposta seja o mesmo em todos os casos.
+    """
+    funcionario = (await db.execute(select(Funcionario).where(Funcionario.cpf == cpf))).scalar_one_or_none()
+    senha_hash = funcionario.senha_hash if funcionario is not None else None
+    if not await run_in_threadpool(verificar_senha, senha, senha_hash):
+        return None
+    if not funcionario.ativo:
+        return None
+    return funcionario
+
+
+async def usuario_do_token(token: str) -> Optional[UsuarioAtual]:
+    """
+    Retorna o funcionário do token de acesso, ou None se o token for inválido,
+    tiver expirado ou o funcionário não existir ou estiver inativo.
+
+    Tokens já verificados ficam em cache.tokens com o funcionário correspondente:
+    uma requisição com um token conhecido não verifica a assinatura nem consulta o
+    banco. O cache é limpo a cada alteração em funcionarios (invalidacao_cache), e a
+    expiração do próprio token continua sendo respeitada.
+    """
+    em_cache = cache.tokens.obter(("token", token))
+    if em_cache is not None:
+        usuario, expira_em = em_cache
+        if expira_em > time.time():
+            return usuario
+        cache.tokens.invalidar(("token", token))
+        return None
+
+    declaracoes = decodificar_token(token)
+    if declaracoes is None:
+        return None
+    try:
+        funcionario_id = UUID(declaracoes["sub"])
+    except (TypeError, ValueError):
+        return None
+
+    geracao = cache.tokens.geracao
+    async with AsyncSessionLocal() as db:
+        funcionario = await db.get(Funcionario, funcionario_id)
+    if funcionario is None or not funcionario.ativo:
+        return None
+    usuario = UsuarioAtual.model_validate(funcionario)
+    cache.tokens.guardar(("token", token), (usuario, declaracoes["exp"]), len(token), geracao=geracao)
+    return usuario
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Exportação em streaming (NDJSON e CSV) com cursores do lado do servidor
+"""
+
+import csv
+import io
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Iterable, Sequence
+
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+
+# Formatos aceitos e seus tipos de mídia
+FORMATOS_EXPORTACAO = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+async def _particoes(query: Select) -> AsyncIterator[Sequence]:
+    """
+    Percorre o resultado com um cursor do lado do servidor, em partições de
+    EXPORTACAO_TAMANHO_PARTICAO linhas, mantendo a memória constante.
+    A sessão é própria do streaming, pois dura mais que o processamento do endpoint.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            query.execution_options(yield_per=settings.EXPORTACAO_TAMANHO_PARTICAO)
+        )
+        async for particao in result.mappings().partitions():
+            yield particao
+
+
+async def _gerar_ndjson(query: Select, adapter: TypeAdapter) -> AsyncIterator[bytes]:
+    async for particao in _particoes(query):
+        yield b"".join(adapter.dump_json(adapter.validate_python(linha)) + b"\n" for linha in particao)
+
+
+def _valor_csv(valor: Any) -> Any:
+    if valor is None:
+        return ""
+    if isinstance(valor, (datetime, date)):
+        return valor.isoformat()
+    return valor
+
+
+def _linhas_csv(linhas: Iterable[Sequence[Any]]) -> bytes:
+    saida = io.StringIO()
+    escritor = csv.writer(saida)
+    escritor.writerows([_valor_csv(v) for v in linha] for linha in linhas)
+    return saida.getvalue().encode()
+
+
+async def _gerar_csv(query: Select) -> AsyncIterator[bytes]:
+    # O cabeçalho é enviado antes mesmo da primeira consulta ao banco
+    yield _linhas_csv([[coluna.key for coluna in query.selected_columns]])
+    async for particao in _particoes(query):
+        yield _linhas_csv(linha.values() for linha in particao)
+
+
+def resposta_exportacao(query: Select, formato: str, adapter: TypeAdapter, nome_arquivo: str) -> StreamingResponse:
+    """
+    Monta a resposta em streaming da consulta no formato pedido (ndjson ou csv).
+    No NDJSON, cada linha é validada e serializada pelo schema do adapter.
+    """
+    gerador = _gerar_csv(query) if formato == "csv" else _gerar_ndjson(query, adapter)
+    return StreamingResponse(
+        gerador,
+        media_type=FORMATOS_EXPORTACAO[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nome_arquivo}.{formato}"'},
+    )
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Importação em lote de registros de vacinação via COPY
+"""
+
+import codecs
+import csv
+import uuid
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+import asyncpg
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import any_, bindparam, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.carteira_vacinacao import CarteiraVacinacao, UQ_CARTEIRA_VACINACAO_DOSE
+from app.db.models.estabelecimento import Estabelecimento
+from app.db.models.funcionario import Funcionario
+from app.db.models.paciente import Paciente
+from app.db.models.vacina import Vacina
+from app.schemas.carteira_vacinacao import CarteiraVacinacaoCreate
+
+_lote_adapter = TypeAdapter(List[CarteiraVacinacaoCreate])
+
+# Referências verificadas de forma agregada para cada lote
+_REFERENCIAS = (
+    ("paciente_id", Paciente.paciente_id, "Paciente não encontrado"),
+    ("vacina_id", Vacina.vacina_id, "Vacina não encontrada"),
+    ("funcionario_id", Funcionario.funcionario_id, "Funcionário não encontrado"),
+    ("estabelecimento_id", Estabelecimento.estabelecimento_id, "Estabelecimento não encontrado"),
+)
+
+# Tabela temporária que recebe o COPY antes da inserção definitiva
+_TABELA_IMPORTACAO = "importacao_carteira_vacinacao"
+_COLUNAS = (
+    "paciente_id",
+    "vacina_id",
+    "funcionario_id",
+    "estabelecimento_id",
+    "data_aplicacao",
+    "dose",
+    "observacoes",
+)
+
+
+# Tentativas de gravar um lote cujas referências são removidas durante a importação
+_TENTATIVAS = 3
+
+
+class RegistroInvalido:
+    """
+    Registro que não pôde ser lido do arquivo; é reportado como erro da sua linha.
+    """
+
+    __slots__ = ("erro",)
+
+    def __init__(self, erro: str):
+        self.erro = erro
+
+
+def registros_csv(conteudo: bytes) -> Iterator[Any]:
+    """
+    Lê os registros de um CSV em UTF-8 (com ou sem BOM) com cabeçalho. Campos
+    vazios equivalem a campos não informados. Registros com bytes fora do UTF-8,
+    com caracteres nulos (que o PostgreSQL não aceita em texto) ou que o leitor
+    de CSV rejeita são devolvidos como RegistroInvalido, sem interromper a
+    leitura dos demais. Levanta ValueError se o cabeçalho for inválido.
+    """
+    if conteudo.startswith(codecs.BOM_UTF8):
+        conteudo = conteudo[len(codecs.BOM_UTF8):]
+    # Linhas do arquivo (a partir de 1) que não podem ser importadas, com o motivo
+    invalidas: Dict[int, str] = {}
+
+    def linhas() -> Iterator[str]:
+        for numero, linha in enumerate(conteudo.splitlines(keepends=True), start=1):
+            if b"\x00" in linha:
+                invalidas[numero] = "Caractere nulo no registro"
+            try:
+                yield linha.decode("utf-8")
+            except UnicodeDecodeError:
+                invalidas[numero] = "Caracteres inválidos: o arquivo deve estar em UTF-8"
+                yield linha.decode("utf-8", errors="replace")
+
+    leitor = csv.reader(linhas())
+    try:
+        campos = next(leitor, None)
+    except csv.Error as erro:
+        raise ValueError(f"Cabeçalho do CSV inválido: {erro}") from erro
+    if invalidas:
+        raise ValueError(f"Cabeçalho do CSV inválido ({next(iter(invalidas.values()))})")
+    return _registros_csv(leitor, campos or [], invalidas)
+
+
+def _registros_csv(leitor, campos: List[str], invalidas: Dict[int, str]) -> Iterator[Any]:
+    ultima_linha = leitor.line_num
+    while True:
+        try:
+            valores = next(leitor)
+        except StopIteration:
+            return
+        except csv.Error as erro:
+            # O leitor descarta o registro com erro e continua no seguinte
+            yield RegistroInvalido(f"CSV inválido: {erro}")
+        else:
+            # Um registro pode ocupar várias linhas (campos entre aspas com quebras de linha)
+            motivos = [motivo for numero, motivo in invalidas.items() if ultima_linha < numero <= leitor.line_num]
+            if motivos:
+                yield RegistroInvalido(motivos[0])
+            elif valores:
+                yield {campo: valor or None for campo, valor in zip(campos, valores)}
+        ultima_linha = leitor.line_num
+
+
+def _em_lotes(itens: Iterable, tamanho: int) -> Iterator[List]:
+    iterador = iter(itens)
+    while lote := list(islice(iterador, tamanho)):
+        yield lote
+
+
+def _validar_lote(lote: List[Tuple[int, Any]], erros: List[Dict]) -> List[Tuple[int, CarteiraVacinacaoCreate]]:
+    """
+    Valida o lote com uma única chamada ao validador. Se houver registros inválidos,
+    eles são reportados e os demais são validados novamente, sem os rejeitados.
+    """
+    if any(isinstance(registro, RegistroInvalido) for _, registro in lote):
+        erros.extend(
+            {"linha": linha, "erro": registro.erro} for linha, registro in lote if isinstance(registro, RegistroInvalido)
+        )
+        lote = [item for item in lote if not isinstance(item[1], RegistroInvalido)]
+        if not lote:
+            return []
+    try:
+        registros = _lote_adapter.validate_python([registro for _, registro in lote])
+        return [(linha, registro) for (linha, _), registro in zip(lote, registros)]
+    except ValidationError as erro:
+        invalidos = {}
+        for detalhe in erro.errors():
+            indice = detalhe["loc"][0]
+            if indice not in invalidos:
+                campo = ".".join(str(parte) for parte in detalhe["loc"][1:])
+                invalidos[indice] = f"{campo}: {detalhe['msg']}" if campo else detalhe["msg"]
+
+    for indice, mensagem in invalidos.items():
+        erros.append({"linha": lote[indice][0], "erro": mensagem})
+    restantes = [item for indice, item in enumerate(lote) if indice not in invalidos]
+    return _validar_lote(restantes, erros) if restantes else []
+
+
+async def _ids_existentes(db: AsyncSession, coluna, ids: Set[uuid.UUID]) -> Set[uuid.UUID]:
+    """
+    Retorna quais dos ids existem na tabela, com uma única consulta ``= ANY(array)``.
+    """
+    parametro = bindparam("ids", value=list(ids), type_=ARRAY(coluna.type))
+    result = await db.execute(select(coluna).where(coluna == any_(parametro)))
+    return set(result.scalars().all())
+
+
+async def _resolver_referencias(
+    db: AsyncSession, registros: List[Tuple[int, CarteiraVacinacaoCreate]], erros: List[Dict]
+) -> List[Tuple[int, CarteiraVacinacaoCreate]]:
+    """
+    Rejeita os registros que apontam para paciente, vacina, funcionário ou
+    estabelecimento inexistentes, com uma consulta por tipo de entidade.
+    """
+    for campo, coluna, mensagem in _REFERENCIAS:
+        if not registros:
+            break
+        existentes = await _ids_existentes(db, coluna, {getattr(r, campo) for _, r in registros})
+        validos = []
+        for linha, registro in registros:
+            if getattr(registro, campo) in existentes:
+                validos.append((linha, registro))
+            else:
+                erros.append({"linha": linha, "erro": mensagem})
+        registros = validos
+    return registros
+
+
+async def _copiar_lote(
+    db: AsyncSession, registros: List[Tuple[int, CarteiraVacinacaoCreate]], erros: List[Dict]
+) -> int:
+    """
+    Carrega o lote com COPY em uma tabela temporária e o insere na carteira com
+    um único INSERT ... SELECT. Doses já registradas (no banco ou repetidas no
+    próprio lote) são rejeitadas pela restrição única e reportadas como erro.
+    """
+    linhas_por_chave = {}
+    copia = []
+    for linha, registro in registros:
+        chave = (registro.paciente_id, registro.vacina_id, registro.dose)
+        if chave in linhas_por_chave:
+            erros.append({"linha": linha, "erro": _mensagem_dose_repetida(registro.dose)})
+            continue
+        linhas_por_chave[chave] = linha
+        copia.append((
+            registro.paciente_id,
+            registro.vacina_id,
+            registro.funcionario_id,
+            registro.estabelecimento_id,
+            registro.data_aplicacao,
+            registro.dose,
+            registro.observacoes,
+        ))
+
+    colunas = ", ".join(_COLUNAS)
+    await db.execute(text(
+        f"CREATE TEMP TABLE {_TABELA_IMPORTACAO} ON COMMIT DROP AS "
+        f"SELECT {colunas} FROM {CarteiraVacinacao.__tablename__} WITH NO DATA"
+    ))
+
+    # O COPY usa a mesma conexão (e transação) da sessão
+    conexao = await db.connection()
+    bruta = await conexao.get_raw_connection()
+    await bruta.driver_connection.copy_records_to_table(
+        _TABELA_IMPORTACAO, records=copia, columns=_COLUNAS
+    )
+
+    # Identificadores e data de cadastro são gerados pelo próprio banco
+    result = await db.execute(text(
+        f"INSERT INTO {CarteiraVacinacao.__tablename__} (vacinacao_id, data_cadastro, {colunas}) "
+        f"SELECT gen_random_uuid(), LOCALTIMESTAMP, {colunas} FROM {_TABELA_IMPORTACAO} "
+        f"ON CONFLICT ON CONSTRAINT {UQ_CARTEIRA_VACINACAO_DOSE} DO NOTHING "
+        f"RETURNING paciente_id, vacina_id, dose"
+    ))
+    inseridos = set(result.tuples().all())
+    await db.commit()
+
+    for chave, linha in linhas_por_chave.items():
+        if chave not in inseridos:
+            erros.append({"linha": linha, "erro": _mensagem_dose_repetida(chave[2])})
+    return len(inseridos)
+
+
+def _referencia_removida(erro: IntegrityError) -> bool:
+    # asyncpg: o erro original do driver é a causa do erro adaptado pelo SQLAlchemy
+    return isinstance(getattr(erro.orig, "__cause__", None), asyncpg.ForeignKeyViolationError)
+
+
+async def _gravar_lote(
+    db: AsyncSession, registros: List[Tuple[int, CarteiraVacinacaoCreate]], erros: List[Dict]
+) -> int:
+    """
+    Verifica as referências do lote e o grava em uma transação. Se uma referência
+    for removida entre a verificação e a inserção, a transação é desfeita e o lote
+    é verificado e gravado de novo, agora sem os registros que apontam para ela.
+    """
+    for _ in range(_TENTATIVAS):
+        erros_lote: List[Dict] = []
+        validos = await _resolver_referencias(db, registros, erros_lote)
+        if not validos:
+            await db.rollback()
+            erros.extend(erros_lote)
+            return 0
+        try:
+            importados = await _copiar_lote(db, validos, erros_lote)
+        except IntegrityError as erro:
+            await db.rollback()
+            if not _referencia_removida(erro):
+                raise
+            continue
+        erros.extend(erros_lote)
+        return importados
+
+    erros.extend(
+        {"linha": linha, "erro": "Referência removida durante a importação"} for linha, _ in registros
+    )
+    return 0
+
+
+def _mensagem_dose_repetida(dose: str) -> str:
+    return f"Paciente já recebeu esta dose ({dose}) desta vacina"
+
+
+async def importar_vacinacoes(
+    db: AsyncSession, registros: Iterable[Any], tamanho_lote: int
+) -> Dict[str, Any]:
+    """
+    Importa registros de vacinação em lotes, cada um em sua própria transação.
+    Os registros podem vir de um JSON ou de um CSV (dicionários ou
+    RegistroInvalido, ver registros_csv); os rejeitados são devolvidos com o
+    número da linha (a partir de 1) e o motivo.
+    """
+    resultado = {"recebidos": 0, "importados": 0, "erros": []}
+
+    for lote in _em_lotes(enumerate(registros, start=1), tamanho_lote):
+        resultado["recebidos"] += len(lote)
+        validos = _validar_lote(lote, resultado["erros"])
+        if validos:
+            resultado["importados"] += await _gravar_lote(db, validos, resultado["erros"])
+
+    resultado["erros"].sort(key=lambda erro: erro["linha"])
+    return resultado
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Invalidação dos caches em memória entre workers via LISTEN/NOTIFY do PostgreSQL
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+import asyncpg
+
+from app.core import cache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Canal usado pelos gatilhos notificar_alteracao_referencia() do schema.sql
+CANAL_ALTERACOES = "alteracoes_referencia"
+
+# Intervalo (segundos) entre as verificações de que a conexão continua ativa
+INTERVALO_VERIFICACAO = 30.0
+ESPERA_MAXIMA_RECONEXAO = 30.0
+
+_CACHES_POR_TABELA = {
+    "vacinas": cache.vacinas,
+    "estabelecimentos": cache.estabelecimentos,
+}
+
+# Caches derivados de uma tabela, descartados por inteiro a cada alteração nela
+# (os tokens verificados guardam os dados do funcionário, que pode ter sido desativado)
+_CACHES_DEPENDENTES = {
+    "funcionarios": (cache.tokens,),
+}
+
+
+def aplicar_notificacao(conteudo: str) -> bool:
+    """
+    Descarta do cache da tabela notificada o registro alterado e as listagens, e
+    limpa os caches que dependem dela. Retorna False se a notificação não
+    corresponder a nenhum cache.
+    """
+    try:
+        alteracao = json.loads(conteudo)
+        cache_tabela = _CACHES_POR_TABELA.get(alteracao["tabela"])
+        dependentes = _CACHES_DEPENDENTES.get(alteracao["tabela"], ())
+    except (ValueError, KeyError, TypeError):
+        return False
+    if cache_tabela is None and not dependentes:
+        return False
+
+    if cache_tabela is not None:
+        try:
+            cache_tabela.invalidar(("id", UUID(alteracao["id"])))
+        except (KeyError, TypeError, ValueError):
+            # Sem o id não é possível saber qual item mudou
+            cache_tabela.limpar()
+        cache_tabela.invalidar_grupo("lista")
+    for dependente in dependentes:
+        dependente.limpar()
+    return True
+
+
+class OuvinteAlteracoes:
+    """
+    Tarefa de fundo (uma por worker) que mantém uma conexão dedicada em LISTEN
+    no canal de alterações e invalida os caches a cada notificação.
+
+    Se a conexão cair, ela é refeita com espera crescente; como as notificações
+    enviadas nesse intervalo se perdem, todos os caches são limpos ao reconectar.
+    """
+
+    def __init__(self, dsn: str, canal: str = CANAL_ALTERACOES):
+        self.dsn = dsn
+        self.canal = canal
+        self._tarefa: Optional[asyncio.Task] = None
+        self.conectado = False
+        self.notificacoes = 0
+        self.ignoradas = 0
+        self.reconexoes = 0
+
+    def iniciar(self):
+        if self._tarefa is None:
+            self._tarefa = asyncio.create_task(self._executar())
+
+    async def parar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    def _ao_notificar(self, conexao, pid, canal, conteudo):
+        if aplicar_notificacao(conteudo):
+            self.notificacoes += 1
+        else:
+            self.ignoradas += 1
+
+    async def _executar(self):
+        espera = 1.0
+        while True:
+            try:
+                conexao = await asyncpg.connect(self.dsn)
+                try:
+                    await conexao.add_listener(self.canal, self._ao_notificar)
+                    for cache_processo in cache.caches.values():
+                        cache_processo.limpar()
+                    self.conectado = True
+                    espera = 1.0
+                    while True:
+                        await asyncio.sleep(INTERVALO_VERIFICACAO)
+                        await conexao.execute("SELECT 1", timeout=INTERVALO_VERIFICACAO)
+                finally:
+                    self.conectado = False
+                    conexao.terminate()
+            except asyncio.CancelledError:
+                raise
+            except Exception as erro:
+                logger.warning("Conexão de invalidação de cache indisponível: %s", erro)
+            self.reconexoes += 1
+            await asyncio.sleep(espera)
+            espera = min(espera * 2, ESPERA_MAXIMA_RECONEXAO)
+
+    def resumo(self) -> Dict[str, Any]:
+        return {
+            "canal": self.canal,
+            "conectado": self.conectado,
+            "notificacoes": self.notificacoes,
+            "ignoradas": self.ignoradas,
+            "reconexoes": self.reconexoes,
+        }
+
+
+# Ouvinte do processo, iniciado e parado com a aplicação
+ouvinte_alteracoes = OuvinteAlteracoes(str(settings.DATABASE_URI))
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Manutenção das partições mensais de atendimentos e historico_acesso
+"""
+
+import logging
+from typing import Any, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.db.session import async_engine
+from app.services.tarefa_periodica import TarefaPeriodica
+
+logger = logging.getLogger(__name__)
+
+# Partições de cada tabela com seus limites e o número estimado de linhas
+_CONSULTA_PARTICOES = text("""
+    SELECT c.relname AS particao,
+           pg_get_expr(c.relpartbound, c.oid) AS limites,
+           GREATEST(c.reltuples, 0)::BIGINT AS linhas_estimadas
+    FROM pg_inherits h
+    JOIN pg_class c ON c.oid = h.inhrelid
+    WHERE h.inhparent = CAST(:tabela AS regclass)
+    ORDER BY c.relname
+""")
+
+
+class ManutencaoParticoes(TarefaPeriodica):
+    """
+    Tarefa de fundo que executa manter_particoes (schema.sql) a cada ``intervalo``
+    segundos para cada tabela particionada: cria as partições dos próximos
+    ``meses_futuros`` meses e arquiva as anteriores ao período de retenção da tabela.
+
+    O lock_timeout evita que o ATTACH/DETACH fique na fila atrás de consultas
+    longas, bloqueando as demais; nesse caso a manutenção é tentada de novo na
+    próxima rodada.
+    """
+
+    descricao = "manutenção das partições"
+
+    def __init__(self, retencao: Dict[str, int], meses_futuros: int, intervalo: float):
+        super().__init__("manter_particoes", intervalo)
+        self.retencao = retencao
+        self.meses_futuros = meses_futuros
+        self.ultimas_acoes: List[Dict[str, str]] = []
+
+    async def manter(self) -> bool:
+        """
+        Faz a manutenção agora. Retorna False se outro processo já a estiver fazendo.
+        """
+        return await self.executar()
+
+    async def _rodada(self, conexao: AsyncConnection) -> List[Dict[str, str]]:
+        await conexao.execute(text("SET LOCAL lock_timeout = '5s'"))
+        acoes = []
+        for tabela, meses_retencao in self.retencao.items():
+            result = await conexao.execute(
+                text("SELECT acao, particao FROM manter_particoes(:tabela, :meses_futuros, :meses_retencao)"),
+                {"tabela": tabela, "meses_futuros": self.meses_futuros, "meses_retencao": meses_retencao},
+            )
+            acoes.extend(dict(linha) for linha in result.mappings())
+        return acoes
+
+    def _concluida(self, acoes: List[Dict[str, str]]):
+        for acao in acoes:
+            logger.info("Partição %s: %s", acao["acao"], acao["particao"])
+        self.ultimas_acoes = acoes
+
+    async def particoes(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Partições atuais de cada tabela, com seus limites e linhas estimadas
+        """
+        async with async_engine.connect() as conexao:
+            return {
+                tabela: [
+                    dict(linha)
+                    for linha in (await conexao.execute(_CONSULTA_PARTICOES, {"tabela": tabela})).mappings()
+                ]
+                for tabela in self.retencao
+            }
+
+    async def resumo(self) -> Dict[str, Any]:
+        return {
+            **self.estatisticas(),
+            "meses_futuros": self.meses_futuros,
+            "retencao_meses": self.retencao,
+            "ultimas_acoes": self.ultimas_acoes,
+            "particoes": await self.particoes(),
+        }
+
+
+# Manutenção do processo, iniciada e parada com a aplicação
+manutencao_particoes = ManutencaoParticoes(
+    {
+        "atendimentos": settings.PARTICOES_RETENCAO_ATENDIMENTOS,
+        "historico_acesso": settings.PARTICOES_RETENCAO_HISTORICO_ACESSO,
+    },
+    settings.PARTICOES_MESES_FUTUROS,
+    settings.PARTICOES_INTERVALO_MANUTENCAO,
+)
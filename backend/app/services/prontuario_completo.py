@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Prontuário completo de um paciente, montado como um documento aninhado
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.resumo_prontuarios import CAMPOS_BUSCA
+
+# Identificação do paciente e totais mantidos pelos gatilhos em resumo_pacientes,
+# usados para indicar ao cliente se as listas foram limitadas
+_CONSULTA_PACIENTE = """
+    SELECT
+        p.paciente_id, p.nome, p.cpf, p.sus_numero, p.data_nascimento, p.sexo, p.tipo_sanguineo,
+        COALESCE(r.total_atendimentos, 0) AS total_atendimentos,
+        COALESCE(r.total_vacinas, 0) AS total_vacinas,
+        COALESCE(r.total_exames, 0) AS total_exames
+    FROM pacientes p
+    LEFT JOIN resumo_pacientes r ON r.paciente_id = p.paciente_id
+    WHERE p.{campo} = :valor
+"""
+
+# Atendimentos mais recentes de todos os prontuários do paciente
+_CONSULTA_ATENDIMENTOS = text("""
+    SELECT
+        a.atendimento_id, a.prontuario_id, a.data_atendimento, a.tipo_atendimento,
+        a.descricao, a.diagnostico, f.nome AS medico
+    FROM prontuarios pr
+    JOIN atendimentos a ON a.prontuario_id = pr.prontuario_id
+    JOIN funcionarios f ON f.funcionario_id = a.funcionario_id
+    WHERE pr.paciente_id = :paciente_id
+    ORDER BY a.data_atendimento DESC, a.atendimento_id
+    LIMIT :limite
+""")
+
+# Prescrições e exames apenas dos atendimentos retornados (índices por atendimento_id)
+_CONSULTA_PRESCRICOES = text("""
+    SELECT
+        pr.atendimento_id, m.nome AS medicamento, m.principio_ativo,
+        pr.dosagem, pr.frequencia, pr.duracao, pr.data_prescricao
+    FROM prescricoes pr
+    JOIN medicamentos m ON m.medicamento_id = pr.medicamento_id
+    WHERE pr.atendimento_id = ANY(:atendimentos)
+    ORDER BY pr.data_prescricao, pr.prescricao_id
+""").bindparams(bindparam("atendimentos", type_=ARRAY(UUID(as_uuid=True))))
+
+_CONSULTA_EXAMES = text("""
+    SELECT
+        e.atendimento_id, e.exame_id, e.tipo_exame, e.data_solicitacao,
+        e.data_realizacao, e.resultado
+    FROM exames e
+    WHERE e.atendimento_id = ANY(:atendimentos)
+    ORDER BY e.data_solicitacao, e.exame_id
+""").bindparams(bindparam("atendimentos", type_=ARRAY(UUID(as_uuid=True))))
+
+# Vacinações mais recentes (idx_vacinacao_paciente_data_id)
+_CONSULTA_VACINACOES = text("""
+    SELECT
+        cv.vacinacao_id, v.nome AS vacina, v.fabricante, cv.data_aplicacao, cv.dose
+    FROM carteira_vacinacao cv
+    JOIN vacinas v ON v.vacina_id = cv.vacina_id
+    WHERE cv.paciente_id = :paciente_id
+    ORDER BY cv.data_aplicacao DESC, cv.vacinacao_id DESC
+    LIMIT :limite
+""")
+
+
+def _agrupar_por_atendimento(linhas) -> Dict[Any, List[Dict[str, Any]]]:
+    grupos = defaultdict(list)
+    for linha in linhas:
+        item = dict(linha)
+        grupos[item.pop("atendimento_id")].append(item)
+    return grupos
+
+
+async def obter_prontuario_completo(
+    db: AsyncSession,
+    campo: str,
+    valor: Any,
+    *,
+    limite_atendimentos: int,
+    limite_vacinacoes: int,
+) -> Optional[Dict[str, Any]]:
+    """
+    Retorna o prontuário do paciente como um documento aninhado (atendimentos
+    com suas prescrições e exames, e vacinações), ou None se ele não existir.
+
+    Cada coleção é lida com uma consulta própria, de modo que o número de linhas
+    lidas é a soma do tamanho das coleções, e não o seu produto. Atendimentos e
+    vacinações são limitados aos mais recentes; os totais permitem ao cliente
+    saber se as listas foram truncadas. ``campo`` deve estar em CAMPOS_BUSCA.
+    """
+    if campo not in CAMPOS_BUSCA:
+        raise ValueError(f"Campo de busca inválido: {campo}")
+    paciente = (await db.execute(text(_CONSULTA_PACIENTE.format(campo=campo)), {"valor": valor})).mappings().first()
+    if paciente is None:
+        return None
+    paciente = dict(paciente)
+    totais = {nome: paciente.pop(nome) for nome in ("total_atendimentos", "total_vacinas", "total_exames")}
+    paciente_id = paciente["paciente_id"]
+
+    atendimentos = [
+        dict(linha)
+        for linha in (await db.execute(
+            _CONSULTA_ATENDIMENTOS, {"paciente_id": paciente_id, "limite": limite_atendimentos}
+        )).mappings()
+    ]
+    if atendimentos:
+        ids = [atendimento["atendimento_id"] for atendimento in atendimentos]
+        prescricoes = _agrupar_por_atendimento(
+            (await db.execute(_CONSULTA_PRESCRICOES, {"atendimentos": ids})).mappings()
+        )
+        exames = _agrupar_por_atendimento(
+            (await db.execute(_CONSULTA_EXAMES, {"atendimentos": ids})).mappings()
+        )
+        for atendimento in atendimentos:
+            atendimento["prescricoes"] = prescricoes.get(atendimento["atendimento_id"], [])
+            atendimento["exames"] = exames.get(atendimento["atendimento_id"], [])
+
+    vacinacoes = (await db.execute(
+        _CONSULTA_VACINACOES, {"paciente_id": paciente_id, "limite": limite_vacinacoes}
+    )).mappings().all()
+
+    return {
+        "paciente": paciente,
+        "atendimentos": atendimentos,
+        "vacinacoes": vacinacoes,
+        **totais,
+    }
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Resumo dos prontuários: consulta à view materializada e sua atualização periódica
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.config import settings
+from app.db.session import async_engine
+from app.services.tarefa_periodica import TarefaPeriodica
+
+VISAO_RESUMO = "mv_resumo_prontuarios"
+
+# Colunas pelas quais o resumo pode ser consultado (todas indexadas)
+CAMPOS_BUSCA = ("paciente_id", "cpf", "sus_numero")
+
+# Resumo a partir da view, com o momento da sua última atualização
+_CONSULTA_VISAO = f"""
+    SELECT mv.*, av.atualizada_em AS atualizado_em
+    FROM {VISAO_RESUMO} mv
+    LEFT JOIN atualizacoes_visoes av ON av.visao = '{VISAO_RESUMO}'
+    WHERE mv.{{campo}} = :valor
+"""
+
+# Resumo em tempo real, a partir dos totais mantidos pelos gatilhos em resumo_pacientes;
+# o prontuário é escolhido com o mesmo critério da view (o mais recente)
+_CONSULTA_TEMPO_REAL = """
+    SELECT
+        p.paciente_id, p.nome, p.cpf, p.sus_numero, p.data_nascimento, p.tipo_sanguineo,
+        pr.prontuario_id,
+        COALESCE(r.total_atendimentos, 0) AS total_atendimentos,
+        r.ultimo_atendimento,
+        COALESCE(r.total_vacinas, 0) AS total_vacinas,
+        COALESCE(r.total_exames, 0) AS total_exames,
+        LOCALTIMESTAMP AS atualizado_em
+    FROM pacientes p
+    JOIN LATERAL (
+        SELECT prontuario_id
+        FROM prontuarios
+        WHERE paciente_id = p.paciente_id
+        ORDER BY data_criacao DESC, prontuario_id
+        LIMIT 1
+    ) pr ON TRUE
+    LEFT JOIN resumo_pacientes r ON r.paciente_id = p.paciente_id
+    WHERE p.{campo} = :valor
+"""
+
+
+async def obter_resumo(db: AsyncSession, campo: str, valor: Any, tempo_real: bool = False):
+    """
+    Retorna o resumo do paciente (um mapeamento de colunas) ou None se ele não
+    existir ou não tiver prontuário. ``campo`` deve estar em CAMPOS_BUSCA.
+    """
+    if campo not in CAMPOS_BUSCA:
+        raise ValueError(f"Campo de busca inválido: {campo}")
+    consulta = _CONSULTA_TEMPO_REAL if tempo_real else _CONSULTA_VISAO
+    result = await db.execute(text(consulta.format(campo=campo)), {"valor": valor})
+    return result.mappings().first()
+
+
+class AtualizadorVisao(TarefaPeriodica):
+    """
+    Tarefa de fundo que executa REFRESH MATERIALIZED VIEW CONCURRENTLY a cada
+    ``intervalo`` segundos, sem bloquear as leituras da view. O momento da
+    última atualização, feita por qualquer worker, fica na tabela
+    atualizacoes_visoes.
+    """
+
+    def __init__(self, visao: str, intervalo: float):
+        super().__init__(visao, intervalo)
+        self.visao = visao
+        self.descricao = f"atualização da view {visao}"
+
+    async def atualizar(self) -> bool:
+        """
+        Atualiza a view agora. Retorna False se outro processo já a estiver atualizando.
+        """
+        return await self.executar()
+
+    async def _rodada(self, conexao: AsyncConnection):
+        inicio = time.perf_counter()
+        await conexao.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {self.visao}"))
+        await conexao.execute(
+            text(
+                "INSERT INTO atualizacoes_visoes (visao, atualizada_em, duracao_ms) "
+                "VALUES (:visao, LOCALTIMESTAMP, :duracao_ms) "
+                "ON CONFLICT (visao) DO UPDATE SET "
+                "atualizada_em = EXCLUDED.atualizada_em, duracao_ms = EXCLUDED.duracao_ms"
+            ),
+            {"visao": self.visao, "duracao_ms": round((time.perf_counter() - inicio) * 1000)},
+        )
+
+    async def ultima_atualizacao(self) -> Optional[datetime]:
+        """
+        Momento da última atualização da view, feita por qualquer processo
+        """
+        async with async_engine.connect() as conexao:
+            return (await conexao.execute(
+                text("SELECT atualizada_em FROM atualizacoes_visoes WHERE visao = :visao"),
+                {"visao": self.visao},
+            )).scalar()
+
+    async def resumo(self) -> Dict[str, Any]:
+        return {
+            "visao": self.visao,
+            **self.estatisticas(),
+            "atualizada_em": await self.ultima_atualizacao(),
+        }
+
+
+# Atualizador do processo, iniciado e parado com a aplicação
+atualizador_resumo = AtualizadorVisao(VISAO_RESUMO, settings.RESUMO_INTERVALO_ATUALIZACAO)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Base das tarefas de fundo periódicas executadas por um único worker por rodada
+"""
+
+import abc
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.db.session import async_engine
+
+logger = logging.getLogger(__name__)
+
+
+class TarefaPeriodica(abc.ABC):
+    """
+    Tarefa de fundo que executa uma rotina no banco a cada ``intervalo``
+    segundos (``intervalo`` 0 desativa a tarefa).
+
+    Com vários workers, um advisory lock transacional identificado por
+    ``chave_bloqueio`` garante que apenas um deles execute a rotina em cada
+    rodada; nos demais a rodada é ignorada. As subclasses implementam
+    ``_rodada``, chamada com o lock obtido e confirmada (commit) em seguida, e
+    podem sobrescrever ``_concluida`` para usar o resultado após o commit.
+    """
+
+    # Descrição da rotina nas mensagens de log
+    descricao = "tarefa periódica"
+
+    def __init__(self, chave_bloqueio: str, intervalo: float):
+        self.chave_bloqueio = chave_bloqueio
+        self.intervalo = intervalo
+        self._tarefa: Optional[asyncio.Task] = None
+        self.execucoes = 0
+        self.ignoradas = 0
+        self.falhas = 0
+        self.ultima_duracao: Optional[float] = None
+        self.ultimo_erro: Optional[str] = None
+
+    def iniciar(self):
+        if self._tarefa is None and self.intervalo > 0:
+            self._tarefa = asyncio.create_task(self._executar())
+
+    async def parar(self):
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    async def executar(self) -> bool:
+        """
+        Executa a rotina agora. Retorna False se outro processo já a estiver executando.
+        """
+        inicio = time.perf_counter()
+        async with async_engine.connect() as conexao:
+            bloqueada = (await conexao.execute(
+                text("SELECT pg_try_advisory_xact_lock(hashtext(:chave))"), {"chave": self.chave_bloqueio}
+            )).scalar()
+            if not bloqueada:
+                self.ignoradas += 1
+                return False
+            resultado = await self._rodada(conexao)
+            await conexao.commit()
+        self._concluida(resultado)
+        self.execucoes += 1
+        self.ultima_duracao = time.perf_counter() - inicio
+        return True
+
+    @abc.abstractmethod
+    async def _rodada(self, conexao: AsyncConnection) -> Any:
+        """
+        Executa uma rodada da rotina na transação que detém o lock; o resultado
+        é passado a ``_concluida`` após o commit.
+        """
+
+    def _concluida(self, resultado: Any):
+        pass
+
+    async def _executar(self):
+        while True:
+            try:
+                await self.executar()
+            except asyncio.CancelledError:
+                raise
+            except Exception as erro:
+                self.falhas += 1
+                self.ultimo_erro = str(erro)
+                logger.warning("Falha na %s: %s", self.descricao, erro)
+            await asyncio.sleep(self.intervalo)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """
+        Configuração e contadores da tarefa neste processo
+        """
+        return {
+            "intervalo_segundos": self.intervalo,
+            "ativa": self._tarefa is not None,
+            "execucoes": self.execucoes,
+            "ignoradas": self.ignoradas,
+            "falhas": self.falhas,
+            "ultima_duracao_segundos": self.ultima_duracao,
+            "ultimo_erro": self.ultimo_erro,
+        }
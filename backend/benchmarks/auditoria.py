@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark da auditoria assíncrona dos acessos (historico_acesso)
+
+Mede a latência média de GET /prontuarios/completo/cpf/{cpf} sem auditoria,
+com a auditoria em fila (gravada em lotes pela tarefa de fundo) e com a
+gravação de cada acesso antes da resposta (equivalente a um INSERT síncrono
+por leitura). Depois, mede a vazão de gravação da fila em eventos por segundo.
+Os acessos gravados pelo benchmark são removidos ao final.
+
+Uso (a partir do diretório backend, com o PostgreSQL local populado):
+
+    python -m benchmarks.auditoria --requisicoes 1000 --eventos 200000
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from sqlalchemy import select, text
+
+from app.core.config import settings
+from app.db.models.paciente import Paciente
+from app.db.session import AsyncSessionLocal, async_engine
+from app.services import auditoria
+from main import app
+
+# Endereço de documentação (RFC 5737), usado para remover os acessos do benchmark
+IP_BENCHMARK = "192.0.2.1"
+
+
+async def medir(client: httpx.AsyncClient, url: str, requisicoes: int, sincrono: bool = False) -> float:
+    """
+    Retorna a latência média (milissegundos) das requisições sequenciais.
+    """
+    inicio = time.perf_counter()
+    for _ in range(requisicoes):
+        resposta = await client.get(url)
+        resposta.raise_for_status()
+        if sincrono:
+            await auditoria.registro_auditoria.descarregar()
+    return (time.perf_counter() - inicio) / requisicoes * 1000
+
+
+async def main(args: argparse.Namespace):
+    transport = httpx.ASGITransport(app=app, client=(IP_BENCHMARK, 123))
+    try:
+        async with AsyncSessionLocal() as db:
+            paciente_id, cpf = (await db.execute(select(Paciente.paciente_id, Paciente.cpf).limit(1))).one()
+        url = f"/api/v1/prontuarios/completo/cpf/{cpf}"
+
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            settings.AUDITORIA_HABILITADA = False
+            sem_auditoria = await medir(client, url, args.requisicoes)
+            settings.AUDITORIA_HABILITADA = True
+            sincrona = await medir(client, url, args.requisicoes, sincrono=True)
+            auditoria.registro_auditoria.iniciar()
+            em_fila = await medir(client, url, args.requisicoes)
+            await auditoria.registro_auditoria.parar()
+        print(f"sem auditoria:      {sem_auditoria:.3f} ms")
+        print(f"gravação síncrona:  {sincrona:.3f} ms (+{sincrona - sem_auditoria:.3f} ms)")
+        print(f"fila em lotes:      {em_fila:.3f} ms (+{em_fila - sem_auditoria:.3f} ms)")
+
+        registro = auditoria.RegistroAuditoria(
+            capacidade=args.eventos,
+            tamanho_lote=settings.AUDITORIA_TAMANHO_LOTE,
+            intervalo=settings.AUDITORIA_INTERVALO,
+            espera_maxima=0,
+        )
+        registro.iniciar()
+        inicio = time.perf_counter()
+        for _ in range(args.eventos):
+            await registro.registrar("benchmark", paciente_id, ip_acesso=IP_BENCHMARK)
+        enfileirados = time.perf_counter() - inicio
+        await registro.parar()
+        gravados = time.perf_counter() - inicio
+        print(
+            f"fila: {args.eventos} eventos enfileirados em {enfileirados:.2f}s, gravados em {gravados:.2f}s "
+            f"({registro.gravados / gravados:,.0f} eventos/s, {registro.lotes} lotes)"
+        )
+        print(auditoria.registro_auditoria.resumo())
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("DELETE FROM historico_acesso WHERE ip_acesso = :ip"), {"ip": IP_BENCHMARK})
+            await db.commit()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requisicoes", type=int, default=1000)
+    parser.add_argument("--eventos", type=int, default=200000)
+    asyncio.run(main(parser.parse_args()))
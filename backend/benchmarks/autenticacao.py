@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark da autenticação: login (bcrypt) e verificação do token por requisição
+
+Mede a latência do login de um funcionário de exemplo e o custo, em
+microssegundos, de identificar o funcionário de um token de acesso sem o cache
+(assinatura JWT e leitura do funcionário no banco) e com o cache de tokens
+verificados. Por fim, mede a latência de POST /login/test-token com o cache.
+
+Uso (a partir do diretório backend, com o PostgreSQL local populado com sample_data.sql):
+
+    python -m benchmarks.autenticacao --repeticoes 2000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+from sqlalchemy import select
+
+from app.core import cache
+from app.core.security import criar_token_acesso
+from app.db.models.funcionario import Funcionario
+from app.db.session import AsyncSessionLocal, async_engine
+from app.services import autenticacao
+from main import app
+
+# Senha dos funcionários de sql/dml/sample_data.sql
+SENHA_EXEMPLO = "sus12345"
+
+
+async def medir_us(operacao, repeticoes: int) -> float:
+    """
+    Retorna a duração mediana (microssegundos) da operação.
+    """
+    duracoes = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        await operacao()
+        duracoes.append((time.perf_counter() - inicio) * 1e6)
+    return statistics.median(duracoes)
+
+
+async def main(args: argparse.Namespace):
+    try:
+        async with AsyncSessionLocal() as db:
+            funcionario_id, cpf = (await db.execute(
+                select(Funcionario.funcionario_id, Funcionario.cpf).where(Funcionario.ativo).limit(1)
+            )).one()
+
+        async def login():
+            async with AsyncSessionLocal() as db:
+                assert await autenticacao.autenticar(db, cpf, SENHA_EXEMPLO) is not None
+
+        async def login_cpf_inexistente():
+            async with AsyncSessionLocal() as db:
+                assert await autenticacao.autenticar(db, "000.000.000-00", SENHA_EXEMPLO) is None
+
+        ms_login = await medir_us(login, args.logins) / 1000
+        ms_inexistente = await medir_us(login_cpf_inexistente, args.logins) / 1000
+        print(f"login:                   {ms_login:10.2f} ms")
+        print(f"login (CPF inexistente): {ms_inexistente:10.2f} ms")
+
+        token = criar_token_acesso(funcionario_id)
+
+        async def verificar_sem_cache():
+            cache.tokens.limpar()
+            assert await autenticacao.usuario_do_token(token) is not None
+
+        async def verificar_com_cache():
+            assert await autenticacao.usuario_do_token(token) is not None
+
+        us_sem_cache = await medir_us(verificar_sem_cache, args.repeticoes)
+        await autenticacao.usuario_do_token(token)
+        us_com_cache = await medir_us(verificar_com_cache, args.repeticoes)
+        print(f"token sem cache:         {us_sem_cache:10.1f} µs (JWT + banco)")
+        print(f"token com cache:         {us_com_cache:10.1f} µs ({us_sem_cache / us_com_cache:.0f}x)")
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            cabecalhos = {"Authorization": f"Bearer {token}"}
+
+            async def testar_token():
+                resposta = await client.post("/api/v1/login/test-token", headers=cabecalhos)
+                resposta.raise_for_status()
+
+            us_requisicao = await medir_us(testar_token, args.repeticoes)
+        print(f"POST /login/test-token:  {us_requisicao:10.1f} µs")
+        print(cache.tokens.resumo())
+    finally:
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=2000)
+    parser.add_argument("--logins", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
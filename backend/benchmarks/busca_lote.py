@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark das buscas em lote por ID (POST .../lote) x uma requisição por ID
+
+Cria N vacinas e N pacientes sintéticos e compara o tempo para obter todos
+eles com uma requisição GET por ID (o padrão N+1 dos clientes que montam uma
+lista) e com uma única requisição POST .../lote. As vacinas são medidas com o
+cache de referência vazio e já preenchido. Os registros criados são removidos
+ao final.
+
+Uso (a partir do diretório backend, com o PostgreSQL local):
+
+    python -m benchmarks.busca_lote --registros 200
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import date
+
+import httpx
+from sqlalchemy import delete
+
+from app import crud
+from app.core import cache
+from app.core.config import settings
+from app.db.models.paciente import Paciente
+from app.db.models.vacina import Vacina
+from app.db.session import AsyncSessionLocal, async_engine
+from main import app
+
+PREFIXO = "bench-lote-"
+# Faixa de números do SUS reservada aos pacientes sintéticos deste benchmark
+BASE_SUS = 999800000000000
+
+
+async def medir(operacao) -> float:
+    inicio = time.perf_counter()
+    await operacao()
+    return (time.perf_counter() - inicio) * 1000
+
+
+async def main(args: argparse.Namespace):
+    settings.AUDITORIA_HABILITADA = False
+    n = args.registros
+    try:
+        async with AsyncSessionLocal() as db:
+            vacinas = await crud.vacina.create_many(db, [{"nome": f"{PREFIXO}{i}", "lote": str(i)} for i in range(n)])
+            pacientes = await crud.paciente.create_many(db, [
+                {
+                    "nome": f"{PREFIXO}{i}",
+                    "cpf": f"998.{i // 1000:03d}.{i % 1000:03d}-00",
+                    "data_nascimento": date(1980, 1, 1),
+                    "sexo": "F",
+                    "sus_numero": str(BASE_SUS + i),
+                }
+                for i in range(n)
+            ])
+        recursos = {
+            "vacinas": ("/api/v1/vacinacao/vacinas", [str(v.vacina_id) for v in vacinas]),
+            "pacientes": ("/api/v1/pacientes", [str(p.paciente_id) for p in pacientes]),
+        }
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"{'recurso':22s} {'1 GET por ID':>14s} {'POST /lote':>12s}  ({n} IDs)")
+            for nome, (rota, ids) in recursos.items():
+                async def um_por_id():
+                    for id in ids:
+                        (await client.get(f"{rota}/{id}")).raise_for_status()
+
+                async def em_lote():
+                    resposta = await client.post(f"{rota}/lote", json={"ids": ids})
+                    resposta.raise_for_status()
+                    assert len(resposta.json()["itens"]) == len(ids)
+
+                cache.vacinas.limpar()
+                ms_individual = await medir(um_por_id)
+                ms_lote = await medir(em_lote)
+                print(f"{nome:22s} {ms_individual:11.1f} ms {ms_lote:9.1f} ms  ({ms_individual / ms_lote:.0f}x)")
+                if nome == "vacinas":
+                    ms_cache = await medir(um_por_id)
+                    print(f"{'vacinas (cache cheio)':22s} {ms_cache:11.1f} ms {ms_lote:9.1f} ms  ({ms_cache / ms_lote:.0f}x)")
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Vacina).where(Vacina.nome.like(f"{PREFIXO}%")))
+            await db.execute(delete(Paciente).where(Paciente.nome.like(f"{PREFIXO}%")))
+            await db.commit()
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registros", type=int, default=200)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Verificação, com EXPLAIN, de que a busca por nome usa os índices de trigramas
+
+Para cada busca exposta pela API (vacinas, pacientes, estabelecimentos e o
+filtro de fabricante da listagem de vacinas), gera a mesma consulta dos
+endpoints, obtém o plano com EXPLAIN (ANALYZE) e confere se o índice GIN
+esperado aparece nele. O filtro antigo (ILIKE direto na coluna) é mostrado
+para comparação. Como as tabelas de exemplo são pequenas, as varreduras
+sequenciais são desabilitadas na transação, para que o plano mostre se o
+índice pode atender à condição. Termina com código 1 se algum índice não for usado.
+
+Uso (a partir do diretório backend, com o PostgreSQL local populado):
+
+    python -m benchmarks.busca_trigram --termo "sao paulo"
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from sqlalchemy import select, text
+
+from app.db.busca import consulta_busca, contem
+from app.db.models.estabelecimento import Estabelecimento
+from app.db.models.paciente import Paciente
+from app.db.models.vacina import Vacina
+from app.db.session import AsyncSessionLocal, async_engine
+
+
+def casos(termo: str):
+    """
+    (descrição, consulta, índice esperado); None quando nenhum índice é esperado.
+    """
+    return [
+        ("vacinas: busca", consulta_busca(select(Vacina), Vacina.nome, termo, 20), "idx_vacinas_nome_trgm"),
+        ("vacinas: filtro de fabricante", select(Vacina).where(contem(Vacina.fabricante, termo)), "idx_vacinas_fabricante_trgm"),
+        ("pacientes: busca", consulta_busca(select(Paciente), Paciente.nome, termo, 20), "idx_pacientes_nome_trgm"),
+        ("estabelecimentos: busca", consulta_busca(select(Estabelecimento), Estabelecimento.nome, termo, 20), "idx_estabelecimentos_nome_trgm"),
+        ("vacinas: ILIKE antigo", select(Vacina).where(Vacina.nome.ilike(f"%{termo}%")), None),
+    ]
+
+
+def indices_do_plano(no: dict) -> set:
+    indices = {no["Index Name"]} if "Index Name" in no else set()
+    for filho in no.get("Plans", []):
+        indices |= indices_do_plano(filho)
+    return indices
+
+
+async def explicar(db, consulta) -> dict:
+    sql = consulta.compile(dialect=async_engine.dialect, compile_kwargs={"literal_binds": True})
+    conexao = await db.connection()
+    result = await conexao.exec_driver_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")
+    plano = result.scalar_one()
+    return (json.loads(plano) if isinstance(plano, str) else plano)[0]
+
+
+async def main(args: argparse.Namespace) -> int:
+    falhas = 0
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("SET LOCAL enable_seqscan = off"))
+            for descricao, consulta, esperado in casos(args.termo):
+                plano = await explicar(db, consulta)
+                indices = indices_do_plano(plano["Plan"])
+                ok = esperado is None or esperado in indices
+                falhas += not ok
+                print(
+                    f"{'OK   ' if ok else 'FALHA'} {descricao:32s} índices: {', '.join(sorted(indices)) or '-':32s} "
+                    f"{plano['Execution Time']:.3f} ms"
+                )
+                if args.planos:
+                    print(json.dumps(plano["Plan"], indent=2, ensure_ascii=False))
+            await db.rollback()
+    finally:
+        await async_engine.dispose()
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--termo", default="sao paulo")
+    parser.add_argument("--planos", action="store_true", help="Imprime os planos completos")
+    sys.exit(asyncio.run(main(parser.parse_args())))
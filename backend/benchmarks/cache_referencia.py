@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do cache em memória dos dados de referência
+
+Mede a latência média de GET /vacinas/{id} e GET /estabelecimentos/tipo/{tipo}
+com o cache vazio a cada requisição (sempre consultando o banco) e com o cache
+aquecido, e mostra as estatísticas de acertos e falhas ao final.
+
+Uso (a partir do diretório backend, com o PostgreSQL local populado):
+
+    python -m benchmarks.cache_referencia --requisicoes 2000
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from app.core import cache
+from app.db.session import async_engine
+from main import app
+
+
+async def medir(client: httpx.AsyncClient, url: str, requisicoes: int, limpar: bool) -> float:
+    """
+    Retorna a latência média (milissegundos) das requisições sequenciais.
+    """
+    inicio = time.perf_counter()
+    for _ in range(requisicoes):
+        if limpar:
+            cache.vacinas.limpar()
+            cache.estabelecimentos.limpar()
+        resposta = await client.get(url)
+        resposta.raise_for_status()
+    return (time.perf_counter() - inicio) / requisicoes * 1000
+
+
+async def main(args: argparse.Namespace):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        try:
+            vacina_id = (await client.get("/api/v1/vacinacao/vacinas/?limit=1")).json()[0]["vacina_id"]
+            for descricao, url in (
+                ("vacina por id", f"/api/v1/vacinacao/vacinas/{vacina_id}"),
+                ("estabelecimentos por tipo", "/api/v1/estabelecimentos/tipo/POSTO"),
+            ):
+                sem_cache = await medir(client, url, args.requisicoes, limpar=True)
+                com_cache = await medir(client, url, args.requisicoes, limpar=False)
+                print(f"{descricao:26s} sem cache: {sem_cache:.3f} ms  com cache: {com_cache:.3f} ms ({sem_cache / com_cache:.1f}x)")
+            for nome, resumo in cache.estatisticas_caches().items():
+                print(f"{nome}: {resumo}")
+        finally:
+            await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requisicoes", type=int, default=2000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Teste de carga HTTP da API com uma mistura realista de operações
+
+Dispara, contra a API em execução (uvicorn main:app, em --url) ou contra a
+aplicação no próprio processo (--em-processo), uma mistura ponderada de
+operações do dia a dia:
+
+- recepcao: busca do paciente por CPF (com e sem pontuação);
+- carteira: leitura da carteira de vacinação de um paciente;
+- vacinacao: registro de uma aplicação de vacina;
+- estabelecimentos: listagem de estabelecimentos (às vezes filtrada por tipo).
+
+Os pacientes, vacinas e funcionários usados são sorteados do banco (com a
+mesma semente, os mesmos). Há dois modelos de carga:
+
+- fechado (padrão): --concorrencia usuários, cada um fazendo uma requisição
+  após a outra;
+- aberto (--taxa): chegadas de Poisson na taxa informada (req/s), com até
+  --concorrencia requisições em andamento; as demais esperam, e a latência é
+  medida desde a chegada programada, incluindo a espera (sem a "omissão
+  coordenada" de medir só a partir do envio).
+
+Reporta, por rota, a vazão, a taxa de erros (respostas fora de 2xx e falhas
+de conexão, por tipo), os percentis e o histograma de latência, descartando o
+período de aquecimento; com --saida, também em JSON. Termina com código 1 se a
+taxa de erros total exceder --max-erros. As vacinações registradas são
+removidas ao final, a menos que --manter seja informado.
+
+Uso (a partir do diretório backend, com o PostgreSQL local populado e a API
+em execução):
+
+    python -m benchmarks.carga --duracao 60 --concorrencia 20 --mix recepcao=50,carteira=25,vacinacao=10,estabelecimentos=15
+    python -m benchmarks.carga --em-processo --taxa 100 --duracao 30
+"""
+
+import argparse
+import asyncio
+import bisect
+import json
+import math
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+from sqlalchemy import delete, text
+
+from app.db.models.carteira_vacinacao import CarteiraVacinacao
+from app.db.session import AsyncSessionLocal, async_engine
+
+PREFIXO_DOSE = "carga-"
+MIX_PADRAO = "recepcao=50,carteira=25,vacinacao=10,estabelecimentos=15"
+
+# Limites superiores (ms) das faixas do histograma de latência
+FAIXAS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, math.inf)
+
+TIPOS_ESTABELECIMENTO = ("POSTO", "HOSPITAL", "UPA", "OUTRO")
+
+_PACIENTES = text("""
+    SELECT paciente_id, cpf FROM pacientes
+    ORDER BY md5(paciente_id::text || :semente), paciente_id
+    LIMIT :n
+""")
+_VACINAS = text("SELECT vacina_id FROM vacinas ORDER BY vacina_id")
+_FUNCIONARIOS = text("SELECT funcionario_id, estabelecimento_id FROM funcionarios ORDER BY funcionario_id")
+
+
+class Operacoes:
+    """
+    Gera as requisições da mistura: cada operação retorna (rota, método, URL, corpo),
+    em que a rota é o caminho sem os valores, usado para agrupar as medições.
+    """
+
+    def __init__(self, rng: random.Random, pacientes, vacinas, funcionarios):
+        self.rng = rng
+        self.pacientes = pacientes
+        self.vacinas = vacinas
+        self.funcionarios = funcionarios
+        self._doses = 0
+        # Distingue as doses desta execução das de execuções anteriores mantidas (--manter)
+        self._execucao = f"{int(time.time()) % 1000000:06d}"
+
+    def recepcao(self):
+        _, cpf = self.rng.choice(self.pacientes)
+        if self.rng.random() < 0.5:
+            cpf = "".join(c for c in cpf if c.isdigit())
+        return "GET /pacientes/cpf/{cpf}", "GET", f"/api/v1/pacientes/cpf/{cpf}", None
+
+    def carteira(self):
+        paciente_id, _ = self.rng.choice(self.pacientes)
+        rota = "GET /vacinacao/carteira/paciente/{paciente_id}"
+        return rota, "GET", f"/api/v1/vacinacao/carteira/paciente/{paciente_id}", None
+
+    def vacinacao(self):
+        paciente_id, _ = self.rng.choice(self.pacientes)
+        funcionario_id, estabelecimento_id = self.rng.choice(self.funcionarios)
+        self._doses += 1
+        corpo = {
+            "paciente_id": str(paciente_id),
+            "vacina_id": str(self.rng.choice(self.vacinas)),
+            "funcionario_id": str(funcionario_id),
+            "estabelecimento_id": str(estabelecimento_id),
+            "data_aplicacao": datetime.now().isoformat(timespec="seconds"),
+            # Dose única por requisição, para não violar a unicidade (paciente, vacina, dose)
+            "dose": f"{PREFIXO_DOSE}{self._execucao}-{self._doses}",
+        }
+        return "POST /vacinacao/carteira/", "POST", "/api/v1/vacinacao/carteira/", corpo
+
+    def estabelecimentos(self):
+        if self.rng.random() < 0.3:
+            tipo = self.rng.choice(TIPOS_ESTABELECIMENTO)
+            return "GET /estabelecimentos/?tipo={tipo}", "GET", f"/api/v1/estabelecimentos/?limit=50&tipo={tipo}", None
+        return "GET /estabelecimentos/", "GET", "/api/v1/estabelecimentos/?limit=50", None
+
+
+class Medicoes:
+    """
+    Latências e resultados por rota das requisições concluídas após o aquecimento.
+    """
+
+    def __init__(self, inicio_medicao: float):
+        self.inicio_medicao = inicio_medicao
+        self.latencias: Dict[str, List[float]] = {}
+        self.erros: Dict[str, Dict[str, int]] = {}
+
+    def registrar(self, rota: str, latencia_ms: float, erro: str = None):
+        if time.perf_counter() < self.inicio_medicao:
+            return
+        self.latencias.setdefault(rota, []).append(latencia_ms)
+        erros = self.erros.setdefault(rota, {})
+        if erro is not None:
+            erros[erro] = erros.get(erro, 0) + 1
+
+    def resumo(self, duracao: float) -> dict:
+        rotas = {}
+        for rota, latencias in sorted(self.latencias.items()):
+            ordenadas = sorted(latencias)
+            quantis = statistics.quantiles(ordenadas, n=100, method="inclusive") if len(ordenadas) > 1 else ordenadas * 99
+            histograma = [0] * len(FAIXAS_MS)
+            for latencia in ordenadas:
+                histograma[bisect.bisect_left(FAIXAS_MS, latencia)] += 1
+            total_erros = sum(self.erros[rota].values())
+            rotas[rota] = {
+                "requisicoes": len(ordenadas),
+                "vazao_rps": round(len(ordenadas) / duracao, 2),
+                "erros": total_erros,
+                "taxa_erros": round(total_erros / len(ordenadas), 4),
+                "erros_por_tipo": self.erros[rota],
+                "p50_ms": round(statistics.median(ordenadas), 3),
+                "p90_ms": round(quantis[89], 3),
+                "p95_ms": round(quantis[94], 3),
+                "p99_ms": round(quantis[98], 3),
+                "max_ms": round(ordenadas[-1], 3),
+                "histograma": {
+                    (f"<= {faixa:g} ms" if faixa != math.inf else "> 5000 ms"): quantidade
+                    for faixa, quantidade in zip(FAIXAS_MS, histograma)
+                },
+            }
+        return rotas
+
+
+async def requisitar(client: httpx.AsyncClient, medicoes: Medicoes, operacao, inicio: float):
+    """
+    Envia a requisição e registra a latência desde ``inicio``.
+    """
+    rota, metodo, url, corpo = operacao
+    erro = None
+    try:
+        resposta = await client.request(metodo, url, json=corpo)
+        if not 200 <= resposta.status_code < 300:
+            erro = str(resposta.status_code)
+    except httpx.HTTPError as excecao:
+        erro = type(excecao).__name__
+    medicoes.registrar(rota, (time.perf_counter() - inicio) * 1000, erro)
+
+
+async def carga_fechada(client, medicoes, sortear, args: argparse.Namespace, fim: float):
+    async def usuario():
+        while time.perf_counter() < fim:
+            await requisitar(client, medicoes, sortear(), time.perf_counter())
+            if args.pausa_ms:
+                await asyncio.sleep(args.pausa_ms / 1000)
+
+    await asyncio.gather(*(usuario() for _ in range(args.concorrencia)))
+
+
+async def carga_aberta(client, medicoes, sortear, args: argparse.Namespace, fim: float, rng: random.Random):
+    semaforo = asyncio.Semaphore(args.concorrencia)
+    tarefas = set()
+
+    async def chegada(operacao, programada: float):
+        async with semaforo:
+            await requisitar(client, medicoes, operacao, programada)
+
+    proxima = time.perf_counter()
+    while True:
+        proxima += rng.expovariate(args.taxa)
+        if proxima >= fim:
+            break
+        await asyncio.sleep(max(0.0, proxima - time.perf_counter()))
+        tarefa = asyncio.create_task(chegada(sortear(), proxima))
+        tarefas.add(tarefa)
+        tarefa.add_done_callback(tarefas.discard)
+    await asyncio.gather(*tarefas)
+
+
+async def carregar_dados(args: argparse.Namespace):
+    async with AsyncSessionLocal() as db:
+        pacientes = (await db.execute(_PACIENTES, {"semente": str(args.semente), "n": args.pacientes})).tuples().all()
+        vacinas = (await db.execute(_VACINAS)).scalars().all()
+        funcionarios = (await db.execute(_FUNCIONARIOS)).tuples().all()
+    if not (pacientes and vacinas and funcionarios):
+        raise RuntimeError("O banco precisa ter pacientes, vacinas e funcionários")
+    return pacientes, vacinas, funcionarios
+
+
+async def main(args: argparse.Namespace) -> int:
+    pesos = {nome: float(peso) for nome, peso in (item.split("=") for item in args.mix.split(","))}
+    rng = random.Random(args.semente)
+    operacoes = Operacoes(rng, *await carregar_dados(args))
+    nomes = list(pesos)
+    funcoes = [getattr(operacoes, nome) for nome in nomes]
+
+    def sortear():
+        return rng.choices(funcoes, weights=[pesos[nome] for nome in nomes])[0]()
+
+    if args.em_processo:
+        from main import app
+
+        await app.router.startup()
+        transport, base_url = httpx.ASGITransport(app=app, raise_app_exceptions=False), "http://carga"
+    else:
+        transport, base_url = None, args.url
+    limites = httpx.Limits(max_connections=args.concorrencia, max_keepalive_connections=args.concorrencia)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url=base_url, limits=limites, timeout=args.timeout
+        ) as client:
+            if args.usuario:
+                resposta = await client.post(
+                    "/api/v1/login/access-token", data={"username": args.usuario, "password": args.senha}
+                )
+                resposta.raise_for_status()
+                client.headers["Authorization"] = f"Bearer {resposta.json()['access_token']}"
+
+            inicio = time.perf_counter()
+            medicoes = Medicoes(inicio + args.aquecimento)
+            fim = inicio + args.aquecimento + args.duracao
+            modelo = f"aberto, {args.taxa:g} req/s" if args.taxa else "fechado"
+            print(f"carga {modelo}, concorrência {args.concorrencia}, {args.aquecimento:g}s de aquecimento + "
+                  f"{args.duracao:g}s medidos, contra {base_url}")
+            if args.taxa:
+                await carga_aberta(client, medicoes, sortear, args, fim, rng)
+            else:
+                await carga_fechada(client, medicoes, sortear, args, fim)
+            # As requisições abertas programadas até o fim podem concluir depois dele
+            duracao = max(time.perf_counter(), fim) - medicoes.inicio_medicao
+    finally:
+        if args.em_processo:
+            await app.router.shutdown()
+        if not args.manter:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(CarteiraVacinacao).where(CarteiraVacinacao.dose.like(f"{PREFIXO_DOSE}%")))
+                await db.commit()
+        await async_engine.dispose()
+
+    rotas = medicoes.resumo(duracao)
+    total = sum(r["requisicoes"] for r in rotas.values())
+    erros = sum(r["erros"] for r in rotas.values())
+    print(f"\n{'rota':48s} {'req/s':>8s} {'erros':>7s} {'p50':>8s} {'p90':>8s} {'p95':>8s} {'p99':>8s} {'máx':>8s}")
+    for rota, r in rotas.items():
+        print(
+            f"{rota:48s} {r['vazao_rps']:8.1f} {r['taxa_erros']:7.2%} {r['p50_ms']:8.2f} {r['p90_ms']:8.2f} "
+            f"{r['p95_ms']:8.2f} {r['p99_ms']:8.2f} {r['max_ms']:8.2f}"
+        )
+        if r["erros"]:
+            print(f"    erros: {', '.join(f'{tipo} x{n}' for tipo, n in sorted(r['erros_por_tipo'].items()))}")
+    print(f"{'total':48s} {total / duracao:8.1f} {erros / max(total, 1):7.2%}  (latências em ms)")
+
+    print("\nhistograma de latência (requisições por faixa)")
+    for rota, r in rotas.items():
+        print(f"  {rota}")
+        maior = max(r["histograma"].values())
+        for faixa, quantidade in r["histograma"].items():
+            if quantidade:
+                print(f"    {faixa:>11s} {quantidade:7d} {'#' * max(1, round(40 * quantidade / maior))}")
+
+    if args.saida:
+        resultado = {
+            "gerado_em": datetime.now().isoformat(timespec="seconds"),
+            "parametros": {chave: valor for chave, valor in vars(args).items() if chave not in ("senha", "saida")},
+            "duracao_s": round(duracao, 3),
+            "vazao_rps": round(total / duracao, 2),
+            "taxa_erros": round(erros / max(total, 1), 4),
+            "rotas": rotas,
+        }
+        args.saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+        print(f"resultado gravado em {args.saida}")
+    return 1 if erros / max(total, 1) > args.max_erros else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000", help="Endereço da API em execução")
+    parser.add_argument("--em-processo", action="store_true", help="Usa a aplicação no próprio processo, sem rede")
+    parser.add_argument("--mix", default=MIX_PADRAO, help="Pesos das operações (recepcao, carteira, vacinacao, estabelecimentos)")
+    parser.add_argument("--concorrencia", type=int, default=10,
+                        help="Usuários (carga fechada) ou máximo de requisições em andamento (carga aberta)")
+    parser.add_argument("--taxa", type=float, help="Chegadas por segundo (carga aberta)")
+    parser.add_argument("--duracao", type=float, default=30, help="Segundos medidos")
+    parser.add_argument("--aquecimento", type=float, default=5, help="Segundos iniciais descartados")
+    parser.add_argument("--pausa-ms", type=float, default=0, help="Pausa de cada usuário entre requisições (carga fechada)")
+    parser.add_argument("--pacientes", type=int, default=10000, help="Pacientes sorteados do banco")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--timeout", type=float, default=10, help="Tempo máximo de cada requisição (s)")
+    parser.add_argument("--usuario", help="CPF do funcionário autenticado nas requisições (opcional)")
+    parser.add_argument("--senha", default="sus12345")
+    parser.add_argument("--max-erros", type=float, default=0.01, help="Taxa de erros total aceita")
+    parser.add_argument("--saida", type=Path, help="Arquivo JSON do resultado")
+    parser.add_argument("--manter", action="store_true", help="Mantém as vacinações registradas")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark de vazão com requisições concorrentes: sessão síncrona x AsyncSession
+
+Monta uma aplicação FastAPI mínima com duas rotas que executam a mesma consulta
+da carteira de vacinação (junção de cinco tabelas):
+
+- /sync: padrão antigo, ``async def`` usando a ``Session`` síncrona, que bloqueia o event loop
+  (a sessão é aberta e fechada dentro do handler: com a dependência síncrona, concorrência
+  acima do tamanho do pool trava o loop esperando uma conexão que nunca é devolvida);
+- /async: padrão atual, ``AsyncSession`` com asyncpg.
+
+As requisições são disparadas em paralelo contra um único event loop (como um
+worker do uvicorn) e o script reporta a vazão de cada rota.
+
+Uso (a partir do diretório backend, com o PostgreSQL local populado):
+
+    python -m benchmarks.concorrencia_async --requisicoes 500 --concorrencia 50
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.db.models.carteira_vacinacao import CarteiraVacinacao
+from app.db.models.estabelecimento import Estabelecimento
+from app.db.models.funcionario import Funcionario
+from app.db.models.paciente import Paciente
+from app.db.models.vacina import Vacina
+from app.db.session import SessionLocal, async_engine, engine
+
+
+def consulta_carteira(latencia: float):
+    """
+    Consulta da carteira de vacinação usada pelas duas rotas.
+    A latência opcional simula o tempo de rede até um banco remoto.
+    """
+    query = select(
+        CarteiraVacinacao.vacinacao_id,
+        Paciente.nome,
+        Vacina.nome,
+        Estabelecimento.nome,
+        Funcionario.nome,
+    ).join(
+        Paciente, CarteiraVacinacao.paciente_id == Paciente.paciente_id
+    ).join(
+        Vacina, CarteiraVacinacao.vacina_id == Vacina.vacina_id
+    ).join(
+        Estabelecimento, CarteiraVacinacao.estabelecimento_id == Estabelecimento.estabelecimento_id
+    ).join(
+        Funcionario, CarteiraVacinacao.funcionario_id == Funcionario.funcionario_id
+    ).limit(100)
+
+    if latencia:
+        query = query.where(text(f"pg_sleep({latencia}) IS NOT NULL"))
+    return query
+
+
+def criar_app(latencia: float) -> FastAPI:
+    """
+    Cria a aplicação de benchmark com as rotas síncrona e assíncrona.
+    """
+    app = FastAPI()
+
+    @app.get("/sync")
+    async def rota_sync():
+        with SessionLocal() as db:
+            return {"total": len(db.execute(consulta_carteira(latencia)).all())}
+
+    @app.get("/async")
+    async def rota_async(db: AsyncSession = Depends(deps.get_db)):
+        return {"total": len((await db.execute(consulta_carteira(latencia))).all())}
+
+    return app
+
+
+async def medir(client: httpx.AsyncClient, rota: str, requisicoes: int, concorrencia: int) -> float:
+    """
+    Dispara as requisições com concorrência limitada e retorna a vazão (req/s).
+    """
+    semaforo = asyncio.Semaphore(concorrencia)
+
+    async def requisitar():
+        async with semaforo:
+            resposta = await client.get(rota)
+            resposta.raise_for_status()
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(requisitar() for _ in range(requisicoes)))
+    return requisicoes / (time.perf_counter() - inicio)
+
+
+async def main(args: argparse.Namespace):
+    app = criar_app(args.latencia_ms / 1000)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Aquecimento dos pools de conexões
+        await medir(client, "/sync", 10, 1)
+        await medir(client, "/async", 10, 10)
+
+        for rota in ("/sync", "/async"):
+            vazao = await medir(client, rota, args.requisicoes, args.concorrencia)
+            print(f"{rota:<8} {vazao:10.1f} req/s ({args.requisicoes} requisições, concorrência {args.concorrencia})")
+
+    await async_engine.dispose()
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requisicoes", type=int, default=500)
+    parser.add_argument("--concorrencia", type=int, default=50)
+    parser.add_argument("--latencia-ms", type=float, default=5.0, help="Latência de rede simulada por consulta")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark das dez consultas de consultas_otimizadas.sql e dos endpoints correspondentes
+
+Executa cada consulta numerada de sql/queries/consultas_otimizadas.sql (e a
+consulta da view de resumo) várias vezes, com os CPFs e números do SUS fixos
+do arquivo trocados por pacientes sorteados do banco (com a mesma semente, os
+mesmos pacientes), e mede a latência (p50, p95 e p99) e o plano
+(EXPLAIN ANALYZE, BUFFERS) de cada uma; depois mede os endpoints da API que
+correspondem a elas, com os caches esvaziados antes de cada requisição.
+
+Com --escalas, o banco é repovoado pelo gerador de dados sintéticos
+(benchmarks.dados_sinteticos --limpar, que APAGA os dados atuais) com cada
+número de pacientes, e as medições são repetidas; sem ele, os dados atuais
+são medidos (a view de resumo é atualizada antes). O resultado, com os planos
+completos, é gravado em JSON com --saida. Com --base, ele é comparado com um
+resultado gravado antes, da mesma escala: termina com código 1 se o plano de alguma consulta mudou (tipos de nó,
+tabelas e índices, sem custos, estimativas e nomes de partições) ou se o p95
+de alguma consulta ou endpoint piorou além da tolerância.
+
+Uso (a partir do diretório backend, com o PostgreSQL local):
+
+    python -m benchmarks.consultas --escalas 10000,100000 --saida base.json
+    python -m benchmarks.consultas --escalas 10000,100000 --base base.json --saida atual.json
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+import httpx
+from sqlalchemy import text
+
+from app.core import cache
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, async_engine
+from app.services.resumo_prontuarios import atualizador_resumo
+from benchmarks.pacientes import percentis
+from benchmarks.particionamento import ARQUIVO_CONSULTAS, consultas_do_arquivo
+from main import app
+
+# Endpoints que correspondem às consultas: (consulta, caminho); {cpf}, {sus_numero}
+# e {paciente_id} são os do paciente sorteado
+ENDPOINTS = (
+    ("1", "/api/v1/pacientes/?limit=100"),
+    ("2", "/api/v1/prontuarios/completo/cpf/{cpf}"),
+    ("3", "/api/v1/vacinacao/carteira/paciente/{paciente_id}"),
+    ("6", "/api/v1/prontuarios/completo/sus/{sus_numero}"),
+    ("resumo", "/api/v1/prontuarios/resumo/cpf/{cpf}"),
+)
+
+# Pacientes sorteados entre os que têm prontuário, na ordem de um hash com a semente
+_PACIENTES = text("""
+    SELECT p.paciente_id, p.cpf, p.sus_numero
+    FROM pacientes p
+    WHERE EXISTS (SELECT 1 FROM prontuarios pr WHERE pr.paciente_id = p.paciente_id)
+    ORDER BY md5(p.paciente_id::text || :semente), p.paciente_id
+    LIMIT :n
+""")
+
+# Nomes de partições mensais (atendimentos_2024_05, atendimentos_2024_05_data_idx...)
+_SUFIXO_PARTICAO = re.compile(r"_\d{4}_\d{2}(?=_|$)")
+
+
+def consultas_parametrizadas():
+    """
+    Retorna {consulta: SQL} das consultas do arquivo, com os CPFs e números do
+    SUS fixos trocados pelos parâmetros :cpf e :sus_numero.
+    """
+    consultas = {str(numero): sql for numero, sql in consultas_do_arquivo().items()}
+    resumo = re.search(
+        r"view materializada\s*EXPLAIN ANALYZE\s*(.*?);", ARQUIVO_CONSULTAS.read_text(encoding="utf-8"),
+        re.DOTALL | re.IGNORECASE,
+    )
+    if resumo:
+        consultas["resumo"] = resumo.group(1).strip()
+    return {
+        chave: re.sub(r"\b(cpf|sus_numero) = '[^']*'", r"\1 = :\1", sql)
+        for chave, sql in consultas.items()
+    }
+
+
+def assinatura(no: dict) -> str:
+    """
+    Resume o plano em tipos de nó, junções, tabelas e índices, sem custos e
+    estimativas. As partições mensais aparecem pelo nome da tabela, e os filhos
+    iguais de um Append (uma partição cada) uma vez só, para que o plano não
+    mude a cada partição criada.
+    """
+    partes = [no["Node Type"]]
+    for campo in ("Join Type", "Strategy", "Relation Name", "Index Name"):
+        if campo in no:
+            partes.append(_SUFIXO_PARTICAO.sub("", str(no[campo])))
+    filhos = [assinatura(filho) for filho in no.get("Plans", [])]
+    if no["Node Type"] in ("Append", "Merge Append"):
+        filhos = sorted(set(filhos))
+    return " ".join(partes) + (f"({', '.join(filhos)})" if filhos else "")
+
+
+async def medir_consultas(args: argparse.Namespace, pacientes) -> dict:
+    resultados = {}
+    async with AsyncSessionLocal() as db:
+        conexao = await db.connection()
+        for chave, sql in consultas_parametrizadas().items():
+            if args.consultas and chave not in args.consultas:
+                continue
+            parametros = [
+                {nome: paciente[nome] for nome in ("cpf", "sus_numero") if f":{nome}" in sql}
+                for paciente in pacientes
+            ]
+            comando = text(sql)
+            for i in range(args.aquecimento):
+                (await conexao.execute(comando, parametros[i % len(parametros)])).fetchall()
+            duracoes, linhas = [], 0
+            for i in range(args.repeticoes):
+                inicio = time.perf_counter()
+                linhas += len((await conexao.execute(comando, parametros[i % len(parametros)])).fetchall())
+                duracoes.append((time.perf_counter() - inicio) * 1000)
+
+            explicado = (await conexao.execute(
+                text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {sql}"), parametros[0]
+            )).scalar_one()
+            plano = (json.loads(explicado) if isinstance(explicado, str) else explicado)[0]
+            p50, p95, p99 = percentis(duracoes)
+            resultados[chave] = {
+                "p50_ms": round(p50, 3),
+                "p95_ms": round(p95, 3),
+                "p99_ms": round(p99, 3),
+                "linhas_media": round(linhas / args.repeticoes, 1),
+                "assinatura": assinatura(plano["Plan"]),
+                "execucao_ms": plano["Execution Time"],
+                "planejamento_ms": plano["Planning Time"],
+                "blocos_lidos": plano["Plan"].get("Shared Hit Blocks", 0) + plano["Plan"].get("Shared Read Blocks", 0),
+                "plano": plano["Plan"],
+            }
+            print(f"  consulta {chave:7s} {p50:9.2f} {p95:9.2f} {p99:9.2f}  {resultados[chave]['assinatura'][:70]}")
+    return resultados
+
+
+async def medir_endpoints(args: argparse.Namespace, pacientes) -> dict:
+    resultados = {}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for consulta, caminho in ENDPOINTS:
+            if args.consultas and consulta not in args.consultas:
+                continue
+            urls = [caminho.format(**paciente) for paciente in pacientes]
+            duracoes = []
+            for i in range(args.aquecimento + args.repeticoes):
+                for cache_dados in cache.caches.values():
+                    cache_dados.limpar()
+                url = urls[i % len(urls)]
+                inicio = time.perf_counter()
+                resposta = await client.get(url)
+                duracao = (time.perf_counter() - inicio) * 1000
+                if resposta.status_code != 200:
+                    raise RuntimeError(f"{url}: {resposta.status_code} {resposta.text[:200]}")
+                if i >= args.aquecimento:
+                    duracoes.append(duracao)
+            p50, p95, p99 = percentis(duracoes)
+            resultados[f"GET {caminho}"] = {
+                "consulta": consulta, "p50_ms": round(p50, 3), "p95_ms": round(p95, 3), "p99_ms": round(p99, 3),
+            }
+            print(f"  {caminho[7:]:46s} {p50:9.2f} {p95:9.2f} {p99:9.2f}")
+    return resultados
+
+
+async def medir(args: argparse.Namespace) -> dict:
+    try:
+        # A view de resumo precisa refletir os dados medidos
+        await atualizador_resumo.atualizar()
+        async with AsyncSessionLocal() as db:
+            total = (await db.execute(text("SELECT COUNT(*) FROM pacientes"))).scalar()
+            pacientes = [
+                {"paciente_id": str(paciente_id), "cpf": cpf, "sus_numero": sus_numero}
+                for paciente_id, cpf, sus_numero in await db.execute(
+                    _PACIENTES, {"semente": str(args.semente), "n": args.pacientes_sorteados}
+                )
+            ]
+        if not pacientes:
+            raise RuntimeError("Nenhum paciente com prontuário no banco")
+        print(f"{total} pacientes ({len(pacientes)} sorteados)  {'p50':>9s} {'p95':>9s} {'p99':>9s}  (ms)")
+        return {
+            "pacientes": total,
+            "consultas": await medir_consultas(args, pacientes),
+            "endpoints": await medir_endpoints(args, pacientes),
+        }
+    finally:
+        await async_engine.dispose()
+
+
+def comparar(atual: dict, base: dict, tolerancia: float, minimo_ms: float) -> int:
+    """
+    Compara o resultado com a linha de base, escala a escala, e imprime as
+    diferenças. Retorna o número de planos alterados e de regressões do p95.
+    """
+    problemas = 0
+    for escala, medicoes in atual["escalas"].items():
+        anterior = base["escalas"].get(escala)
+        if anterior is None:
+            print(f"escala {escala}: ausente da linha de base")
+            continue
+        print(f"escala {escala}: p95 atual x linha de base (ms)")
+        for grupo in ("consultas", "endpoints"):
+            for chave, medicao in medicoes[grupo].items():
+                referencia = anterior[grupo].get(chave)
+                if referencia is None:
+                    continue
+                situacao = []
+                if "assinatura" in medicao and medicao["assinatura"] != referencia["assinatura"]:
+                    situacao.append("PLANO ALTERADO")
+                limite = max(referencia["p95_ms"] * (1 + tolerancia), referencia["p95_ms"] + minimo_ms)
+                if medicao["p95_ms"] > limite:
+                    situacao.append("REGRESSÃO")
+                problemas += len(situacao)
+                variacao = (medicao["p95_ms"] / referencia["p95_ms"] - 1) * 100 if referencia["p95_ms"] else 0
+                nome = f"consulta {chave}" if grupo == "consultas" else chave[11:]
+                print(
+                    f"  {nome:46s} {medicao['p95_ms']:9.2f} {referencia['p95_ms']:9.2f} {variacao:+7.1f}%  "
+                    f"{' '.join(situacao) or 'OK'}"
+                )
+                if "PLANO ALTERADO" in situacao:
+                    print(f"      antes:  {referencia['assinatura']}\n      depois: {medicao['assinatura']}")
+    return problemas
+
+
+def main(args: argparse.Namespace) -> int:
+    settings.AUDITORIA_HABILITADA = False
+    resultado = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "semente": args.semente,
+        "repeticoes": args.repeticoes,
+        "escalas": {},
+    }
+    for escala in args.escalas or [None]:
+        if escala is not None:
+            print(f"gerando {escala} pacientes sintéticos...")
+            subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.dados_sinteticos", "--limpar",
+                    "--pacientes", str(escala), "--semente", str(args.semente),
+                    "--data-referencia", args.data_referencia.isoformat(),
+                ],
+                check=True, stdout=subprocess.DEVNULL,
+            )
+        medicoes = asyncio.run(medir(args))
+        resultado["escalas"][str(escala or medicoes["pacientes"])] = medicoes
+
+    if args.saida:
+        args.saida.write_text(json.dumps(resultado, indent=2, ensure_ascii=False, default=str), encoding="utf-8")
+        print(f"resultado gravado em {args.saida}")
+    if args.base:
+        base = json.loads(args.base.read_text(encoding="utf-8"))
+        problemas = comparar(resultado, base, args.tolerancia, args.minimo_ms)
+        print(f"{problemas} plano(s) alterado(s) ou regressão(ões) em relação a {args.base}")
+        return 1 if problemas else 0
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--escalas", type=lambda v: [int(n) for n in v.split(",")],
+                        help="Números de pacientes separados por vírgula (repovoa o banco a cada escala)")
+    parser.add_argument("--consultas", type=lambda v: v.split(","),
+                        help="Consultas medidas, separadas por vírgula (por exemplo, 2,3,6,resumo); padrão: todas")
+    parser.add_argument("--repeticoes", type=int, default=20, help="Execuções medidas de cada consulta e endpoint")
+    parser.add_argument("--aquecimento", type=int, default=2, help="Execuções descartadas antes das medidas")
+    parser.add_argument("--pacientes-sorteados", type=int, default=20,
+                        help="Pacientes usados, em rodízio, como parâmetros")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--data-referencia", type=date.fromisoformat, default=date.today(),
+                        help="Data de referência dos dados gerados (AAAA-MM-DD)")
+    parser.add_argument("--saida", type=Path, help="Arquivo JSON do resultado")
+    parser.add_argument("--base", type=Path, help="Resultado anterior (JSON) usado como linha de base")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Aumento relativo do p95 aceito em relação à linha de base")
+    parser.add_argument("--minimo-ms", type=float, default=1.0,
+                        help="Aumento absoluto do p95 sempre aceito (ruído das consultas rápidas)")
+    sys.exit(main(parser.parse_args()))
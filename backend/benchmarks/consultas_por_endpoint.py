@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Contagem dos comandos SQL por endpoint, para detectar consultas N+1
+
+Chama cada endpoint com um item e com N itens (tamanho da página, IDs do lote
+ou limite das listas do prontuário) e conta os comandos SQL executados durante
+a requisição. Um endpoint sem N+1 executa o mesmo número de comandos nos dois
+casos; termina com código 1 se algum executar mais comandos com N itens ou
+exceder o máximo previsto. Os caches são esvaziados antes de cada requisição,
+para que as leituras cheguem ao banco.
+
+Uso (a partir do diretório backend, com o PostgreSQL local populado):
+
+    python -m benchmarks.consultas_por_endpoint --itens 5 --comandos
+"""
+
+import argparse
+import asyncio
+import sys
+from contextvars import ContextVar
+from typing import List, Optional
+
+import httpx
+from sqlalchemy import event, text
+
+from app.core import cache
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, async_engine
+from main import app
+
+# (nome, método, caminho, máximo de comandos); {n} é o número de itens. Os cenários
+# em lote enviam no corpo os n primeiros IDs da tabela (_TABELAS_LOTE)
+CENARIOS = (
+    ("listar pacientes", "GET", "/api/v1/pacientes/?limit={n}", 1),
+    ("pacientes em lote", "POST", "/api/v1/pacientes/lote", 1),
+    ("listar vacinas", "GET", "/api/v1/vacinacao/vacinas/?limit={n}", 1),
+    ("vacinas em lote", "POST", "/api/v1/vacinacao/vacinas/lote", 1),
+    ("listar estabelecimentos", "GET", "/api/v1/estabelecimentos/?limit={n}", 1),
+    ("estabelecimentos em lote", "POST", "/api/v1/estabelecimentos/lote", 1),
+    ("listar funcionários", "GET", "/api/v1/funcionarios/?limit={n}", 2),
+    ("funcionários em lote", "POST", "/api/v1/funcionarios/lote", 1),
+    ("listar vacinações", "GET", "/api/v1/vacinacao/carteira/?limit={n}", 1),
+    (
+        "prontuário completo",
+        "GET",
+        "/api/v1/prontuarios/completo/{paciente_id}?limite_atendimentos={n}&limite_vacinacoes={n}",
+        5,
+    ),
+)
+
+# Tabela dos IDs enviados no corpo de cada cenário em lote
+_TABELAS_LOTE = {
+    "pacientes em lote": ("pacientes", "paciente_id"),
+    "vacinas em lote": ("vacinas", "vacina_id"),
+    "estabelecimentos em lote": ("estabelecimentos", "estabelecimento_id"),
+    "funcionários em lote": ("funcionarios", "funcionario_id"),
+}
+
+# Comandos da requisição em andamento; os das tarefas de fundo ficam de fora
+_comandos: ContextVar[Optional[List[str]]] = ContextVar("comandos", default=None)
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _registrar_comando(conn, cursor, statement, parameters, context, executemany):
+    comandos = _comandos.get()
+    if comandos is not None:
+        comandos.append(statement)
+
+
+async def contar(client: httpx.AsyncClient, metodo: str, url: str, corpo: Optional[dict]) -> List[str]:
+    """
+    Executa a requisição e retorna os comandos SQL executados por ela.
+    """
+    for cache_dados in cache.caches.values():
+        cache_dados.limpar()
+    comandos: List[str] = []
+    marca = _comandos.set(comandos)
+    try:
+        resposta = await client.request(metodo, url, json=corpo)
+    finally:
+        _comandos.reset(marca)
+    resposta.raise_for_status()
+    return comandos
+
+
+async def main(args: argparse.Namespace) -> int:
+    settings.AUDITORIA_HABILITADA = False
+    falhas = 0
+    try:
+        async with AsyncSessionLocal() as db:
+            ids = {
+                nome: [str(id) for id in (await db.execute(
+                    text(f"SELECT {coluna} FROM {tabela} ORDER BY {coluna} LIMIT :n"), {"n": args.itens}
+                )).scalars()]
+                for nome, (tabela, coluna) in _TABELAS_LOTE.items()
+            }
+            # Paciente com mais atendimentos, para que o limite das listas faça diferença
+            paciente_id = (await db.execute(text(
+                "SELECT p.paciente_id FROM atendimentos a JOIN prontuarios p USING (prontuario_id) "
+                "GROUP BY p.paciente_id ORDER BY COUNT(*) DESC LIMIT 1"
+            ))).scalar()
+
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            print(f"{'endpoint':26s} {'1 item':>7s} {f'{args.itens} itens':>9s} {'máximo':>7s}")
+            for nome, metodo, caminho, maximo in CENARIOS:
+                if "{paciente_id}" in caminho and paciente_id is None:
+                    print(f"{nome:26s} ignorado (nenhum atendimento no banco)")
+                    continue
+                contagens = []
+                for n in (1, args.itens):
+                    url = caminho.format(n=n, paciente_id=paciente_id)
+                    corpo = {"ids": ids[nome][:n]} if nome in _TABELAS_LOTE else None
+                    comandos = await contar(client, metodo, url, corpo)
+                    contagens.append(comandos)
+                um, varios = (len(comandos) for comandos in contagens)
+                ok = varios <= um and varios <= maximo
+                falhas += not ok
+                print(f"{nome:26s} {um:7d} {varios:9d} {maximo:7d}  {'OK' if ok else 'FALHA'}")
+                if args.comandos or not ok:
+                    for comando in contagens[-1]:
+                        print("    " + " ".join(comando.split())[:150])
+    finally:
+        await async_engine.dispose()
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--itens", type=int, default=5, help="Número de itens do caso maior (pelo menos 2)")
+    parser.add_argument("--comandos", action="store_true", help="Imprime os comandos do caso maior")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark das operações em lote da base CRUD (app.crud.base)
+
+Cria, lê, atualiza e faz upsert de N vacinas sintéticas de duas formas: uma
+operação unitária por registro (um comando por linha) e as operações em lote
+(get_many, create_many, update_many e upsert), e compara o tempo total e o
+número de comandos SQL enviados ao banco. As vacinas criadas são removidas ao final.
+
+Uso (a partir do diretório backend, com o PostgreSQL local):
+
+    python -m benchmarks.crud_lote --registros 1000
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import delete, event
+
+from app import crud
+from app.db.models.vacina import Vacina
+from app.db.session import AsyncSessionLocal, async_engine
+
+PREFIXO_LOTE = "bench-crud-"
+
+
+class ContadorComandos:
+    """
+    Conta os comandos SQL executados pelo engine assíncrono.
+    """
+
+    def __init__(self):
+        self.total = 0
+        event.listen(async_engine.sync_engine, "before_cursor_execute", self._contar)
+
+    def _contar(self, *args):
+        self.total += 1
+
+
+async def medir(contador: ContadorComandos, operacao):
+    """
+    Retorna a duração (milissegundos) e o número de comandos SQL da operação.
+    """
+    antes = contador.total
+    inicio = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        await operacao(db)
+    return (time.perf_counter() - inicio) * 1000, contador.total - antes
+
+
+async def main(args: argparse.Namespace):
+    contador = ContadorComandos()
+    n = args.registros
+    try:
+        async def criar_um_a_um(db):
+            return [
+                await crud.vacina.create(db, obj_in={"nome": f"{PREFIXO_LOTE}u{i}", "lote": str(i)}) for i in range(n)
+            ]
+
+        async def criar_em_lote(db):
+            return await crud.vacina.create_many(db, [{"nome": f"{PREFIXO_LOTE}l{i}", "lote": str(i)} for i in range(n)])
+
+        ids = {}
+
+        async def guardar_ids(db):
+            ids["unitario"] = [v.vacina_id for v in await criar_um_a_um(db)]
+
+        async def guardar_ids_lote(db):
+            ids["lote"] = [v.vacina_id for v in await criar_em_lote(db)]
+
+        cenarios = [
+            ("criar", guardar_ids, guardar_ids_lote),
+            (
+                "ler",
+                lambda db: _ler_um_a_um(db, ids["unitario"]),
+                lambda db: crud.vacina.get_many(db, ids["lote"]),
+            ),
+            (
+                "atualizar",
+                lambda db: _atualizar_um_a_um(db, ids["unitario"]),
+                lambda db: crud.vacina.update_many(db, [(id, {"lote": f"novo-{i}"}) for i, id in enumerate(ids["lote"])]),
+            ),
+            (
+                "upsert",
+                lambda db: _upsert_um_a_um(db, ids["unitario"]),
+                lambda db: crud.vacina.upsert(
+                    db,
+                    [{"vacina_id": id, "nome": f"{PREFIXO_LOTE}l{i}", "lote": f"upsert-{i}"} for i, id in enumerate(ids["lote"])],
+                    index_elements=["vacina_id"],
+                ),
+            ),
+        ]
+        print(f"{'operação':10s} {'um a um':>20s} {'em lote':>20s}  ({n} registros)")
+        for nome, unitario, lote in cenarios:
+            ms_unitario, comandos_unitario = await medir(contador, unitario)
+            ms_lote, comandos_lote = await medir(contador, lote)
+            print(
+                f"{nome:10s} {ms_unitario:9.1f} ms {comandos_unitario:5d} cmd "
+                f"{ms_lote:9.1f} ms {comandos_lote:5d} cmd  ({ms_unitario / ms_lote:.1f}x)"
+            )
+    finally:
+        async with AsyncSessionLocal() as db:
+            await db.execute(delete(Vacina).where(Vacina.nome.like(f"{PREFIXO_LOTE}%")))
+            await db.commit()
+        await async_engine.dispose()
+
+
+async def _ler_um_a_um(db, ids):
+    return [await crud.vacina.get(db, id) for id in ids]
+
+
+async def _atualizar_um_a_um(db, ids):
+    return [await crud.vacina.update(db, id=id, obj_in={"lote": f"novo-{i}"}) for i, id in enumerate(ids)]
+
+
+async def _upsert_um_a_um(db, ids):
+    return [
+        await crud.vacina.upsert(
+            db, [{"vacina_id": id, "nome": f"{PREFIXO_LOTE}u{i}", "lote": f"upsert-{i}"}], index_elements=["vacina_id"]
+        )
+        for i, id in enumerate(ids)
+    ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registros", type=int, default=1000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,711 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Gerador determinístico de dados sintéticos em escala do SUS
+
+Popula o banco com estabelecimentos, funcionários, vacinas, medicamentos e,
+para cada paciente, prontuários, atendimentos (com prescrições e exames),
+vacinações e acessos ao histórico, com distribuições próximas das reais:
+nomes brasileiros, CPF e número do SUS (CNS) com dígitos verificadores
+válidos, CNES de 7 dígitos, pirâmide etária e tipos sanguíneos da população,
+estabelecimentos e número de atendimentos por paciente concentrados (poucos
+pacientes com muitos atendimentos, a maioria com poucos).
+
+A mesma semente, com os mesmos parâmetros e a mesma data de referência, gera
+exatamente os mesmos dados (inclusive os UUIDs), qualquer que seja o número de
+processos: os pacientes são divididos em blocos, e cada bloco tem o seu
+gerador aleatório, derivado da semente e do número do bloco. Os blocos são
+gerados e gravados com COPY em paralelo, por vários processos, cada um com a
+sua conexão; cada bloco é gravado em uma transação. Ao final, as tabelas são
+analisadas (ANALYZE) e a view de resumo dos prontuários é atualizada.
+
+Os dados são consistentes por construção, então, por padrão, são gravados com
+session_replication_role = replica (exige superusuário), sem os gatilhos e as
+verificações das chaves estrangeiras, e os totais de resumo_pacientes são
+gravados pelo próprio gerador. Com --gatilhos, tudo é verificado, bem mais
+devagar (a verificação de prescrições e exames é feita linha a linha).
+
+As partições de atendimentos e de historico_acesso do período são criadas
+quando faltarem. Com --limpar, todos os dados das tabelas do sistema são
+apagados antes (TRUNCATE); sem ele, gerar duas vezes viola as restrições de
+unicidade. Os funcionários gerados usam a senha de desenvolvimento dos dados
+de exemplo (sus12345).
+
+Uso (a partir do diretório backend, com o PostgreSQL local):
+
+    python -m benchmarks.dados_sinteticos --pacientes 1000000 --processos 8 --semente 42 --limpar
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+import unicodedata
+import uuid
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Tuple
+
+import asyncpg
+
+from app.core.config import settings
+from app.db.session import async_engine
+from app.services.resumo_prontuarios import atualizador_resumo
+
+# Hash bcrypt da senha de desenvolvimento dos dados de exemplo (sus12345)
+SENHA_HASH = "$2b$12$Fkxo4VTuURlA2fakv1y/tOmxxsFL4cK2DwP51C5IjbttXL8dSAIyq"
+
+# Limite de atendimentos de um paciente (a cauda da distribuição é longa)
+MAX_ATENDIMENTOS = 300
+
+# Os CPFs dos pacientes e dos funcionários vêm de faixas disjuntas dos 9 dígitos-base
+_INICIO_CPF_FUNCIONARIOS = 500_000_000
+
+TABELAS = (
+    "historico_acesso", "exames", "prescricoes", "carteira_vacinacao", "atendimentos", "prontuarios",
+    "resumo_pacientes", "atualizacoes_visoes", "funcionarios", "pacientes", "estabelecimentos",
+    "vacinas", "medicamentos",
+)
+
+_COLUNAS = {
+    "estabelecimentos": (
+        "estabelecimento_id", "nome", "tipo", "cnes", "endereco", "telefone", "email",
+        "horario_funcionamento", "data_cadastro", "ultima_atualizacao",
+    ),
+    "funcionarios": (
+        "funcionario_id", "estabelecimento_id", "nome", "cpf", "cargo", "registro_profissional",
+        "data_contratacao", "telefone", "email", "ativo", "senha_hash", "data_cadastro", "ultima_atualizacao",
+    ),
+    "vacinas": ("vacina_id", "nome", "fabricante", "lote", "validade", "data_cadastro"),
+    "medicamentos": ("medicamento_id", "nome", "principio_ativo", "fabricante", "data_cadastro"),
+    "pacientes": (
+        "paciente_id", "nome", "cpf", "data_nascimento", "sexo", "endereco", "telefone", "email",
+        "tipo_sanguineo", "sus_numero", "data_cadastro", "ultima_atualizacao",
+    ),
+    "prontuarios": ("prontuario_id", "paciente_id", "estabelecimento_id", "data_criacao", "ultima_atualizacao"),
+    "atendimentos": (
+        "atendimento_id", "prontuario_id", "funcionario_id", "data_atendimento", "tipo_atendimento",
+        "descricao", "diagnostico",
+    ),
+    "prescricoes": (
+        "prescricao_id", "atendimento_id", "medicamento_id", "dosagem", "frequencia", "duracao", "data_prescricao",
+    ),
+    "exames": (
+        "exame_id", "atendimento_id", "tipo_exame", "resultado", "data_solicitacao", "data_realizacao",
+        "funcionario_solicitante", "funcionario_realizador",
+    ),
+    "carteira_vacinacao": (
+        "vacinacao_id", "paciente_id", "vacina_id", "funcionario_id", "estabelecimento_id", "data_aplicacao",
+        "dose", "data_cadastro",
+    ),
+    "historico_acesso": (
+        "acesso_id", "paciente_id", "prontuario_id", "funcionario_id", "data_acesso", "tipo_acesso", "ip_acesso",
+    ),
+    "resumo_pacientes": (
+        "paciente_id", "total_atendimentos", "ultimo_atendimento", "total_vacinas", "total_exames", "atualizado_em",
+    ),
+}
+
+# Ordem de gravação de um bloco de pacientes (as referências antes de quem as usa)
+_TABELAS_BLOCO = (
+    "pacientes", "prontuarios", "atendimentos", "prescricoes", "exames", "carteira_vacinacao", "historico_acesso",
+    "resumo_pacientes",
+)
+
+NOMES_FEMININOS = (
+    "Maria", "Ana", "Francisca", "Antônia", "Adriana", "Juliana", "Márcia", "Fernanda", "Patrícia", "Aline",
+    "Sandra", "Camila", "Amanda", "Bruna", "Jéssica", "Letícia", "Júlia", "Luciana", "Vanessa", "Mariana",
+    "Gabriela", "Vera", "Vitória", "Larissa", "Cláudia", "Beatriz", "Luana", "Rita", "Sônia", "Renata",
+    "Eliane", "Josefa", "Simone", "Natália", "Cristiane", "Carla", "Débora", "Rosângela", "Jaqueline", "Rosa",
+    "Daniela", "Aparecida", "Marlene", "Terezinha", "Raimunda", "Andréa", "Fabiana", "Lúcia", "Raquel", "Ângela",
+    "Rafaela", "Joana", "Luzia", "Elaine", "Daniele", "Regina", "Sabrina", "Isabela", "Helena", "Alice",
+)
+NOMES_MASCULINOS = (
+    "José", "João", "Antônio", "Francisco", "Carlos", "Paulo", "Pedro", "Lucas", "Luiz", "Marcos",
+    "Luís", "Gabriel", "Rafael", "Daniel", "Marcelo", "Bruno", "Eduardo", "Felipe", "Raimundo", "Rodrigo",
+    "Manoel", "Mateus", "André", "Fernando", "Fábio", "Leonardo", "Gustavo", "Guilherme", "Leandro", "Tiago",
+    "Anderson", "Ricardo", "Márcio", "Jorge", "Sebastião", "Alexandre", "Roberto", "Edson", "Diego", "Vitor",
+    "Sérgio", "Cláudio", "Matheus", "Thiago", "Geraldo", "Adriano", "Luciano", "Júlio", "Renato", "Alex",
+    "Vinícius", "Rogério", "Samuel", "Ronaldo", "Mário", "Flávio", "Douglas", "Igor", "Davi", "Arthur",
+)
+SOBRENOMES = (
+    "Silva", "Santos", "Oliveira", "Souza", "Rodrigues", "Ferreira", "Alves", "Pereira", "Lima", "Gomes",
+    "Costa", "Ribeiro", "Martins", "Carvalho", "Almeida", "Lopes", "Soares", "Fernandes", "Vieira", "Barbosa",
+    "Rocha", "Dias", "Nascimento", "Andrade", "Moreira", "Nunes", "Marques", "Machado", "Mendes", "Freitas",
+    "Cardoso", "Ramos", "Gonçalves", "Santana", "Teixeira", "Araújo", "Batista", "Correia", "Pinto", "Cavalcanti",
+    "Monteiro", "Moura", "Campos", "Reis", "Bezerra", "Farias", "Barros", "Castro", "Miranda", "Xavier",
+    "Borges", "Lacerda", "Medeiros", "Pires", "Sales", "Queiroz", "Azevedo", "Cunha", "Brito", "Tavares",
+)
+# (cidade, UF, DDD, população em milhares)
+CIDADES = (
+    ("São Paulo", "SP", 11, 11451), ("Rio de Janeiro", "RJ", 21, 6211), ("Brasília", "DF", 61, 2817),
+    ("Fortaleza", "CE", 85, 2428), ("Salvador", "BA", 71, 2418), ("Belo Horizonte", "MG", 31, 2315),
+    ("Manaus", "AM", 92, 2063), ("Curitiba", "PR", 41, 1773), ("Recife", "PE", 81, 1488),
+    ("Goiânia", "GO", 62, 1437), ("Porto Alegre", "RS", 51, 1332), ("Belém", "PA", 91, 1303),
+    ("Guarulhos", "SP", 11, 1291), ("Campinas", "SP", 19, 1139), ("São Luís", "MA", 98, 1037),
+    ("Maceió", "AL", 82, 957), ("Campo Grande", "MS", 67, 898), ("Teresina", "PI", 86, 866),
+    ("João Pessoa", "PB", 83, 833), ("Natal", "RN", 84, 751), ("Cuiabá", "MT", 65, 650),
+    ("Florianópolis", "SC", 48, 537), ("Vitória", "ES", 27, 322), ("Porto Velho", "RO", 69, 460),
+    ("Macapá", "AP", 96, 442), ("Rio Branco", "AC", 68, 364), ("Boa Vista", "RR", 95, 413),
+    ("Aracaju", "SE", 79, 602), ("Palmas", "TO", 63, 302), ("Feira de Santana", "BA", 75, 616),
+)
+_PESOS_CIDADES = tuple(cidade[3] for cidade in CIDADES)
+BAIRROS = (
+    "Centro", "Jardim América", "Vila Nova", "Santa Cruz", "São José", "Boa Vista", "Liberdade", "Bela Vista",
+    "Jardim das Flores", "Vila Mariana", "Cidade Nova", "Santo Antônio", "São Francisco", "Aparecida",
+    "Parque Industrial", "Jardim Europa", "Conjunto Habitacional", "Vila Operária", "Alto da Boa Vista",
+    "Nossa Senhora das Graças", "Jardim Primavera", "Vila Esperança", "Planalto", "Industrial", "Morada do Sol",
+)
+LOGRADOUROS = ("Rua", "Rua", "Rua", "Avenida", "Travessa", "Alameda", "Praça", "Estrada")
+# (tipo sanguíneo, proporção aproximada na população brasileira)
+TIPOS_SANGUINEOS = (
+    ("O+", 36), ("A+", 34), ("B+", 8), ("AB+", 2.5), ("O-", 9), ("A-", 8), ("B-", 2), ("AB-", 0.5),
+)
+# (tipo, prefixo do nome, horário, proporção)
+TIPOS_ESTABELECIMENTO = (
+    ("POSTO", "UBS", "Segunda a Sexta, 7h às 19h", 70),
+    ("HOSPITAL", "Hospital Municipal", "24 horas, todos os dias", 8),
+    ("UPA", "UPA", "24 horas, todos os dias", 10),
+    ("OUTRO", "Centro de Especialidades", "Segunda a Sexta, 8h às 17h", 12),
+)
+# (cargo masculino, cargo feminino, conselho profissional, proporção)
+CARGOS = (
+    ("Médico Clínico Geral", "Médica Clínica Geral", "CRM", 14),
+    ("Médico Pediatra", "Médica Pediatra", "CRM", 4),
+    ("Médico Ginecologista", "Médica Ginecologista", "CRM", 3),
+    ("Médico Cardiologista", "Médica Cardiologista", "CRM", 2),
+    ("Médico Emergencista", "Médica Emergencista", "CRM", 3),
+    ("Enfermeiro", "Enfermeira", "COREN", 20),
+    ("Técnico de Enfermagem", "Técnica de Enfermagem", "COREN", 30),
+    ("Farmacêutico", "Farmacêutica", "CRF", 4),
+    ("Cirurgião-Dentista", "Cirurgiã-Dentista", "CRO", 5),
+    ("Agente Comunitário de Saúde", "Agente Comunitária de Saúde", None, 15),
+)
+# (nome, fabricante, doses do esquema, cobertura)
+VACINAS = (
+    ("BCG", "Fundação Ataulpho de Paiva", ("Dose única",), 0.9),
+    ("Hepatite B", "Instituto Butantan", ("1ª dose", "2ª dose", "3ª dose"), 0.8),
+    ("Pentavalente", "Serum Institute of India", ("1ª dose", "2ª dose", "3ª dose"), 0.7),
+    ("VIP (Poliomielite inativada)", "Sanofi Pasteur", ("1ª dose", "2ª dose", "3ª dose"), 0.7),
+    ("Rotavírus humano", "GSK", ("1ª dose", "2ª dose"), 0.65),
+    ("Pneumocócica 10-valente", "Fiocruz/Bio-Manguinhos", ("1ª dose", "2ª dose", "Reforço"), 0.65),
+    ("Meningocócica C", "Fundação Ezequiel Dias", ("1ª dose", "2ª dose", "Reforço"), 0.6),
+    ("Febre Amarela", "Fiocruz/Bio-Manguinhos", ("Dose única", "Reforço"), 0.55),
+    ("Tríplice Viral", "Fiocruz/Bio-Manguinhos", ("1ª dose", "2ª dose"), 0.75),
+    ("Tetra Viral", "GSK", ("Dose única",), 0.4),
+    ("DTP", "Instituto Butantan", ("1º reforço", "2º reforço"), 0.5),
+    ("HPV quadrivalente", "MSD", ("1ª dose", "2ª dose"), 0.35),
+    ("dT (Dupla adulto)", "Instituto Butantan", ("1ª dose", "2ª dose", "3ª dose", "Reforço"), 0.4),
+    ("Influenza", "Instituto Butantan", ("Dose anual",), 0.5),
+    ("COVID-19", "Fiocruz/AstraZeneca", ("1ª dose", "2ª dose", "Reforço"), 0.8),
+)
+# (nome comercial, princípio ativo, fabricante, dosagem, frequência, duração)
+MEDICAMENTOS = (
+    ("Losartana Potássica 50mg", "Losartana potássica", "EMS", "50mg", "1 vez ao dia", "Uso contínuo"),
+    ("Hidroclorotiazida 25mg", "Hidroclorotiazida", "Medley", "25mg", "1 vez ao dia", "Uso contínuo"),
+    ("Metformina 850mg", "Cloridrato de metformina", "Merck", "850mg", "2 vezes ao dia", "Uso contínuo"),
+    ("Sinvastatina 20mg", "Sinvastatina", "EMS", "20mg", "1 vez ao dia, à noite", "Uso contínuo"),
+    ("Omeprazol 20mg", "Omeprazol", "Medley", "20mg", "1 vez ao dia, em jejum", "30 dias"),
+    ("Amoxicilina 500mg", "Amoxicilina", "Eurofarma", "500mg", "8 em 8 horas", "7 dias"),
+    ("Azitromicina 500mg", "Azitromicina", "EMS", "500mg", "1 vez ao dia", "5 dias"),
+    ("Dipirona 500mg", "Dipirona sódica", "Sanofi", "500mg", "6 em 6 horas, se dor ou febre", "5 dias"),
+    ("Paracetamol 750mg", "Paracetamol", "Medley", "750mg", "6 em 6 horas, se dor ou febre", "5 dias"),
+    ("Ibuprofeno 600mg", "Ibuprofeno", "Eurofarma", "600mg", "8 em 8 horas", "5 dias"),
+    ("Captopril 25mg", "Captopril", "Furp", "25mg", "2 vezes ao dia", "Uso contínuo"),
+    ("Glibenclamida 5mg", "Glibenclamida", "Furp", "5mg", "1 vez ao dia", "Uso contínuo"),
+    ("Salbutamol 100mcg", "Sulfato de salbutamol", "GSK", "2 jatos", "Se falta de ar", "30 dias"),
+    ("Sulfato Ferroso 40mg", "Sulfato ferroso", "Furp", "40mg", "1 vez ao dia", "90 dias"),
+    ("Ácido Fólico 5mg", "Ácido fólico", "Furp", "5mg", "1 vez ao dia", "90 dias"),
+    ("Fluoxetina 20mg", "Cloridrato de fluoxetina", "EMS", "20mg", "1 vez ao dia", "Uso contínuo"),
+    ("Levotiroxina 50mcg", "Levotiroxina sódica", "Merck", "50mcg", "1 vez ao dia, em jejum", "Uso contínuo"),
+    ("Prednisona 20mg", "Prednisona", "Medley", "20mg", "1 vez ao dia", "5 dias"),
+    ("Loratadina 10mg", "Loratadina", "EMS", "10mg", "1 vez ao dia", "10 dias"),
+    ("Insulina NPH", "Insulina humana NPH", "Novo Nordisk", "10 UI", "2 vezes ao dia", "Uso contínuo"),
+)
+# (tipo de atendimento, proporção)
+TIPOS_ATENDIMENTO = (
+    ("Consulta Regular", 40), ("Consulta de Retorno", 20), ("Urgência", 12), ("Emergência", 4),
+    ("Pré-natal", 5), ("Puericultura", 5), ("Procedimento", 8), ("Teleconsulta", 6),
+)
+# (queixa registrada na descrição, diagnóstico)
+QUEIXAS = (
+    ("Paciente relata dores de cabeça frequentes", "Cefaleia tensional"),
+    ("Pressão arterial elevada em aferições repetidas", "Hipertensão arterial sistêmica"),
+    ("Glicemia de jejum alterada", "Diabetes mellitus tipo 2"),
+    ("Tosse, coriza e febre baixa há três dias", "Infecção de vias aéreas superiores"),
+    ("Dor de garganta e febre", "Faringoamigdalite"),
+    ("Dor lombar após esforço", "Lombalgia mecânica"),
+    ("Ardor ao urinar", "Infecção do trato urinário"),
+    ("Diarreia e vômitos há dois dias", "Gastroenterite aguda"),
+    ("Falta de ar e chiado no peito", "Asma"),
+    ("Cansaço e palidez", "Anemia ferropriva"),
+    ("Tristeza persistente e insônia", "Episódio depressivo"),
+    ("Dor epigástrica após refeições", "Dispepsia"),
+    ("Acompanhamento de rotina", "Sem alterações"),
+    ("Lesão de pele pruriginosa", "Dermatite de contato"),
+    ("Dor no peito aos esforços", "Angina estável"),
+)
+# (tipo de exame, resultados possíveis)
+EXAMES = (
+    ("Hemograma completo", ("Dentro dos valores de referência", "Anemia leve", "Leucocitose discreta")),
+    ("Glicemia de jejum", ("92 mg/dL", "110 mg/dL", "145 mg/dL")),
+    ("Hemoglobina glicada", ("5,4%", "6,1%", "7,8%")),
+    ("Perfil lipídico", ("Dentro dos valores de referência", "LDL elevado", "Triglicerídeos elevados")),
+    ("Creatinina", ("0,9 mg/dL", "1,1 mg/dL", "1,6 mg/dL")),
+    ("TSH", ("2,1 mUI/L", "5,8 mUI/L", "0,2 mUI/L")),
+    ("Urina tipo 1", ("Sem alterações", "Leucocitúria", "Proteinúria discreta")),
+    ("Urocultura", ("Negativa", "Positiva para E. coli")),
+    ("Eletrocardiograma", ("Ritmo sinusal, sem alterações", "Sobrecarga ventricular esquerda")),
+    ("Raio-X de tórax", ("Sem alterações", "Opacidade em base direita")),
+    ("Ultrassonografia abdominal", ("Sem alterações", "Esteatose hepática leve")),
+    ("Beta-HCG", ("Negativo", "Positivo")),
+    ("Teste rápido de HIV", ("Não reagente",)),
+    ("Teste rápido de sífilis", ("Não reagente", "Reagente")),
+    ("Mamografia", ("BI-RADS 1", "BI-RADS 2")),
+)
+# (tipo de acesso registrado pela auditoria da API, proporção)
+TIPOS_ACESSO = (
+    ("leitura_paciente", 35), ("prontuario_completo", 25), ("resumo_prontuario", 15),
+    ("carteira_vacinacao", 15), ("busca_paciente", 7), ("listagem_pacientes", 3),
+)
+
+
+@dataclass(frozen=True)
+class Parametros:
+    """
+    Parâmetros da geração, compartilhados com os processos que gravam os blocos.
+    """
+    dsn: str
+    semente: int
+    pacientes: int
+    estabelecimentos: int
+    funcionarios: int
+    tamanho_bloco: int
+    atendimentos_por_paciente: float
+    acessos_por_paciente: float
+    referencia: datetime
+    inicio_atendimentos: datetime
+    inicio_acessos: datetime
+    gatilhos: bool
+
+
+def _uuid(semente: int, tabela: str, numero: int) -> uuid.UUID:
+    """
+    UUID (versão 4) determinístico do registro ``numero`` da tabela.
+    """
+    prefixo = zlib.crc32(f"{semente}:{tabela}".encode()) << 96
+    return uuid.UUID(int=prefixo | numero, version=4)
+
+
+def _cpf(base: int) -> str:
+    """
+    CPF formatado a partir dos 9 dígitos-base, com os dígitos verificadores.
+    """
+    digitos = [int(d) for d in f"{base:09d}"]
+    for _ in range(2):
+        soma = sum(d * peso for d, peso in zip(digitos, range(len(digitos) + 1, 1, -1)))
+        digitos.append(soma * 10 % 11 % 10)
+    texto = "".join(map(str, digitos))
+    return f"{texto[:3]}.{texto[3:6]}.{texto[6:9]}-{texto[9:]}"
+
+
+def _cns(pis: str) -> str:
+    """
+    Cartão Nacional de Saúde definitivo (iniciado por 1 ou 2) a partir dos 11
+    dígitos do PIS, com o dígito verificador.
+    """
+    soma = sum(int(d) * peso for d, peso in zip(pis, range(15, 4, -1)))
+    dv = 11 - soma % 11
+    if dv == 11:
+        dv = 0
+    if dv == 10:
+        soma += 2
+        dv = 11 - soma % 11
+        return f"{pis}001{dv}"
+    return f"{pis}000{dv}"
+
+
+def _embaralhar(numero: int, modulo: int) -> int:
+    # Bijeção em [0, modulo) (7919 é primo com 10), para documentos únicos sem sequência aparente
+    return (numero * 7919 + 104729) % modulo
+
+
+def _sem_acento(texto: str) -> str:
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode()
+
+
+def _escolher(rng: random.Random, opcoes, pesos):
+    return rng.choices(opcoes, weights=pesos)[0]
+
+
+def _instante(rng: random.Random, inicio: datetime, fim: datetime) -> datetime:
+    """
+    Instante aleatório (em segundos inteiros) entre inicio e fim.
+    """
+    return inicio + timedelta(seconds=rng.randrange(max(1, int((fim - inicio).total_seconds()))))
+
+
+def _nome(rng: random.Random, sexo: str) -> str:
+    primeiros = NOMES_FEMININOS if sexo == "F" else NOMES_MASCULINOS
+    sobrenomes = rng.sample(SOBRENOMES, rng.choice((1, 2, 2, 3)))
+    return " ".join((rng.choice(primeiros), *sobrenomes))
+
+
+def _endereco(rng: random.Random, cidade: Tuple) -> str:
+    logradouro = f"{rng.choice(LOGRADOUROS)} {rng.choice(NOMES_MASCULINOS + NOMES_FEMININOS)} {rng.choice(SOBRENOMES)}"
+    return f"{logradouro}, {rng.randint(1, 3000)}, {rng.choice(BAIRROS)}, {cidade[0]}, {cidade[1]}"
+
+
+def _telefone(rng: random.Random, ddd: int, celular: bool = True) -> str:
+    if celular:
+        return f"({ddd}) 9{rng.randint(1000, 9999)}-{rng.randint(0, 9999):04d}"
+    return f"({ddd}) {rng.randint(2000, 5999)}-{rng.randint(0, 9999):04d}"
+
+
+def _cidade_do_estabelecimento(semente: int, numero: int) -> Tuple:
+    return _escolher(random.Random(semente * 7 + numero), CIDADES, _PESOS_CIDADES)
+
+
+def _funcionario_do_estabelecimento(rng: random.Random, p: Parametros, estabelecimento: int) -> int:
+    # O funcionário j trabalha no estabelecimento j % estabelecimentos
+    quantidade = (p.funcionarios - estabelecimento + p.estabelecimentos - 1) // p.estabelecimentos
+    return estabelecimento + p.estabelecimentos * rng.randrange(quantidade)
+
+
+def gerar_referencias(p: Parametros) -> Dict[str, List[Tuple]]:
+    """
+    Estabelecimentos, funcionários, vacinas e medicamentos.
+    """
+    rng = random.Random(p.semente)
+    cadastro = p.referencia - timedelta(days=3650)
+    linhas: Dict[str, List[Tuple]] = {tabela: [] for tabela in ("estabelecimentos", "funcionarios", "vacinas", "medicamentos")}
+
+    pesos_tipos = [tipo[3] for tipo in TIPOS_ESTABELECIMENTO]
+    for numero in range(p.estabelecimentos):
+        tipo, prefixo, horario, _ = _escolher(rng, TIPOS_ESTABELECIMENTO, pesos_tipos)
+        cidade = _cidade_do_estabelecimento(p.semente, numero)
+        bairro = rng.choice(BAIRROS)
+        linhas["estabelecimentos"].append((
+            _uuid(p.semente, "estabelecimentos", numero),
+            f"{prefixo} {bairro} {numero + 1}"[:100],
+            tipo,
+            # CNES com 7 dígitos, iniciado por 3 (fora dos CNES dos dados de exemplo)
+            f"3{_embaralhar(numero, 10**6):06d}",
+            _endereco(rng, cidade),
+            _telefone(rng, cidade[2], celular=False),
+            f"{_sem_acento(prefixo).lower().replace(' ', '.')}{numero + 1}@saude.gov.br",
+            horario,
+            cadastro,
+            cadastro,
+        ))
+
+    pesos_cargos = [cargo[3] for cargo in CARGOS]
+    for numero in range(p.funcionarios):
+        estabelecimento = numero % p.estabelecimentos
+        sexo = rng.choice("FM")
+        masculino, feminino, conselho, _ = _escolher(rng, CARGOS, pesos_cargos)
+        nome = _nome(rng, sexo)
+        cidade = _cidade_do_estabelecimento(p.semente, estabelecimento)
+        contratacao = _instante(rng, p.referencia - timedelta(days=30 * 365), p.referencia - timedelta(days=30))
+        linhas["funcionarios"].append((
+            _uuid(p.semente, "funcionarios", numero),
+            _uuid(p.semente, "estabelecimentos", estabelecimento),
+            nome,
+            _cpf(_embaralhar(_INICIO_CPF_FUNCIONARIOS + numero, 10**9)),
+            feminino if sexo == "F" else masculino,
+            f"{conselho}-{rng.randint(10000, 999999)}" if conselho else None,
+            contratacao.date(),
+            _telefone(rng, cidade[2]),
+            f"{_sem_acento(nome).lower().replace(' ', '.')}{numero}@saude.gov.br"[:100],
+            rng.random() > 0.03,
+            SENHA_HASH,
+            contratacao,
+            contratacao,
+        ))
+
+    for numero, (nome, fabricante, _, _) in enumerate(VACINAS):
+        linhas["vacinas"].append((
+            _uuid(p.semente, "vacinas", numero),
+            nome,
+            fabricante,
+            f"{rng.choice('ABCDEFGHJK')}{rng.randint(100000, 999999)}",
+            (p.referencia + timedelta(days=rng.randint(90, 720))).date(),
+            cadastro,
+        ))
+
+    for numero, (nome, principio_ativo, fabricante, *_) in enumerate(MEDICAMENTOS):
+        linhas["medicamentos"].append((
+            _uuid(p.semente, "medicamentos", numero), nome, principio_ativo, fabricante, cadastro,
+        ))
+    return linhas
+
+
+def gerar_bloco(p: Parametros, bloco: int) -> Dict[str, List[Tuple]]:
+    """
+    Pacientes do bloco e todos os registros que dependem deles.
+    """
+    rng = random.Random(p.semente * 1_000_003 + bloco)
+    linhas: Dict[str, List[Tuple]] = {tabela: [] for tabela in _TABELAS_BLOCO}
+    sequencias = dict.fromkeys(_TABELAS_BLOCO[1:-1], 0)
+
+    def novo_id(tabela: str) -> uuid.UUID:
+        sequencias[tabela] += 1
+        return _uuid(p.semente, tabela, (bloco << 32) | sequencias[tabela])
+
+    tipos_sanguineos, pesos_sanguineos = zip(*TIPOS_SANGUINEOS)
+    tipos_atendimento, pesos_atendimento = zip(*TIPOS_ATENDIMENTO)
+    tipos_acesso, pesos_acesso = zip(*TIPOS_ACESSO)
+    vacinas = [(_uuid(p.semente, "vacinas", n), doses, cobertura) for n, (_, _, doses, cobertura) in enumerate(VACINAS)]
+    medicamentos = [(_uuid(p.semente, "medicamentos", n), *dados[3:]) for n, dados in enumerate(MEDICAMENTOS)]
+    uuid_estabelecimento = lambda n: _uuid(p.semente, "estabelecimentos", n)
+    uuid_funcionario = lambda n: _uuid(p.semente, "funcionarios", n)
+
+    primeiro = bloco * p.tamanho_bloco
+    for numero in range(primeiro, min(primeiro + p.tamanho_bloco, p.pacientes)):
+        paciente_id = _uuid(p.semente, "pacientes", numero)
+        sorteio = rng.random()
+        sexo = "F" if sorteio < 0.51 else ("M" if sorteio < 0.998 else "O")
+        nome = _nome(rng, "F" if sexo == "F" else ("M" if sexo == "M" else rng.choice("FM")))
+        # Idade com a forma aproximada da pirâmide etária brasileira (mediana em torno de 33 anos)
+        idade = min(105, rng.gammavariate(2.3, 15.5))
+        nascimento = (p.referencia - timedelta(days=idade * 365.25)).date()
+        # Estabelecimentos mais procurados concentram os pacientes
+        estabelecimento = int(p.estabelecimentos * rng.random() ** 2)
+        cidade = _cidade_do_estabelecimento(p.semente, estabelecimento)
+        cadastro = _instante(rng, p.inicio_atendimentos, p.referencia - timedelta(days=1))
+        linhas["pacientes"].append((
+            paciente_id,
+            nome,
+            _cpf(_embaralhar(numero, 10**9)),
+            nascimento,
+            sexo,
+            _endereco(rng, cidade),
+            _telefone(rng, cidade[2]) if rng.random() < 0.85 else None,
+            f"{_sem_acento(nome).lower().replace(' ', '.')}{numero}@email.com"[:100] if rng.random() < 0.6 else None,
+            _escolher(rng, tipos_sanguineos, pesos_sanguineos) if rng.random() < 0.7 else None,
+            _cns(f"1{_embaralhar(numero, 10**10):010d}"),
+            cadastro,
+            cadastro,
+        ))
+
+        # Prontuário no estabelecimento de referência e, para parte dos pacientes, em outro
+        prontuarios = [(novo_id("prontuarios"), estabelecimento, cadastro)]
+        if rng.random() < 0.15:
+            outro = rng.randrange(p.estabelecimentos)
+            prontuarios.append((novo_id("prontuarios"), outro, _instante(rng, cadastro, p.referencia)))
+        for prontuario_id, estabelecimento_prontuario, criacao in prontuarios:
+            linhas["prontuarios"].append((
+                prontuario_id, paciente_id, uuid_estabelecimento(estabelecimento_prontuario), criacao, criacao,
+            ))
+
+        # Atendimentos com cauda longa (Pareto): a maioria com poucos, alguns com muitos
+        quantidade = min(MAX_ATENDIMENTOS, int((rng.paretovariate(1.5) - 1) * p.atendimentos_por_paciente / 2))
+        ultimo_atendimento, exames, vacinacoes = None, len(linhas["exames"]), len(linhas["carteira_vacinacao"])
+        for _ in range(quantidade):
+            prontuario_id, estabelecimento_prontuario, criacao = rng.choice(prontuarios)
+            atendimento_id = novo_id("atendimentos")
+            funcionario = _funcionario_do_estabelecimento(rng, p, estabelecimento_prontuario)
+            data_atendimento = _instante(rng, criacao, p.referencia)
+            ultimo_atendimento = max(ultimo_atendimento or data_atendimento, data_atendimento)
+            descricao, diagnostico = rng.choice(QUEIXAS)
+            linhas["atendimentos"].append((
+                atendimento_id, prontuario_id, uuid_funcionario(funcionario), data_atendimento,
+                _escolher(rng, tipos_atendimento, pesos_atendimento), descricao, diagnostico,
+            ))
+            for medicamento_id, dosagem, frequencia, duracao in rng.sample(
+                medicamentos, rng.choices((0, 1, 2, 3), weights=(45, 30, 17, 8))[0]
+            ):
+                linhas["prescricoes"].append((
+                    novo_id("prescricoes"), atendimento_id, medicamento_id, dosagem, frequencia, duracao, data_atendimento,
+                ))
+            for tipo_exame, resultados in rng.sample(EXAMES, rng.choices((0, 1, 2, 3), weights=(60, 25, 10, 5))[0]):
+                realizado = rng.random() < 0.8
+                realizacao = min(p.referencia, data_atendimento + timedelta(days=rng.randint(0, 15)))
+                linhas["exames"].append((
+                    novo_id("exames"),
+                    atendimento_id,
+                    tipo_exame,
+                    rng.choice(resultados) if realizado else None,
+                    data_atendimento,
+                    realizacao if realizado else None,
+                    uuid_funcionario(funcionario),
+                    uuid_funcionario(_funcionario_do_estabelecimento(rng, p, estabelecimento_prontuario))
+                    if realizado else None,
+                ))
+
+        # Vacinações: cada vacina do calendário com a sua cobertura, doses em ordem
+        nascimento_dt = datetime.combine(nascimento, datetime.min.time())
+        for vacina_id, doses, cobertura in vacinas:
+            if rng.random() >= cobertura:
+                continue
+            aplicacoes = sorted(_instante(rng, nascimento_dt, p.referencia) for _ in doses)
+            for dose, aplicacao in zip(doses[:rng.randint(1, len(doses))], aplicacoes):
+                funcionario = _funcionario_do_estabelecimento(rng, p, estabelecimento)
+                linhas["carteira_vacinacao"].append((
+                    novo_id("carteira_vacinacao"), paciente_id, vacina_id, uuid_funcionario(funcionario),
+                    uuid_estabelecimento(estabelecimento), aplicacao, dose, aplicacao,
+                ))
+        exames = len(linhas["exames"]) - exames
+        vacinacoes = len(linhas["carteira_vacinacao"]) - vacinacoes
+
+        # Sem os gatilhos, os totais de resumo_pacientes são gravados junto com o bloco
+        if not p.gatilhos and (quantidade or exames or vacinacoes):
+            linhas["resumo_pacientes"].append(
+                (paciente_id, quantidade, ultimo_atendimento, vacinacoes, exames, p.referencia)
+            )
+
+        # Acessos recentes ao histórico, mais frequentes para quem tem mais atendimentos
+        media_acessos = p.acessos_por_paciente * (1 + quantidade) / (1 + p.atendimentos_por_paciente)
+        for _ in range(int(rng.expovariate(1 / media_acessos))):
+            prontuario_id, estabelecimento_prontuario, _ = rng.choice(prontuarios)
+            linhas["historico_acesso"].append((
+                novo_id("historico_acesso"),
+                paciente_id,
+                prontuario_id if rng.random() < 0.5 else None,
+                uuid_funcionario(_funcionario_do_estabelecimento(rng, p, estabelecimento_prontuario)),
+                _instante(rng, p.inicio_acessos, p.referencia),
+                _escolher(rng, tipos_acesso, pesos_acesso),
+                f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+            ))
+    return linhas
+
+
+async def _copiar(conexao: asyncpg.Connection, linhas: Dict[str, List[Tuple]], gatilhos: bool):
+    async with conexao.transaction():
+        if not gatilhos:
+            # Dados consistentes por construção: dispensa os gatilhos, inclusive os das chaves
+            # estrangeiras e o que verifica a referência a atendimentos linha a linha
+            await conexao.execute("SET LOCAL session_replication_role = replica")
+        for tabela, registros in linhas.items():
+            if registros:
+                await conexao.copy_records_to_table(tabela, records=registros, columns=_COLUNAS[tabela])
+
+
+async def _gravar_bloco(p: Parametros, bloco: int) -> Dict[str, int]:
+    linhas = gerar_bloco(p, bloco)
+    conexao = await asyncpg.connect(p.dsn)
+    try:
+        await _copiar(conexao, linhas, p.gatilhos)
+    finally:
+        await conexao.close()
+    return {tabela: len(registros) for tabela, registros in linhas.items()}
+
+
+def processar_bloco(p: Parametros, bloco: int) -> Dict[str, int]:
+    """
+    Gera e grava um bloco (executado nos processos de trabalho).
+    """
+    return asyncio.run(_gravar_bloco(p, bloco))
+
+
+def _meses(inicio: datetime, fim: datetime) -> List[date]:
+    mes, meses = inicio.date().replace(day=1), []
+    while mes <= fim.date():
+        meses.append(mes)
+        mes = (mes + timedelta(days=32)).replace(day=1)
+    return meses
+
+
+async def preparar(p: Parametros, limpar: bool) -> Dict[str, int]:
+    """
+    Limpa as tabelas (se pedido), cria as partições do período e grava as referências.
+    """
+    conexao = await asyncpg.connect(p.dsn)
+    try:
+        if limpar:
+            await conexao.execute(f"TRUNCATE {', '.join(TABELAS)}")
+        for tabela, inicio in (("atendimentos", p.inicio_atendimentos), ("historico_acesso", p.inicio_acessos)):
+            for mes in _meses(inicio, p.referencia):
+                await conexao.execute("SELECT criar_particao_mensal($1, $2)", tabela, mes)
+        referencias = gerar_referencias(p)
+        await _copiar(conexao, referencias, p.gatilhos)
+    finally:
+        await conexao.close()
+    return {tabela: len(registros) for tabela, registros in referencias.items()}
+
+
+async def finalizar(p: Parametros):
+    """
+    Atualiza as estatísticas do planejador e a view de resumo dos prontuários.
+    """
+    conexao = await asyncpg.connect(p.dsn)
+    try:
+        await conexao.execute("ANALYZE")
+    finally:
+        await conexao.close()
+    await atualizador_resumo.atualizar()
+    await async_engine.dispose()
+
+
+def main(args: argparse.Namespace) -> int:
+    referencia = datetime.combine(args.data_referencia, datetime.min.time()).replace(hour=18)
+    estabelecimentos = args.estabelecimentos or max(5, args.pacientes // 1000)
+    funcionarios = args.funcionarios or max(estabelecimentos * 2, args.pacientes // 100)
+    if funcionarios < estabelecimentos:
+        print("É preciso ao menos um funcionário por estabelecimento", file=sys.stderr)
+        return 2
+    p = Parametros(
+        dsn=settings.ASYNC_DATABASE_URI.replace("postgresql+asyncpg://", "postgresql://"),
+        semente=args.semente,
+        pacientes=args.pacientes,
+        estabelecimentos=estabelecimentos,
+        funcionarios=funcionarios,
+        tamanho_bloco=args.tamanho_bloco,
+        atendimentos_por_paciente=args.atendimentos_por_paciente,
+        acessos_por_paciente=args.acessos_por_paciente,
+        referencia=referencia,
+        inicio_atendimentos=datetime.combine(args.inicio_atendimentos, datetime.min.time()),
+        inicio_acessos=datetime.combine(_meses(referencia - timedelta(days=31 * args.meses_acesso), referencia)[0],
+                                        datetime.min.time()),
+        gatilhos=args.gatilhos,
+    )
+
+    inicio = time.perf_counter()
+    totais = asyncio.run(preparar(p, args.limpar))
+    blocos = (p.pacientes + p.tamanho_bloco - 1) // p.tamanho_bloco
+    print(f"referências gravadas: {totais}; {blocos} blocos de até {p.tamanho_bloco} pacientes em {args.processos} processos")
+
+    concluidos = 0
+    with ProcessPoolExecutor(max_workers=args.processos) as executor:
+        futuros = [executor.submit(processar_bloco, p, bloco) for bloco in range(blocos)]
+        for futuro in as_completed(futuros):
+            for tabela, quantidade in futuro.result().items():
+                totais[tabela] = totais.get(tabela, 0) + quantidade
+            concluidos += 1
+            decorrido = time.perf_counter() - inicio
+            linhas = sum(totais.values())
+            print(f"\r{concluidos}/{blocos} blocos, {linhas:,} linhas, {linhas / decorrido:,.0f} linhas/s", end="", flush=True)
+    print()
+
+    asyncio.run(finalizar(p))
+    decorrido = time.perf_counter() - inicio
+    for tabela, quantidade in totais.items():
+        print(f"{tabela:20s} {quantidade:>14,}")
+    print(f"{'total':20s} {sum(totais.values()):>14,} linhas em {decorrido:.1f}s "
+          f"({sum(totais.values()) / decorrido:,.0f} linhas/s, incluindo ANALYZE e a view de resumo)")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pacientes", type=int, default=100000)
+    parser.add_argument("--estabelecimentos", type=int, help="Padrão: 1 para cada mil pacientes (no mínimo 5)")
+    parser.add_argument("--funcionarios", type=int, help="Padrão: 1 para cada cem pacientes (no mínimo 2 por estabelecimento)")
+    parser.add_argument("--atendimentos-por-paciente", type=float, default=4, help="Média aproximada")
+    parser.add_argument("--acessos-por-paciente", type=float, default=2, help="Média aproximada")
+    parser.add_argument("--inicio-atendimentos", type=date.fromisoformat, default=date(2020, 1, 1))
+    parser.add_argument("--meses-acesso", type=int, default=3, help="Meses de histórico de acesso até a referência")
+    parser.add_argument("--data-referencia", type=date.fromisoformat, default=date.today(),
+                        help="Data final dos dados (AAAA-MM-DD); padrão: hoje")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--tamanho-bloco", type=int, default=10000, help="Pacientes por bloco (e por transação)")
+    parser.add_argument("--processos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--gatilhos", action="store_true",
+                        help="Grava com os gatilhos e as verificações das chaves estrangeiras (bem mais lento)")
+    parser.add_argument("--limpar", action="store_true", help="Apaga os dados de todas as tabelas antes de gerar")
+    sys.exit(main(parser.parse_args()))
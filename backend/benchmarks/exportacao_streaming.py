@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark da exportação em streaming da carteira de vacinação
+
+Insere registros temporários (doses com prefixo "bench-") pela importação em
+lote, exporta a carteira em NDJSON e em CSV e reporta o tempo até o primeiro
+byte, a vazão e o pico de memória residente durante a exportação. A aplicação
+é servida por um uvicorn local, pois o transporte ASGI do httpx acumula a
+resposta inteira antes de entregá-la. Os registros criados são removidos ao final.
+
+Uso (a partir do diretório backend, com o PostgreSQL local populado):
+
+    python -m benchmarks.exportacao_streaming --registros 200000
+"""
+
+import argparse
+import asyncio
+import resource
+import time
+
+import httpx
+import uvicorn
+from sqlalchemy import delete
+
+from app.core.config import settings
+from app.db.models.carteira_vacinacao import CarteiraVacinacao
+from app.db.session import AsyncSessionLocal, async_engine
+from app.services.importacao_vacinacao import importar_vacinacoes
+from benchmarks.importacao_lote import PREFIXO_DOSE, gerar_registros
+from main import app
+
+URL_EXPORTACAO = "/api/v1/vacinacao/carteira/exportar"
+PORTA = 8765
+
+
+def memoria_maxima_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def exportar(client: httpx.AsyncClient, formato: str):
+    inicio = time.perf_counter()
+    primeiro_byte = None
+    linhas = 0
+    async with client.stream("GET", URL_EXPORTACAO, params={"formato": formato}) as resposta:
+        async for bloco in resposta.aiter_bytes():
+            if primeiro_byte is None:
+                primeiro_byte = time.perf_counter() - inicio
+            linhas += bloco.count(b"\n")
+    duracao = time.perf_counter() - inicio
+    print(
+        f"{formato:6s}: {linhas} linhas em {duracao:.2f}s ({linhas / duracao:,.0f} linhas/s), "
+        f"primeiro byte em {primeiro_byte * 1000:.1f} ms, memória máxima {memoria_maxima_mb():.0f} MB"
+    )
+
+
+async def main(args: argparse.Namespace):
+    servidor = uvicorn.Server(uvicorn.Config(app, port=PORTA, log_level="warning"))
+    tarefa = asyncio.create_task(servidor.serve())
+    while not servidor.started:
+        await asyncio.sleep(0.05)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORTA}", timeout=None) as client:
+        try:
+            async with AsyncSessionLocal() as db:
+                registros = await gerar_registros(args.registros, "exp")
+                resultado = await importar_vacinacoes(db, registros, settings.IMPORTACAO_TAMANHO_LOTE)
+            del registros
+            print(f"{resultado['importados']} registros temporários inseridos")
+            print(f"memória após a carga: {memoria_maxima_mb():.0f} MB")
+
+            for formato in ("ndjson", "csv"):
+                await exportar(client, formato)
+        finally:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(CarteiraVacinacao).where(CarteiraVacinacao.dose.like(f"{PREFIXO_DOSE}%")))
+                await db.commit()
+            servidor.should_exit = True
+            await tarefa
+            await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registros", type=int, default=200000)
+    asyncio.run(main(parser.parse_args()))
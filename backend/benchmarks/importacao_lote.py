@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark da importação em lote de registros de vacinação (COPY)
+
+Gera registros válidos a partir dos pacientes, vacinas, funcionários e
+estabelecimentos já cadastrados, importa-os pelo endpoint JSON e pelo
+endpoint CSV e reporta a vazão em registros por segundo. Os registros
+criados são removidos ao final.
+
+Uso (a partir do diretório backend, com o PostgreSQL local populado):
+
+    python -m benchmarks.importacao_lote --registros 50000
+"""
+
+import argparse
+import asyncio
+import csv
+import io
+import random
+import time
+
+import httpx
+from sqlalchemy import delete, select
+
+from app.db.models.carteira_vacinacao import CarteiraVacinacao
+from app.db.models.estabelecimento import Estabelecimento
+from app.db.models.funcionario import Funcionario
+from app.db.models.paciente import Paciente
+from app.db.models.vacina import Vacina
+from app.db.session import AsyncSessionLocal, async_engine
+from main import app
+
+PREFIXO_DOSE = "bench-"
+URL_LOTE = "/api/v1/vacinacao/carteira/lote"
+
+
+async def gerar_registros(total: int, rotulo: str):
+    """
+    Gera registros com doses únicas para não colidir com a restrição de unicidade.
+    """
+    async with AsyncSessionLocal() as db:
+        ids = {}
+        for nome, coluna in (
+            ("paciente_id", Paciente.paciente_id),
+            ("vacina_id", Vacina.vacina_id),
+            ("funcionario_id", Funcionario.funcionario_id),
+            ("estabelecimento_id", Estabelecimento.estabelecimento_id),
+        ):
+            ids[nome] = [str(i) for i in (await db.execute(select(coluna).limit(1000))).scalars()]
+
+    aleatorio = random.Random(42)
+    return [
+        {
+            **{nome: aleatorio.choice(valores) for nome, valores in ids.items()},
+            "data_aplicacao": "2024-03-01T10:00:00",
+            "dose": f"{PREFIXO_DOSE}{rotulo}-{i}",
+            "observacoes": None,
+        }
+        for i in range(total)
+    ]
+
+
+def para_csv(registros) -> bytes:
+    saida = io.StringIO()
+    escritor = csv.DictWriter(saida, fieldnames=list(registros[0]))
+    escritor.writeheader()
+    escritor.writerows(registros)
+    return saida.getvalue().encode()
+
+
+async def main(args: argparse.Namespace):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        try:
+            registros = await gerar_registros(args.registros, "json")
+            inicio = time.perf_counter()
+            resposta = await client.post(URL_LOTE, json=registros)
+            duracao = time.perf_counter() - inicio
+            resultado = resposta.json()
+            print(f"JSON: {resultado['importados']} importados em {duracao:.2f}s ({resultado['importados'] / duracao:,.0f} registros/s)")
+
+            conteudo = para_csv(await gerar_registros(args.registros, "csv"))
+            inicio = time.perf_counter()
+            resposta = await client.post(f"{URL_LOTE}/csv", files={"arquivo": ("lote.csv", conteudo, "text/csv")})
+            duracao = time.perf_counter() - inicio
+            resultado = resposta.json()
+            print(f"CSV:  {resultado['importados']} importados em {duracao:.2f}s ({resultado['importados'] / duracao:,.0f} registros/s)")
+        finally:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(CarteiraVacinacao).where(CarteiraVacinacao.dose.like(f"{PREFIXO_DOSE}%")))
+                await db.commit()
+            await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registros", type=int, default=50000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark das buscas de pacientes por CPF, número do SUS e ID, e da listagem
+
+Cria pacientes sintéticos (1 milhão por padrão) e mede a latência (p50, p95 e
+p99) de GET /pacientes/cpf/{cpf} (com e sem pontuação), /pacientes/sus/{sus},
+/pacientes/{id} e da listagem (primeira página, página distante com cursor e a
+mesma página com skip). Termina com código 1 se o p95 de alguma busca por
+chave exceder o orçamento. Os pacientes criados são removidos ao final, a
+menos que --manter seja informado (útil para repetir as medições).
+
+Uso (a partir do diretório backend, com o PostgreSQL local):
+
+    python -m benchmarks.pacientes --pacientes 1000000 --requisicoes 2000 --orcamento-ms 5
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+
+import httpx
+from sqlalchemy import text
+
+from app.api.paginacao import codificar_cursor
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, async_engine
+from main import app
+
+# Faixas de CPF e de número do SUS reservadas aos pacientes sintéticos
+BASE_CPF = 99900000000
+BASE_SUS = 999900000000000
+LOTE = 100000
+
+_CRIAR_PACIENTES = text("""
+    INSERT INTO pacientes (nome, cpf, data_nascimento, sexo, sus_numero)
+    SELECT
+        (ARRAY['Ana', 'Bruno', 'Carla', 'Diego', 'Elisa', 'Fábio', 'Gabriela', 'Heitor'])[1 + n % 8]
+            || ' ' || (ARRAY['Silva', 'Souza', 'Oliveira', 'Santos', 'Lima', 'Costa', 'Ribeiro'])[1 + (n / 8) % 7]
+            || ' ' || n,
+        substr(d, 1, 3) || '.' || substr(d, 4, 3) || '.' || substr(d, 7, 3) || '-' || substr(d, 10, 2),
+        DATE '1930-01-01' + (n % 30000)::int,
+        (ARRAY['M', 'F', 'O'])[1 + n % 3],
+        (CAST(:base_sus AS bigint) + n)::text
+    FROM generate_series(CAST(:inicio AS bigint), CAST(:fim AS bigint)) n,
+         LATERAL (SELECT (CAST(:base_cpf AS bigint) + n)::text AS d) c
+""")
+
+_TOTAL_SINTETICOS = text("SELECT COUNT(*) FROM pacientes WHERE sus_numero >= :base")
+_REMOVER = text("DELETE FROM pacientes WHERE sus_numero >= :base")
+
+
+def cpf_sintetico(n: int, pontuado: bool) -> str:
+    d = str(BASE_CPF + n)
+    return f"{d[:3]}.{d[3:6]}.{d[6:9]}-{d[9:]}" if pontuado else d
+
+
+def percentis(duracoes):
+    quantis = statistics.quantiles(duracoes, n=100)
+    return statistics.median(duracoes), quantis[94], quantis[98]
+
+
+async def criar_pacientes(total: int):
+    async with AsyncSessionLocal() as db:
+        existentes = (await db.execute(_TOTAL_SINTETICOS, {"base": str(BASE_SUS)})).scalar()
+    if existentes >= total:
+        print(f"{existentes} pacientes sintéticos já existem")
+        return
+    inicio = time.perf_counter()
+    for lote in range(existentes, total, LOTE):
+        async with AsyncSessionLocal() as db:
+            await db.execute(_CRIAR_PACIENTES, {
+                "inicio": lote + 1, "fim": min(lote + LOTE, total), "base_cpf": BASE_CPF, "base_sus": BASE_SUS,
+            })
+            await db.commit()
+    async with async_engine.begin() as conexao:
+        await conexao.exec_driver_sql("ANALYZE pacientes")
+    print(f"{total - existentes} pacientes criados em {time.perf_counter() - inicio:.1f}s")
+
+
+async def medir(client: httpx.AsyncClient, urls, esperado: int = 200):
+    duracoes = []
+    for url in urls:
+        inicio = time.perf_counter()
+        resposta = await client.get(url)
+        duracoes.append((time.perf_counter() - inicio) * 1000)
+        if resposta.status_code != esperado:
+            raise RuntimeError(f"{url}: {resposta.status_code} {resposta.text[:200]}")
+    return percentis(duracoes)
+
+
+async def main(args: argparse.Namespace) -> int:
+    settings.AUDITORIA_HABILITADA = False
+    aleatorio = random.Random(42)
+    try:
+        await criar_pacientes(args.pacientes)
+        amostra = [aleatorio.randint(1, args.pacientes) for _ in range(args.requisicoes)]
+        async with AsyncSessionLocal() as db:
+            ids = (await db.execute(
+                text("SELECT paciente_id FROM pacientes WHERE sus_numero = ANY(:sus)"),
+                {"sus": [str(BASE_SUS + n) for n in amostra[: args.requisicoes]]},
+            )).scalars().all()
+
+        transport = httpx.ASGITransport(app=app)
+        falhas = 0
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            P = "/api/v1/pacientes"
+            # Aquecimento do pool de conexões e dos caches do banco
+            await medir(client, [f"{P}/cpf/{cpf_sintetico(n, True)}" for n in amostra[:100]])
+
+            buscas = {
+                "cpf (sem pontuação)": [f"{P}/cpf/{cpf_sintetico(n, False)}" for n in amostra],
+                "cpf (com pontuação)": [f"{P}/cpf/{cpf_sintetico(n, True)}" for n in amostra],
+                "sus": [f"{P}/sus/{BASE_SUS + n}" for n in amostra],
+                "id": [f"{P}/{paciente_id}" for paciente_id in ids],
+            }
+            print(f"{'busca':24s} {'p50':>8s} {'p95':>8s} {'p99':>8s}  (ms, {args.requisicoes} requisições)")
+            for nome, urls in buscas.items():
+                p50, p95, p99 = await medir(client, urls)
+                dentro = p95 <= args.orcamento_ms
+                falhas += not dentro
+                print(f"{nome:24s} {p50:8.2f} {p95:8.2f} {p99:8.2f}  {'OK' if dentro else 'ACIMA DO ORÇAMENTO'}")
+
+            # Listagem: a página na metade da tabela, com cursor e com skip
+            repeticoes = max(args.requisicoes // 100, 5)
+            metade = args.pacientes // 2
+            async with AsyncSessionLocal() as db:
+                nome, paciente_id = (await db.execute(
+                    text("SELECT nome, paciente_id FROM pacientes ORDER BY nome, paciente_id OFFSET :n LIMIT 1"),
+                    {"n": metade},
+                )).one()
+            cursor = codificar_cursor((nome, paciente_id))
+            listagens = {
+                "lista (1ª página)": [f"{P}/?limit=100"] * repeticoes,
+                "lista (cursor, metade)": [f"{P}/?limit=100&cursor={cursor}"] * repeticoes,
+                "lista (skip, metade)": [f"{P}/?limit=100&skip={metade}"] * repeticoes,
+            }
+            for nome, urls in listagens.items():
+                p50, p95, p99 = await medir(client, urls)
+                print(f"{nome:24s} {p50:8.2f} {p95:8.2f} {p99:8.2f}")
+        print(f"orçamento das buscas por chave: p95 <= {args.orcamento_ms} ms")
+    finally:
+        if not args.manter:
+            async with AsyncSessionLocal() as db:
+                await db.execute(_REMOVER, {"base": str(BASE_SUS)})
+                await db.commit()
+        await async_engine.dispose()
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pacientes", type=int, default=1000000)
+    parser.add_argument("--requisicoes", type=int, default=2000)
+    parser.add_argument("--orcamento-ms", type=float, default=5.0)
+    parser.add_argument("--manter", action="store_true", help="Não remove os pacientes sintéticos ao final")
+    sys.exit(asyncio.run(main(parser.parse_args())))
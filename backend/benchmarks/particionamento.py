@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Verificação, com EXPLAIN, da poda de partições nas consultas por período
+
+Executa EXPLAIN (ANALYZE) das consultas 4, 9 e 10 de
+sql/queries/consultas_otimizadas.sql, que filtram atendimentos e historico_acesso
+por data, e mostra quantas partições de cada tabela foram lidas. Termina com
+código 1 se alguma consulta ler todas as partições (sem poda).
+
+Uso (a partir do diretório backend, com o PostgreSQL local populado):
+
+    python -m benchmarks.particionamento --planos
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.db.session import AsyncSessionLocal, async_engine
+
+ARQUIVO_CONSULTAS = Path(__file__).resolve().parents[2] / "sql" / "queries" / "consultas_otimizadas.sql"
+CONSULTAS = (4, 9, 10)
+
+_TOTAL_PARTICOES = text("""
+    SELECT h.inhparent::regclass::text AS tabela, COUNT(*) AS total
+    FROM pg_inherits h
+    WHERE h.inhparent IN ('atendimentos'::regclass, 'historico_acesso'::regclass)
+    GROUP BY h.inhparent
+""")
+
+
+def consultas_do_arquivo():
+    """
+    Retorna {número: SQL} das consultas numeradas do arquivo, sem o EXPLAIN ANALYZE.
+    """
+    conteudo = ARQUIVO_CONSULTAS.read_text(encoding="utf-8")
+    return {
+        int(numero): sql.strip()
+        for numero, sql in re.findall(r"-- CONSULTA (\d+):.*?EXPLAIN ANALYZE\s*(.*?);", conteudo, re.DOTALL)
+    }
+
+
+def particoes_lidas(no: dict, lidas: dict, removidas: list):
+    """
+    Acumula as partições lidas (por tabela principal) e os subplanos removidos na poda.
+    """
+    if no.get("Node Type") in ("Append", "Merge Append"):
+        removidas.append(no.get("Subplans Removed", 0))
+    relacao = no.get("Relation Name", "")
+    for tabela in ("atendimentos", "historico_acesso"):
+        if re.fullmatch(rf"{tabela}_\d{{4}}_\d{{2}}", relacao):
+            lidas.setdefault(tabela, set()).add(relacao)
+    for filho in no.get("Plans", []):
+        particoes_lidas(filho, lidas, removidas)
+
+
+async def main(args: argparse.Namespace) -> int:
+    falhas = 0
+    consultas = consultas_do_arquivo()
+    try:
+        async with AsyncSessionLocal() as db:
+            totais = dict((await db.execute(_TOTAL_PARTICOES)).tuples().all())
+            conexao = await db.connection()
+            for numero in CONSULTAS:
+                result = await conexao.exec_driver_sql(f"EXPLAIN (ANALYZE, FORMAT JSON) {consultas[numero]}")
+                plano = result.scalar_one()
+                plano = (json.loads(plano) if isinstance(plano, str) else plano)[0]
+                lidas, removidas = {}, []
+                particoes_lidas(plano["Plan"], lidas, removidas)
+                # Sem poda, o plano lê todas as partições e nada é removido
+                ok = bool(lidas) and all(len(lidas[t]) < totais[t] for t in lidas)
+                falhas += not ok
+                detalhes = ", ".join(f"{t}: {len(p)} de {totais[t]} partições" for t, p in sorted(lidas.items()))
+                print(
+                    f"{'OK   ' if ok else 'FALHA'} consulta {numero:2d}  {detalhes or 'nenhuma partição lida'}  "
+                    f"(removidas na execução: {sum(removidas)})  {plano['Execution Time']:.3f} ms"
+                )
+                if args.planos:
+                    print(json.dumps(plano["Plan"], indent=2, ensure_ascii=False))
+    finally:
+        await async_engine.dispose()
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--planos", action="store_true", help="Imprime os planos completos")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark do prontuário completo: documento aninhado x obter_prontuario_completo
+
+Cria pacientes sintéticos com históricos de tamanhos crescentes (atendimentos,
+prescrições e exames por atendimento, vacinações) e compara, para cada um, o
+número de linhas lidas e a latência mediana da função PL/pgSQL
+obter_prontuario_completo (sql/queries/consultas_otimizadas.sql, criada
+temporariamente se não existir) com as do serviço usado por
+GET /prontuarios/completo. Os dados criados são removidos ao final.
+
+Uso (a partir do diretório backend, com o PostgreSQL local populado):
+
+    python -m benchmarks.prontuario_completo --repeticoes 20
+"""
+
+import argparse
+import asyncio
+import re
+import statistics
+import time
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.db.session import AsyncSessionLocal, async_engine
+from app.services import prontuario_completo
+
+PREFIXO_CHAVE = "BENCH-PRONT-"
+ARQUIVO_FUNCAO = Path(__file__).resolve().parents[2] / "sql" / "queries" / "consultas_otimizadas.sql"
+
+# (atendimentos, prescrições por atendimento, exames por atendimento, vacinações)
+CENARIOS = ((10, 2, 1, 10), (50, 3, 2, 20), (200, 3, 2, 40))
+
+_CRIAR_PACIENTE = text("""
+    WITH p AS (
+        INSERT INTO pacientes (nome, cpf, data_nascimento, sexo, sus_numero)
+        VALUES ('Paciente Benchmark', :chave, DATE '1970-01-01', 'F', :chave)
+        RETURNING paciente_id
+    ), pr AS (
+        INSERT INTO prontuarios (paciente_id, estabelecimento_id)
+        SELECT paciente_id, :estabelecimento FROM p
+        RETURNING prontuario_id
+    )
+    INSERT INTO atendimentos (prontuario_id, funcionario_id, data_atendimento, tipo_atendimento, diagnostico)
+    SELECT pr.prontuario_id, :funcionario, TIMESTAMP '2020-01-01' + g * INTERVAL '1 day', 'Consulta', 'Diagnóstico ' || g
+    FROM pr, generate_series(1, :atendimentos) g
+""")
+
+_ATENDIMENTOS_PACIENTE = """
+    SELECT a.atendimento_id, a.data_atendimento
+    FROM atendimentos a
+    JOIN prontuarios pr ON pr.prontuario_id = a.prontuario_id
+    JOIN pacientes p ON p.paciente_id = pr.paciente_id
+    WHERE p.cpf = :chave
+"""
+
+_CRIAR_PRESCRICOES = text(f"""
+    INSERT INTO prescricoes (atendimento_id, medicamento_id, dosagem, frequencia, duracao)
+    SELECT a.atendimento_id, :medicamento, '1 comprimido', '8 em 8 horas', g || ' dias'
+    FROM ({_ATENDIMENTOS_PACIENTE}) a, generate_series(1, :quantidade) g
+""")
+
+_CRIAR_EXAMES = text(f"""
+    INSERT INTO exames (atendimento_id, tipo_exame, data_solicitacao, funcionario_solicitante)
+    SELECT a.atendimento_id, 'Exame ' || g, a.data_atendimento, :funcionario
+    FROM ({_ATENDIMENTOS_PACIENTE}) a, generate_series(1, :quantidade) g
+""")
+
+_CRIAR_VACINACOES = text("""
+    INSERT INTO carteira_vacinacao (paciente_id, vacina_id, funcionario_id, estabelecimento_id, data_aplicacao, dose)
+    SELECT p.paciente_id, :vacina, :funcionario, :estabelecimento,
+           TIMESTAMP '2020-01-01' + g * INTERVAL '7 days', 'bench-pront-' || g
+    FROM pacientes p, generate_series(1, :quantidade) g
+    WHERE p.cpf = :chave
+""")
+
+# Remoção na ordem das chaves estrangeiras
+_REMOVER = [
+    f"DELETE FROM exames WHERE atendimento_id IN (SELECT atendimento_id FROM ({_ATENDIMENTOS_PACIENTE}) a)",
+    f"DELETE FROM prescricoes WHERE atendimento_id IN (SELECT atendimento_id FROM ({_ATENDIMENTOS_PACIENTE}) a)",
+    "DELETE FROM atendimentos WHERE prontuario_id IN "
+    "(SELECT prontuario_id FROM prontuarios pr JOIN pacientes p USING (paciente_id) WHERE p.cpf = :chave)",
+    "DELETE FROM prontuarios WHERE paciente_id IN (SELECT paciente_id FROM pacientes WHERE cpf = :chave)",
+    "DELETE FROM carteira_vacinacao WHERE paciente_id IN (SELECT paciente_id FROM pacientes WHERE cpf = :chave)",
+    "DELETE FROM resumo_pacientes WHERE paciente_id IN (SELECT paciente_id FROM pacientes WHERE cpf = :chave)",
+    "DELETE FROM pacientes WHERE cpf = :chave",
+]
+
+
+async def criar_funcao() -> bool:
+    """
+    Cria obter_prontuario_completo a partir do arquivo de consultas, se não existir.
+    Retorna True se a função foi criada aqui (e deve ser removida ao final).
+    """
+    async with async_engine.begin() as conexao:
+        existe = (await conexao.execute(
+            text("SELECT to_regprocedure('obter_prontuario_completo(varchar)') IS NOT NULL")
+        )).scalar()
+        if existe:
+            return False
+        definicao = re.search(
+            r"CREATE OR REPLACE FUNCTION obter_prontuario_completo.*?\$\$ LANGUAGE plpgsql;",
+            ARQUIVO_FUNCAO.read_text(encoding="utf-8"),
+            re.DOTALL,
+        ).group(0)
+        await conexao.exec_driver_sql(definicao)
+        return True
+
+
+async def criar_historico(chave: str, atendimentos: int, prescricoes: int, exames: int, vacinacoes: int):
+    async with AsyncSessionLocal() as db:
+        referencias = (await db.execute(text("""
+            SELECT
+                (SELECT estabelecimento_id FROM estabelecimentos LIMIT 1) AS estabelecimento,
+                (SELECT funcionario_id FROM funcionarios LIMIT 1) AS funcionario,
+                (SELECT medicamento_id FROM medicamentos LIMIT 1) AS medicamento,
+                (SELECT vacina_id FROM vacinas LIMIT 1) AS vacina
+        """))).mappings().one()
+        await db.execute(_CRIAR_PACIENTE, {
+            "chave": chave,
+            "estabelecimento": referencias["estabelecimento"],
+            "funcionario": referencias["funcionario"],
+            "atendimentos": atendimentos,
+        })
+        await db.execute(_CRIAR_PRESCRICOES, {
+            "chave": chave, "medicamento": referencias["medicamento"], "quantidade": prescricoes,
+        })
+        await db.execute(_CRIAR_EXAMES, {
+            "chave": chave, "funcionario": referencias["funcionario"], "quantidade": exames,
+        })
+        await db.execute(_CRIAR_VACINACOES, {
+            "chave": chave,
+            "vacina": referencias["vacina"],
+            "funcionario": referencias["funcionario"],
+            "estabelecimento": referencias["estabelecimento"],
+            "quantidade": vacinacoes,
+        })
+        await db.commit()
+
+
+async def remover_historico(chave: str):
+    async with AsyncSessionLocal() as db:
+        for comando in _REMOVER:
+            await db.execute(text(comando), {"chave": chave})
+        await db.commit()
+
+
+async def medir(consulta, repeticoes: int):
+    """
+    Retorna a latência mediana (milissegundos) e o número de linhas lidas.
+    """
+    duracoes = []
+    for _ in range(repeticoes):
+        async with AsyncSessionLocal() as db:
+            inicio = time.perf_counter()
+            linhas = await consulta(db)
+            duracoes.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(duracoes), linhas
+
+
+async def main(args: argparse.Namespace):
+    funcao_criada = await criar_funcao()
+    try:
+        for indice, (atendimentos, prescricoes, exames, vacinacoes) in enumerate(CENARIOS, start=1):
+            chave = f"{PREFIXO_CHAVE}{indice:02d}"
+            await criar_historico(chave, atendimentos, prescricoes, exames, vacinacoes)
+            try:
+                async def consultar_funcao(db):
+                    result = await db.execute(text("SELECT * FROM obter_prontuario_completo(:cpf)"), {"cpf": chave})
+                    return len(result.all())
+
+                async def consultar_documento(db):
+                    documento = await prontuario_completo.obter_prontuario_completo(
+                        db, "cpf", chave,
+                        limite_atendimentos=atendimentos, limite_vacinacoes=vacinacoes,
+                    )
+                    return 1 + len(documento["atendimentos"]) + len(documento["vacinacoes"]) + sum(
+                        len(a["prescricoes"]) + len(a["exames"]) for a in documento["atendimentos"]
+                    )
+
+                ms_funcao, linhas_funcao = await medir(consultar_funcao, args.repeticoes)
+                ms_documento, linhas_documento = await medir(consultar_documento, args.repeticoes)
+                print(
+                    f"{atendimentos} atendimentos x {prescricoes} prescrições x {exames} exames, {vacinacoes} vacinações\n"
+                    f"  função:    {linhas_funcao:7d} linhas  {ms_funcao:8.2f} ms\n"
+                    f"  documento: {linhas_documento:7d} linhas  {ms_documento:8.2f} ms ({ms_funcao / ms_documento:.1f}x)"
+                )
+            finally:
+                await remover_historico(chave)
+    finally:
+        if funcao_criada:
+            async with async_engine.begin() as conexao:
+                await conexao.exec_driver_sql("DROP FUNCTION obter_prontuario_completo(varchar)")
+        await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark do custo por linha da serialização da carteira de vacinação
+
+Compara, sem banco de dados, os dois caminhos de serialização de uma listagem:
+
+- antigo: objeto ORM por linha, ``CarteiraVacinacaoCompleta(**vacinacao.__dict__, ...)``
+  e nova validação pelo response_model do FastAPI, seguida de jsonable_encoder/json.dumps;
+- atual: linhas projetadas (mapeamentos) validadas uma única vez por um TypeAdapter
+  e serializadas diretamente em bytes JSON.
+
+Uso (a partir do diretório backend):
+
+    python -m benchmarks.serializacao_carteira --linhas 1000 --repeticoes 20
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.endpoints.vacinacao import _carteira_completa_adapter
+from app.api.respostas import resposta_json
+from app.db.models.carteira_vacinacao import CarteiraVacinacao
+from app.schemas.carteira_vacinacao import CarteiraVacinacaoCompleta
+
+NOMES = {
+    "nome_paciente": "Maria Silva",
+    "nome_vacina": "Coronavac",
+    "nome_estabelecimento": "UBS Vila Mariana",
+    "tipo_estabelecimento": "POSTO",
+    "nome_funcionario": "Enfermeira Patrícia Souza",
+}
+
+
+def gerar_linhas(total: int):
+    """
+    Gera as linhas nos dois formatos: (objeto ORM, nomes) e mapeamento projetado.
+    """
+    orm, mapeamentos = [], []
+    base = datetime(2023, 1, 1)
+    for i in range(total):
+        colunas = {
+            "vacinacao_id": uuid.uuid4(),
+            "paciente_id": uuid.uuid4(),
+            "vacina_id": uuid.uuid4(),
+            "funcionario_id": uuid.uuid4(),
+            "estabelecimento_id": uuid.uuid4(),
+            "data_aplicacao": base + timedelta(hours=i),
+            "dose": "1ª Dose",
+            "observacoes": None,
+            "data_cadastro": base,
+        }
+        orm.append((CarteiraVacinacao(**colunas), NOMES))
+        mapeamentos.append({**colunas, **NOMES})
+    return orm, mapeamentos
+
+
+async def caminho_antigo(linhas, campo) -> bytes:
+    vacinacoes = []
+    for vacinacao, nomes in linhas:
+        vacinacoes.append(CarteiraVacinacaoCompleta(**vacinacao.__dict__, **nomes))
+    conteudo = await serialize_response(field=campo, response_content=vacinacoes)
+    return JSONResponse(conteudo).body
+
+
+async def caminho_atual(linhas, campo) -> bytes:
+    return resposta_json(_carteira_completa_adapter, linhas).body
+
+
+async def medir(funcao, linhas, campo, repeticoes: int) -> float:
+    """
+    Retorna o melhor tempo por linha (microssegundos) entre as repetições.
+    """
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        await funcao(linhas, campo)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor / len(linhas) * 1e6
+
+
+async def main(args: argparse.Namespace):
+    campo = create_response_field(name="response", type_=List[CarteiraVacinacaoCompleta])
+    orm, mapeamentos = gerar_linhas(args.linhas)
+
+    antigo = await medir(caminho_antigo, orm, campo, args.repeticoes)
+    atual = await medir(caminho_atual, mapeamentos, campo, args.repeticoes)
+
+    print(f"antigo: {antigo:8.2f} µs/linha")
+    print(f"atual:  {atual:8.2f} µs/linha ({antigo / atual:.1f}x mais rápido)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--linhas", type=int, default=1000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
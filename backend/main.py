@@ -5,13 +5,25 @@
 Aplicação principal do Sistema de Compartilhamento de Dados de Pacientes do SUS
 """
 
+import asyncio
+import time
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
 
+from app.core.cache import estatisticas_caches
 from app.core.config import settings
 from app.api.api import api_router
-from app.db.session import create_tables
+from app.core.instrumentacao import MiddlewareInstrumentacao
+from app.core.metricas import TIPO_CONTEUDO, texto_prometheus
+from app.db.session import async_engine, create_tables, estatisticas_pools
+from app.services.auditoria import registro_auditoria
+from app.services.invalidacao_cache import ouvinte_alteracoes
+from app.services.particoes import manutencao_particoes
+from app.services.resumo_prontuarios import atualizador_resumo
 
 # Inicialização da aplicação FastAPI
 app = FastAPI(
@@ -30,8 +42,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Content-Disposition", "ETag", "Server-Timing"],
 )
 
+# Tempos de cada requisição (banco, serialização, handler) no cabeçalho Server-Timing
+# e no log; adicionado por último, envolve os demais middlewares
+app.add_middleware(MiddlewareInstrumentacao)
+
 # Inclusão dos endpoints da API
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -42,6 +59,25 @@ async def startup_event():
     Executa ações necessárias na inicialização da aplicação
     """
     create_tables()
+    if settings.CACHE_INVALIDACAO_NOTIFY:
+        ouvinte_alteracoes.iniciar()
+    atualizador_resumo.iniciar()
+    manutencao_particoes.iniciar()
+    if settings.AUDITORIA_HABILITADA:
+        registro_auditoria.iniciar()
+
+
+# Evento de encerramento da aplicação
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Executa ações necessárias no encerramento da aplicação
+    """
+    await ouvinte_alteracoes.parar()
+    await atualizador_resumo.parar()
+    await manutencao_particoes.parar()
+    # Grava os acessos ainda na fila antes de encerrar
+    await registro_auditoria.parar()
 
 
 # Rota raiz para verificação de saúde da API
@@ -56,6 +92,43 @@ async def health_check():
     }
 
 
+async def _verificar_banco():
+    async with async_engine.connect() as conexao:
+        await conexao.execute(text("SELECT 1"))
+
+
+# Sonda de prontidão: a API só está pronta para receber tráfego se o banco responder
+@app.get("/ready")
+async def readiness_check():
+    """
+    Verifica a conexão com o banco (SELECT 1 por uma conexão do pool), com tempo
+    máximo de PRONTIDAO_TIMEOUT segundos, incluída a espera por uma conexão livre.
+    Responde 503 se o banco não responder a tempo ou falhar.
+    """
+    inicio = time.perf_counter()
+    try:
+        await asyncio.wait_for(_verificar_banco(), timeout=settings.PRONTIDAO_TIMEOUT)
+    except Exception as erro:
+        motivo = "timeout" if isinstance(erro, asyncio.TimeoutError) else type(erro).__name__
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "indisponivel", "banco": motivo},
+        )
+    return {"status": "pronto", "banco": "ok", "latencia_ms": round((time.perf_counter() - inicio) * 1000, 3)}
+
+
+# Métricas do processo (requisições, pools de conexões e caches) para o Prometheus
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Retorna as métricas do processo no formato de texto do Prometheus. Com vários
+    workers, cada um expõe as suas.
+    """
+    return Response(
+        content=texto_prometheus(estatisticas_pools(), estatisticas_caches()), media_type=TIPO_CONTEUDO
+    )
+
+
 # Execução da aplicação em modo de desenvolvimento
 if __name__ == "__main__":
     uvicorn.run(
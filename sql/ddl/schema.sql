@@ -4,18 +4,30 @@
 -- Extensão para UUID (identificadores únicos universais)
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Extensões para busca aproximada por nome (trigramas) sem diferenciar acentos
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+-- unaccent() é STABLE (depende do dicionário configurado) e não pode ser usada em
+-- índices; esta versão fixa o dicionário e pode ser declarada IMMUTABLE
+CREATE OR REPLACE FUNCTION sem_acento(texto TEXT) RETURNS TEXT AS $$
+    SELECT public.unaccent('public.unaccent'::regdictionary, texto)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+
 -- Tabela de Pacientes
 CREATE TABLE pacientes (
     paciente_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
     nome VARCHAR(100) NOT NULL,
-    cpf VARCHAR(14) UNIQUE NOT NULL,
+    -- CPF e número do SUS são gravados normalizados (app.core.documentos), de modo que
+    -- as buscas usam diretamente os índices das restrições UNIQUE
+    cpf VARCHAR(14) UNIQUE NOT NULL CONSTRAINT pacientes_cpf_formato CHECK (cpf ~ '^\d{3}\.\d{3}\.\d{3}-\d{2}$'),
     data_nascimento DATE NOT NULL,
     sexo CHAR(1) CHECK (sexo IN ('M', 'F', 'O')),
     endereco VARCHAR(200),
     telefone VARCHAR(20),
     email VARCHAR(100),
     tipo_sanguineo VARCHAR(3),
-    sus_numero VARCHAR(20) UNIQUE NOT NULL,
+    sus_numero VARCHAR(20) UNIQUE NOT NULL CONSTRAINT pacientes_sus_numero_formato CHECK (sus_numero ~ '^\d{15}$'),
     data_cadastro TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     ultima_atualizacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -46,6 +58,7 @@ CREATE TABLE funcionarios (
     telefone VARCHAR(20),
     email VARCHAR(100),
     ativo BOOLEAN DEFAULT TRUE,
+    senha_hash VARCHAR(60), -- bcrypt; sem senha, o funcionário não pode entrar na API
     data_cadastro TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     ultima_atualizacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -59,17 +72,19 @@ CREATE TABLE prontuarios (
     ultima_atualizacao TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
--- Tabela de Atendimentos
+-- Tabela de Atendimentos, particionada por mês de atendimento (ver PARTICIONAMENTO).
+-- A chave primária de uma tabela particionada inclui a coluna de particionamento
 CREATE TABLE atendimentos (
-    atendimento_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    atendimento_id UUID NOT NULL DEFAULT uuid_generate_v4(),
     prontuario_id UUID NOT NULL REFERENCES prontuarios(prontuario_id),
     funcionario_id UUID NOT NULL REFERENCES funcionarios(funcionario_id),
     data_atendimento TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     tipo_atendimento VARCHAR(50) NOT NULL,
     descricao TEXT,
     diagnostico TEXT,
-    observacoes TEXT
-);
+    observacoes TEXT,
+    PRIMARY KEY (atendimento_id, data_atendimento)
+) PARTITION BY RANGE (data_atendimento);
 
 -- Tabela de Vacinas
 CREATE TABLE vacinas (
@@ -91,7 +106,9 @@ CREATE TABLE carteira_vacinacao (
     data_aplicacao TIMESTAMP NOT NULL,
     dose VARCHAR(20) NOT NULL,
     observacoes TEXT,
-    data_cadastro TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    data_cadastro TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Impede registrar duas vezes a mesma dose de uma vacina, inclusive sob concorrência
+    CONSTRAINT uq_carteira_vacinacao_paciente_vacina_dose UNIQUE (paciente_id, vacina_id, dose)
 );
 
 -- Tabela de Medicamentos
@@ -106,7 +123,8 @@ CREATE TABLE medicamentos (
 -- Tabela de Prescrições
 CREATE TABLE prescricoes (
     prescricao_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    atendimento_id UUID NOT NULL REFERENCES atendimentos(atendimento_id),
+    -- Referência a atendimentos verificada por gatilho (ver PARTICIONAMENTO)
+    atendimento_id UUID NOT NULL,
     medicamento_id UUID NOT NULL REFERENCES medicamentos(medicamento_id),
     dosagem VARCHAR(50) NOT NULL,
     frequencia VARCHAR(50) NOT NULL,
@@ -118,7 +136,8 @@ CREATE TABLE prescricoes (
 -- Tabela de Exames
 CREATE TABLE exames (
     exame_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    atendimento_id UUID NOT NULL REFERENCES atendimentos(atendimento_id),
+    -- Referência a atendimentos verificada por gatilho (ver PARTICIONAMENTO)
+    atendimento_id UUID NOT NULL,
     tipo_exame VARCHAR(100) NOT NULL,
     resultado TEXT,
     data_solicitacao TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
@@ -128,24 +147,29 @@ CREATE TABLE exames (
     observacoes TEXT
 );
 
--- Tabela de Histórico de Acesso aos Prontuários
+-- Tabela de Histórico de Acesso aos dados dos pacientes (somente inserções), particionada
+-- por mês. O prontuário é informado quando o acesso é a um prontuário específico; o
+-- funcionário, quando o acesso é autenticado.
 CREATE TABLE historico_acesso (
-    acesso_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    prontuario_id UUID NOT NULL REFERENCES prontuarios(prontuario_id),
-    funcionario_id UUID NOT NULL REFERENCES funcionarios(funcionario_id),
+    acesso_id UUID NOT NULL DEFAULT uuid_generate_v4(),
+    paciente_id UUID NOT NULL REFERENCES pacientes(paciente_id),
+    prontuario_id UUID REFERENCES prontuarios(prontuario_id),
+    funcionario_id UUID REFERENCES funcionarios(funcionario_id),
     data_acesso TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     tipo_acesso VARCHAR(50) NOT NULL,
     ip_acesso VARCHAR(50),
-    observacoes TEXT
-);
+    observacoes TEXT,
+    PRIMARY KEY (acesso_id, data_acesso)
+) PARTITION BY RANGE (data_acesso);
 
 -- Índices para melhorar performance das consultas
 
--- Índice para busca de pacientes por CPF
-CREATE INDEX idx_pacientes_cpf ON pacientes(cpf);
+-- As buscas de pacientes por CPF e por número do SUS usam os índices das restrições
+-- UNIQUE (pacientes_cpf_key e pacientes_sus_numero_key); índices adicionais nessas
+-- colunas só encareceriam as escritas
 
--- Índice para busca de pacientes por número do SUS
-CREATE INDEX idx_pacientes_sus ON pacientes(sus_numero);
+-- Índice para a listagem de pacientes por nome (paginação por chave)
+CREATE INDEX idx_pacientes_nome_id ON pacientes(nome, paciente_id);
 
 -- Índice para busca de funcionários por registro profissional
 CREATE INDEX idx_funcionarios_registro ON funcionarios(registro_profissional);
@@ -153,8 +177,24 @@ CREATE INDEX idx_funcionarios_registro ON funcionarios(registro_profissional);
 -- Índice para busca rápida de atendimentos por data
 CREATE INDEX idx_atendimentos_data ON atendimentos(data_atendimento);
 
--- Índice para busca rápida de vacinações por paciente
-CREATE INDEX idx_vacinacao_paciente ON carteira_vacinacao(paciente_id);
+-- A busca de vacinações por paciente usa idx_vacinacao_paciente_data_id (abaixo) e a
+-- restrição única (paciente_id, vacina_id, dose); um índice só em paciente_id seria
+-- redundante e apenas encareceria as inserções
+
+-- Índices para paginação por chave (cursor) das listagens, na mesma ordem do ORDER BY
+CREATE INDEX idx_vacinacao_data_id ON carteira_vacinacao(data_aplicacao, vacinacao_id);
+CREATE INDEX idx_vacinacao_paciente_data_id ON carteira_vacinacao(paciente_id, data_aplicacao, vacinacao_id);
+CREATE INDEX idx_estabelecimentos_nome_id ON estabelecimentos(nome, estabelecimento_id);
+CREATE INDEX idx_estabelecimentos_tipo_nome_id ON estabelecimentos(tipo, nome, estabelecimento_id);
+CREATE INDEX idx_vacinas_nome_id ON vacinas(nome, vacina_id);
+CREATE INDEX idx_funcionarios_nome_id ON funcionarios(nome, funcionario_id);
+
+-- Índices de trigramas para a busca por nome (qualquer trecho, com erros de digitação
+-- e sem diferenciar acentos); a expressão deve ser a mesma usada nas consultas
+CREATE INDEX idx_vacinas_nome_trgm ON vacinas USING gin (sem_acento(nome) gin_trgm_ops);
+CREATE INDEX idx_vacinas_fabricante_trgm ON vacinas USING gin (sem_acento(fabricante) gin_trgm_ops);
+CREATE INDEX idx_pacientes_nome_trgm ON pacientes USING gin (sem_acento(nome) gin_trgm_ops);
+CREATE INDEX idx_estabelecimentos_nome_trgm ON estabelecimentos USING gin (sem_acento(nome) gin_trgm_ops);
 
 -- Índice para busca rápida de prontuários por paciente
 CREATE INDEX idx_prontuarios_paciente ON prontuarios(paciente_id);
@@ -162,6 +202,375 @@ CREATE INDEX idx_prontuarios_paciente ON prontuarios(paciente_id);
 -- Índice para busca rápida de atendimentos por prontuário
 CREATE INDEX idx_atendimentos_prontuario ON atendimentos(prontuario_id);
 
+-- Índices para o histórico de acesso por período e por paciente (auditoria)
+CREATE INDEX idx_historico_acesso_data ON historico_acesso(data_acesso);
+CREATE INDEX idx_historico_acesso_paciente ON historico_acesso(paciente_id, data_acesso);
+
+-- Índice para as prescrições dos atendimentos (prontuário completo)
+CREATE INDEX idx_prescricoes_atendimento ON prescricoes(atendimento_id);
+
+-- Notificação (NOTIFY) das alterações nos dados de referência, para que cada processo
+-- da API descarte as entradas afetadas do seu cache em memória. O argumento do gatilho
+-- é a coluna da chave primária; o conteúdo é {"tabela", "operacao", "id"}.
+CREATE OR REPLACE FUNCTION notificar_alteracao_referencia() RETURNS TRIGGER AS $$
+DECLARE
+    registro JSONB;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        registro := to_jsonb(OLD);
+    ELSE
+        registro := to_jsonb(NEW);
+    END IF;
+    PERFORM pg_notify('alteracoes_referencia', json_build_object(
+        'tabela', TG_TABLE_NAME,
+        'operacao', TG_OP,
+        'id', registro ->> TG_ARGV[0]
+    )::text);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_vacinas_notificar
+    AFTER INSERT OR UPDATE OR DELETE ON vacinas
+    FOR EACH ROW EXECUTE FUNCTION notificar_alteracao_referencia('vacina_id');
+CREATE TRIGGER trg_estabelecimentos_notificar
+    AFTER INSERT OR UPDATE OR DELETE ON estabelecimentos
+    FOR EACH ROW EXECUTE FUNCTION notificar_alteracao_referencia('estabelecimento_id');
+CREATE TRIGGER trg_funcionarios_notificar
+    AFTER INSERT OR UPDATE OR DELETE ON funcionarios
+    FOR EACH ROW EXECUTE FUNCTION notificar_alteracao_referencia('funcionario_id');
+
+----------------------------------------------
+-- PARTICIONAMENTO
+----------------------------------------------
+
+-- atendimentos e historico_acesso têm uma partição por mês (tabela_AAAA_MM), sem partição
+-- padrão: assim, consultas com filtro de data leem só as partições do período. Gravar uma
+-- data sem partição é um erro; a API cria as partições dos próximos meses periodicamente
+-- (manter_particoes) e as partições de meses anteriores são criadas com criar_particao_mensal.
+
+-- Partições antigas desanexadas por manter_particoes, fora das consultas, até serem
+-- exportadas e removidas
+CREATE SCHEMA IF NOT EXISTS arquivo;
+
+-- Cria a partição do mês de p_mes, se não existir, e retorna seu nome (ou NULL). Ela é criada
+-- como tabela avulsa e anexada com ATTACH PARTITION, que bloqueia a tabela principal com
+-- SHARE UPDATE EXCLUSIVE (leituras e escritas continuam), ao contrário de CREATE TABLE
+-- ... PARTITION OF, que exige ACCESS EXCLUSIVE. Índices e gatilhos são herdados no ATTACH.
+CREATE OR REPLACE FUNCTION criar_particao_mensal(p_tabela TEXT, p_mes DATE) RETURNS TEXT AS $$
+DECLARE
+    inicio DATE := date_trunc('month', p_mes);
+    nome TEXT := p_tabela || '_' || to_char(p_mes, 'YYYY_MM');
+BEGIN
+    IF to_regclass(nome) IS NOT NULL THEN
+        RETURN NULL;
+    END IF;
+    EXECUTE format('CREATE TABLE %I (LIKE %I INCLUDING DEFAULTS INCLUDING CONSTRAINTS)', nome, p_tabela);
+    EXECUTE format(
+        'ALTER TABLE %I ATTACH PARTITION %I FOR VALUES FROM (%L) TO (%L)',
+        p_tabela, nome, inicio, inicio + INTERVAL '1 month'
+    );
+    RETURN nome;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Cria as partições do mês atual e dos p_meses_futuros seguintes e, se p_meses_retencao > 0,
+-- desanexa as partições de meses anteriores a esse período e as move para o schema arquivo.
+-- Retorna as partições criadas e arquivadas.
+CREATE OR REPLACE FUNCTION manter_particoes(
+    p_tabela TEXT, p_meses_futuros INTEGER, p_meses_retencao INTEGER DEFAULT 0
+) RETURNS TABLE (acao TEXT, particao TEXT) AS $$
+DECLARE
+    mes_atual DATE := date_trunc('month', LOCALTIMESTAMP);
+    nome TEXT;
+BEGIN
+    FOR deslocamento IN 0..p_meses_futuros LOOP
+        nome := criar_particao_mensal(p_tabela, (mes_atual + make_interval(months => deslocamento))::DATE);
+        IF nome IS NOT NULL THEN
+            acao := 'criada';
+            particao := nome;
+            RETURN NEXT;
+        END IF;
+    END LOOP;
+
+    IF p_meses_retencao > 0 THEN
+        FOR nome IN
+            SELECT c.relname
+            FROM pg_inherits h
+            JOIN pg_class c ON c.oid = h.inhrelid
+            WHERE h.inhparent = p_tabela::regclass
+              AND c.relname ~ ('^' || p_tabela || '_[0-9]{4}_[0-9]{2}$')
+              AND to_date(right(c.relname, 7), 'YYYY_MM') < mes_atual - make_interval(months => p_meses_retencao)
+            ORDER BY c.relname
+        LOOP
+            EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', p_tabela, nome);
+            EXECUTE format('ALTER TABLE %I SET SCHEMA arquivo', nome);
+            acao := 'arquivada';
+            particao := nome;
+            RETURN NEXT;
+        END LOOP;
+    END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Partições iniciais: atendimentos desde 2020 (inclui os dados de exemplo) e histórico de
+-- acesso desde o mês atual, ambos até três meses à frente
+SELECT criar_particao_mensal('atendimentos', mes::DATE)
+FROM generate_series(DATE '2020-01-01', LOCALTIMESTAMP + INTERVAL '3 months', INTERVAL '1 month') mes;
+SELECT manter_particoes('historico_acesso', 3);
+
+-- Uma chave estrangeira para uma tabela particionada teria de incluir data_atendimento, então
+-- a referência de prescricoes e exames a atendimentos é verificada por gatilhos: o atendimento
+-- deve existir ao gravar (e é travado com FOR KEY SHARE, como numa chave estrangeira) e não
+-- pode ser removido enquanto referenciado. Os erros usam o código e o nome de restrição que a
+-- chave estrangeira usaria.
+CREATE OR REPLACE FUNCTION verificar_referencia_atendimento() RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM 1 FROM atendimentos WHERE atendimento_id = NEW.atendimento_id FOR KEY SHARE;
+    IF NOT FOUND THEN
+        RAISE EXCEPTION 'Atendimento % não encontrado', NEW.atendimento_id
+            USING ERRCODE = 'foreign_key_violation',
+                  CONSTRAINT = TG_TABLE_NAME || '_atendimento_id_fkey',
+                  TABLE = TG_TABLE_NAME;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Verificada ao fim da transação, pois mudar data_atendimento move a linha de partição
+-- (uma remoção seguida de inserção)
+CREATE OR REPLACE FUNCTION impedir_remocao_atendimento_referenciado() RETURNS TRIGGER AS $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM atendimentos WHERE atendimento_id = OLD.atendimento_id)
+       AND (EXISTS (SELECT 1 FROM prescricoes WHERE atendimento_id = OLD.atendimento_id)
+            OR EXISTS (SELECT 1 FROM exames WHERE atendimento_id = OLD.atendimento_id)) THEN
+        RAISE EXCEPTION 'Atendimento % ainda é referenciado por prescrições ou exames', OLD.atendimento_id
+            USING ERRCODE = 'foreign_key_violation',
+                  CONSTRAINT = 'atendimentos_referenciado',
+                  TABLE = 'atendimentos';
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trg_prescricoes_atendimento AFTER INSERT OR UPDATE OF atendimento_id ON prescricoes
+    FOR EACH ROW EXECUTE FUNCTION verificar_referencia_atendimento();
+CREATE TRIGGER trg_exames_atendimento AFTER INSERT OR UPDATE OF atendimento_id ON exames
+    FOR EACH ROW EXECUTE FUNCTION verificar_referencia_atendimento();
+CREATE CONSTRAINT TRIGGER trg_atendimentos_referenciado
+    AFTER DELETE OR UPDATE OF atendimento_id ON atendimentos
+    DEFERRABLE INITIALLY DEFERRED
+    FOR EACH ROW EXECUTE FUNCTION impedir_remocao_atendimento_referenciado();
+
+----------------------------------------------
+-- RESUMO DOS PRONTUÁRIOS
+----------------------------------------------
+
+-- Índice para contar os exames dos atendimentos de um paciente
+CREATE INDEX idx_exames_atendimento ON exames(atendimento_id);
+
+-- View materializada com o resumo de cada paciente (uma linha por paciente; o prontuário
+-- é o mais recente). Cada contagem é agregada separadamente, sem o produto cartesiano
+-- entre atendimentos, vacinações e exames. Atualizada periodicamente pela API com
+-- REFRESH MATERIALIZED VIEW CONCURRENTLY, que exige o índice único em paciente_id.
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_resumo_prontuarios AS
+WITH prontuario_recente AS (
+    SELECT DISTINCT ON (paciente_id) paciente_id, prontuario_id
+    FROM prontuarios
+    ORDER BY paciente_id, data_criacao DESC, prontuario_id
+),
+totais_atendimentos AS (
+    SELECT pr.paciente_id, COUNT(*) AS total_atendimentos, MAX(a.data_atendimento) AS ultimo_atendimento
+    FROM atendimentos a
+    JOIN prontuarios pr ON a.prontuario_id = pr.prontuario_id
+    GROUP BY pr.paciente_id
+),
+totais_vacinas AS (
+    SELECT paciente_id, COUNT(*) AS total_vacinas
+    FROM carteira_vacinacao
+    GROUP BY paciente_id
+),
+totais_exames AS (
+    SELECT pr.paciente_id, COUNT(*) AS total_exames
+    FROM exames ex
+    JOIN atendimentos a ON ex.atendimento_id = a.atendimento_id
+    JOIN prontuarios pr ON a.prontuario_id = pr.prontuario_id
+    GROUP BY pr.paciente_id
+)
+SELECT
+    p.paciente_id,
+    p.nome,
+    p.cpf,
+    p.sus_numero,
+    p.data_nascimento,
+    p.tipo_sanguineo,
+    rec.prontuario_id,
+    COALESCE(ta.total_atendimentos, 0) AS total_atendimentos,
+    ta.ultimo_atendimento,
+    COALESCE(tv.total_vacinas, 0) AS total_vacinas,
+    COALESCE(te.total_exames, 0) AS total_exames
+FROM pacientes p
+JOIN prontuario_recente rec ON rec.paciente_id = p.paciente_id
+LEFT JOIN totais_atendimentos ta ON ta.paciente_id = p.paciente_id
+LEFT JOIN totais_vacinas tv ON tv.paciente_id = p.paciente_id
+LEFT JOIN totais_exames te ON te.paciente_id = p.paciente_id
+WITH DATA;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_resumo_prontuarios_paciente_id ON mv_resumo_prontuarios(paciente_id);
+CREATE INDEX IF NOT EXISTS idx_mv_resumo_prontuarios_cpf ON mv_resumo_prontuarios(cpf);
+CREATE INDEX IF NOT EXISTS idx_mv_resumo_prontuarios_sus ON mv_resumo_prontuarios(sus_numero);
+
+-- Momento da última atualização de cada view materializada (registrado pela API)
+CREATE TABLE atualizacoes_visoes (
+    visao VARCHAR(100) PRIMARY KEY,
+    atualizada_em TIMESTAMP NOT NULL,
+    duracao_ms INTEGER NOT NULL
+);
+
+-- Totais por paciente mantidos incrementalmente pelos gatilhos abaixo, para resumos em
+-- tempo real sem recalcular a view. Pacientes sem linha têm todos os totais zerados.
+CREATE TABLE resumo_pacientes (
+    paciente_id UUID PRIMARY KEY REFERENCES pacientes(paciente_id) ON DELETE CASCADE,
+    total_atendimentos INTEGER NOT NULL DEFAULT 0,
+    ultimo_atendimento TIMESTAMP,
+    total_vacinas INTEGER NOT NULL DEFAULT 0,
+    total_exames INTEGER NOT NULL DEFAULT 0,
+    atualizado_em TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Os gatilhos são por comando (FOR EACH STATEMENT) e usam as tabelas de transição, então uma
+-- importação em lote faz um único UPSERT por comando, agregado por paciente. As somas são
+-- feitas sobre o valor atual da linha (total = total + n), o que é seguro com escritas
+-- concorrentes. As linhas são travadas na ordem de paciente_id para evitar deadlocks.
+CREATE OR REPLACE FUNCTION resumo_pacientes_atendimentos() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE resumo_pacientes r SET
+            total_atendimentos = r.total_atendimentos - d.quantidade,
+            -- Só é preciso recalcular o último atendimento se ele foi removido ou alterado
+            ultimo_atendimento = CASE WHEN d.mais_recente >= r.ultimo_atendimento THEN (
+                SELECT MAX(a.data_atendimento)
+                FROM atendimentos a
+                JOIN prontuarios pr ON a.prontuario_id = pr.prontuario_id
+                WHERE pr.paciente_id = r.paciente_id
+            ) ELSE r.ultimo_atendimento END,
+            atualizado_em = LOCALTIMESTAMP
+        FROM (
+            SELECT pr.paciente_id, COUNT(*) AS quantidade, MAX(o.data_atendimento) AS mais_recente
+            FROM antigas o
+            JOIN prontuarios pr ON o.prontuario_id = pr.prontuario_id
+            GROUP BY pr.paciente_id
+            ORDER BY pr.paciente_id
+        ) d
+        WHERE r.paciente_id = d.paciente_id;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        INSERT INTO resumo_pacientes AS r (paciente_id, total_atendimentos, ultimo_atendimento, atualizado_em)
+        SELECT pr.paciente_id, COUNT(*), MAX(n.data_atendimento), LOCALTIMESTAMP
+        FROM novas n
+        JOIN prontuarios pr ON n.prontuario_id = pr.prontuario_id
+        GROUP BY pr.paciente_id
+        ORDER BY pr.paciente_id
+        ON CONFLICT (paciente_id) DO UPDATE SET
+            total_atendimentos = r.total_atendimentos + EXCLUDED.total_atendimentos,
+            ultimo_atendimento = GREATEST(r.ultimo_atendimento, EXCLUDED.ultimo_atendimento),
+            atualizado_em = EXCLUDED.atualizado_em;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION resumo_pacientes_vacinacoes() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE resumo_pacientes r SET
+            total_vacinas = r.total_vacinas - d.quantidade,
+            atualizado_em = LOCALTIMESTAMP
+        FROM (
+            SELECT paciente_id, COUNT(*) AS quantidade
+            FROM antigas
+            GROUP BY paciente_id
+            ORDER BY paciente_id
+        ) d
+        WHERE r.paciente_id = d.paciente_id;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        INSERT INTO resumo_pacientes AS r (paciente_id, total_vacinas, atualizado_em)
+        SELECT paciente_id, COUNT(*), LOCALTIMESTAMP
+        FROM novas
+        GROUP BY paciente_id
+        ORDER BY paciente_id
+        ON CONFLICT (paciente_id) DO UPDATE SET
+            total_vacinas = r.total_vacinas + EXCLUDED.total_vacinas,
+            atualizado_em = EXCLUDED.atualizado_em;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION resumo_pacientes_exames() RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE resumo_pacientes r SET
+            total_exames = r.total_exames - d.quantidade,
+            atualizado_em = LOCALTIMESTAMP
+        FROM (
+            SELECT pr.paciente_id, COUNT(*) AS quantidade
+            FROM antigas o
+            JOIN atendimentos a ON o.atendimento_id = a.atendimento_id
+            JOIN prontuarios pr ON a.prontuario_id = pr.prontuario_id
+            GROUP BY pr.paciente_id
+            ORDER BY pr.paciente_id
+        ) d
+        WHERE r.paciente_id = d.paciente_id;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'INSERT') THEN
+        INSERT INTO resumo_pacientes AS r (paciente_id, total_exames, atualizado_em)
+        SELECT pr.paciente_id, COUNT(*), LOCALTIMESTAMP
+        FROM novas n
+        JOIN atendimentos a ON n.atendimento_id = a.atendimento_id
+        JOIN prontuarios pr ON a.prontuario_id = pr.prontuario_id
+        GROUP BY pr.paciente_id
+        ORDER BY pr.paciente_id
+        ON CONFLICT (paciente_id) DO UPDATE SET
+            total_exames = r.total_exames + EXCLUDED.total_exames,
+            atualizado_em = EXCLUDED.atualizado_em;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Tabelas de transição não podem ser usadas em gatilhos de mais de um evento
+CREATE TRIGGER trg_atendimentos_resumo_ins AFTER INSERT ON atendimentos
+    REFERENCING NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION resumo_pacientes_atendimentos();
+CREATE TRIGGER trg_atendimentos_resumo_upd AFTER UPDATE ON atendimentos
+    REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION resumo_pacientes_atendimentos();
+CREATE TRIGGER trg_atendimentos_resumo_del AFTER DELETE ON atendimentos
+    REFERENCING OLD TABLE AS antigas
+    FOR EACH STATEMENT EXECUTE FUNCTION resumo_pacientes_atendimentos();
+
+CREATE TRIGGER trg_vacinacao_resumo_ins AFTER INSERT ON carteira_vacinacao
+    REFERENCING NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION resumo_pacientes_vacinacoes();
+CREATE TRIGGER trg_vacinacao_resumo_upd AFTER UPDATE ON carteira_vacinacao
+    REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION resumo_pacientes_vacinacoes();
+CREATE TRIGGER trg_vacinacao_resumo_del AFTER DELETE ON carteira_vacinacao
+    REFERENCING OLD TABLE AS antigas
+    FOR EACH STATEMENT EXECUTE FUNCTION resumo_pacientes_vacinacoes();
+
+CREATE TRIGGER trg_exames_resumo_ins AFTER INSERT ON exames
+    REFERENCING NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION resumo_pacientes_exames();
+CREATE TRIGGER trg_exames_resumo_upd AFTER UPDATE ON exames
+    REFERENCING OLD TABLE AS antigas NEW TABLE AS novas
+    FOR EACH STATEMENT EXECUTE FUNCTION resumo_pacientes_exames();
+CREATE TRIGGER trg_exames_resumo_del AFTER DELETE ON exames
+    REFERENCING OLD TABLE AS antigas
+    FOR EACH STATEMENT EXECUTE FUNCTION resumo_pacientes_exames();
+
 -- Comentários nas tabelas
 COMMENT ON TABLE pacientes IS 'Armazena informações dos pacientes do SUS';
 COMMENT ON TABLE estabelecimentos IS 'Armazena informações dos postos de saúde e hospitais';
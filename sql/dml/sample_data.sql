@@ -28,6 +28,9 @@ VALUES
     ((SELECT estabelecimento_id FROM estabelecimentos WHERE nome = 'Hospital Municipal Vila Nova Cachoeirinha'), 'Enfermeiro João Silva', '444.555.666-77', 'Enfermeiro', 'COREN-98765', '2017-09-05', '(11) 94444-5555', 'joao.enfermeiro@saude.gov.br'),
     ((SELECT estabelecimento_id FROM estabelecimentos WHERE nome = 'UPA Jabaquara'), 'Dra. Camila Oliveira', '555.666.777-88', 'Médica Emergencista', 'CRM-24680', '2020-02-18', '(11) 93333-4444', 'dra.camila@saude.gov.br');
 
+-- Senha de desenvolvimento dos funcionários de exemplo: sus12345 (hash bcrypt)
+UPDATE funcionarios SET senha_hash = '$2b$12$Fkxo4VTuURlA2fakv1y/tOmxxsFL4cK2DwP51C5IjbttXL8dSAIyq';
+
 -- Inserção de Prontuários
 INSERT INTO prontuarios (paciente_id, estabelecimento_id)
 VALUES
@@ -150,24 +153,29 @@ VALUES
      (SELECT funcionario_id FROM funcionarios WHERE cpf = '333.444.555-66'));
 
 -- Inserção de Histórico de Acesso
-INSERT INTO historico_acesso (prontuario_id, funcionario_id, tipo_acesso, ip_acesso)
+INSERT INTO historico_acesso (paciente_id, prontuario_id, funcionario_id, tipo_acesso, ip_acesso)
 VALUES
-    ((SELECT prontuario_id FROM prontuarios WHERE paciente_id = (SELECT paciente_id FROM pacientes WHERE cpf = '123.456.789-00')),
+    ((SELECT paciente_id FROM pacientes WHERE cpf = '123.456.789-00'),
+     (SELECT prontuario_id FROM prontuarios WHERE paciente_id = (SELECT paciente_id FROM pacientes WHERE cpf = '123.456.789-00')),
      (SELECT funcionario_id FROM funcionarios WHERE cpf = '111.222.333-44'),
      'Consulta', '192.168.1.100'),
     
-    ((SELECT prontuario_id FROM prontuarios WHERE paciente_id = (SELECT paciente_id FROM pacientes WHERE cpf = '987.654.321-00')),
+    ((SELECT paciente_id FROM pacientes WHERE cpf = '987.654.321-00'),
+     (SELECT prontuario_id FROM prontuarios WHERE paciente_id = (SELECT paciente_id FROM pacientes WHERE cpf = '987.654.321-00')),
      (SELECT funcionario_id FROM funcionarios WHERE cpf = '333.444.555-66'),
      'Consulta', '192.168.1.101'),
     
-    ((SELECT prontuario_id FROM prontuarios WHERE paciente_id = (SELECT paciente_id FROM pacientes WHERE cpf = '456.789.123-00')),
+    ((SELECT paciente_id FROM pacientes WHERE cpf = '456.789.123-00'),
+     (SELECT prontuario_id FROM prontuarios WHERE paciente_id = (SELECT paciente_id FROM pacientes WHERE cpf = '456.789.123-00')),
      (SELECT funcionario_id FROM funcionarios WHERE cpf = '555.666.777-88'),
      'Emergência', '192.168.1.102'),
     
-    ((SELECT prontuario_id FROM prontuarios WHERE paciente_id = (SELECT paciente_id FROM pacientes WHERE cpf = '123.456.789-00')),
+    ((SELECT paciente_id FROM pacientes WHERE cpf = '123.456.789-00'),
+     (SELECT prontuario_id FROM prontuarios WHERE paciente_id = (SELECT paciente_id FROM pacientes WHERE cpf = '123.456.789-00')),
      (SELECT funcionario_id FROM funcionarios WHERE cpf = '222.333.444-55'),
      'Atualização', '192.168.1.103'),
     
-    ((SELECT prontuario_id FROM prontuarios WHERE paciente_id = (SELECT paciente_id FROM pacientes WHERE cpf = '987.654.321-00')),
+    ((SELECT paciente_id FROM pacientes WHERE cpf = '987.654.321-00'),
+     (SELECT prontuario_id FROM prontuarios WHERE paciente_id = (SELECT paciente_id FROM pacientes WHERE cpf = '987.654.321-00')),
      (SELECT funcionario_id FROM funcionarios WHERE cpf = '444.555.666-77'),
      'Atualização', '192.168.1.104'); 
\ No newline at end of file
@@ -79,7 +79,8 @@ ORDER BY
 
 ----------------------------------------------
 -- CONSULTA 4: Listar todos os estabelecimentos com contagem de atendimentos nos últimos 30 dias
--- Otimização: Uso de índice em data_atendimento e agregação
+-- Otimização: Uso de índice em data_atendimento e agregação; só as partições de atendimentos
+-- dos últimos 30 dias são lidas (Subplans Removed no plano)
 ----------------------------------------------
 
 EXPLAIN ANALYZE
@@ -196,7 +197,7 @@ ORDER BY
 
 ----------------------------------------------
 -- CONSULTA 9: Buscar histórico de acesso aos prontuários (auditoria)
--- Otimização: Índices de tempo e filtro por período
+-- Otimização: Índices de tempo e filtro por período; só as partições do período são lidas
 ----------------------------------------------
 
 EXPLAIN ANALYZE
@@ -212,12 +213,10 @@ SELECT
 FROM 
     historico_acesso ha
 JOIN 
-    prontuarios pr ON ha.prontuario_id = pr.prontuario_id
-JOIN 
-    pacientes p ON pr.paciente_id = p.paciente_id
-JOIN 
+    pacientes p ON ha.paciente_id = p.paciente_id
+LEFT JOIN 
     funcionarios f ON ha.funcionario_id = f.funcionario_id
-JOIN 
+LEFT JOIN 
     estabelecimentos e ON f.estabelecimento_id = e.estabelecimento_id
 WHERE 
     ha.data_acesso BETWEEN CURRENT_DATE - INTERVAL '7 days' AND CURRENT_DATE
@@ -226,7 +225,8 @@ ORDER BY
 
 ----------------------------------------------
 -- CONSULTA 10: Estatísticas de diagnósticos mais frequentes
--- Otimização: Agregação e uso de function para normalizar diagnósticos
+-- Otimização: Agregação e uso de function para normalizar diagnósticos; só as partições
+-- dos últimos 90 dias são lidas
 ----------------------------------------------
 
 EXPLAIN ANALYZE
@@ -248,38 +248,9 @@ LIMIT 10;
 -- Otimização: Pré-processamento dos dados mais acessados
 ----------------------------------------------
 
--- Criação da view materializada
-CREATE MATERIALIZED VIEW IF NOT EXISTS mv_resumo_prontuarios AS
-SELECT 
-    p.paciente_id,
-    p.nome,
-    p.cpf,
-    p.sus_numero,
-    p.data_nascimento,
-    p.tipo_sanguineo,
-    pr.prontuario_id,
-    COUNT(DISTINCT a.atendimento_id) AS total_atendimentos,
-    MAX(a.data_atendimento) AS ultimo_atendimento,
-    COUNT(DISTINCT cv.vacinacao_id) AS total_vacinas,
-    COUNT(DISTINCT ex.exame_id) AS total_exames
-FROM 
-    pacientes p
-JOIN 
-    prontuarios pr ON p.paciente_id = pr.paciente_id
-LEFT JOIN 
-    atendimentos a ON pr.prontuario_id = a.prontuario_id
-LEFT JOIN 
-    carteira_vacinacao cv ON p.paciente_id = cv.paciente_id
-LEFT JOIN 
-    exames ex ON a.atendimento_id = ex.atendimento_id
-GROUP BY 
-    p.paciente_id, p.nome, p.cpf, p.sus_numero, p.data_nascimento, p.tipo_sanguineo, pr.prontuario_id
-WITH DATA;
-
--- Índice na view materializada
-CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_resumo_prontuarios_paciente_id ON mv_resumo_prontuarios(paciente_id);
-CREATE INDEX IF NOT EXISTS idx_mv_resumo_prontuarios_cpf ON mv_resumo_prontuarios(cpf);
-CREATE INDEX IF NOT EXISTS idx_mv_resumo_prontuarios_sus ON mv_resumo_prontuarios(sus_numero);
+-- A view materializada mv_resumo_prontuarios e seus índices são criados em
+-- ddl/schema.sql (uma linha por paciente, com as contagens agregadas separadamente)
+-- e atualizados pela API com REFRESH MATERIALIZED VIEW CONCURRENTLY
 
 -- Consulta usando a view materializada
 EXPLAIN ANALYZE
@@ -287,36 +258,27 @@ SELECT * FROM mv_resumo_prontuarios
 WHERE cpf = '123.456.789-00';
 
 ----------------------------------------------
--- PARTICIONAMENTO: Exemplo de tabela particionada para histórico de atendimentos
--- Otimização: Particionamento por data para grandes volumes de dados históricos
+-- PARTICIONAMENTO: atendimentos e historico_acesso por mês
+-- Otimização: Consultas por período leem apenas as partições do período
 ----------------------------------------------
 
--- Criação de tabela particionada (exemplo conceitual)
-/*
-CREATE TABLE atendimentos_particionado (
-    atendimento_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-    prontuario_id UUID NOT NULL,
-    funcionario_id UUID NOT NULL,
-    data_atendimento TIMESTAMP NOT NULL,
-    tipo_atendimento VARCHAR(50) NOT NULL,
-    descricao TEXT,
-    diagnostico TEXT,
-    observacoes TEXT
-) PARTITION BY RANGE (data_atendimento);
-
--- Partições por trimestre (exemplo)
-CREATE TABLE atendimentos_2023_q1 PARTITION OF atendimentos_particionado
-    FOR VALUES FROM ('2023-01-01') TO ('2023-04-01');
-    
-CREATE TABLE atendimentos_2023_q2 PARTITION OF atendimentos_particionado
-    FOR VALUES FROM ('2023-04-01') TO ('2023-07-01');
-    
-CREATE TABLE atendimentos_2023_q3 PARTITION OF atendimentos_particionado
-    FOR VALUES FROM ('2023-07-01') TO ('2023-10-01');
-    
-CREATE TABLE atendimentos_2023_q4 PARTITION OF atendimentos_particionado
-    FOR VALUES FROM ('2023-10-01') TO ('2024-01-01');
-*/
+-- As tabelas particionadas, as funções criar_particao_mensal e manter_particoes e as
+-- partições iniciais são criadas em ddl/schema.sql; a API cria as partições dos próximos
+-- meses e arquiva as antigas periodicamente. Para criar partições de meses anteriores
+-- (carga de dados históricos):
+-- SELECT criar_particao_mensal('atendimentos', mes::DATE)
+-- FROM generate_series(DATE '2015-01-01', DATE '2019-12-01', INTERVAL '1 month') mes;
+
+-- Manutenção manual: partições até 3 meses à frente e arquivamento (schema arquivo) das
+-- partições de histórico de acesso anteriores aos últimos 24 meses
+SELECT * FROM manter_particoes('historico_acesso', 3, 24);
+
+-- Partições lidas por uma consulta por período: como CURRENT_DATE só é conhecido na
+-- execução, as demais são removidas na inicialização do plano ("Subplans Removed")
+EXPLAIN (COSTS OFF)
+SELECT COUNT(*)
+FROM atendimentos
+WHERE data_atendimento >= CURRENT_DATE - INTERVAL '30 days';
 
 ----------------------------------------------
 -- ÍNDICES ADICIONAIS: Estratégias para melhorar performance
@@ -328,11 +290,12 @@ CREATE INDEX IF NOT EXISTS idx_atendimentos_data_tipo ON atendimentos(data_atend
 -- Índice para buscas por diagnóstico
 CREATE INDEX IF NOT EXISTS idx_atendimentos_diagnostico ON atendimentos(diagnostico);
 
--- Índice para buscas de pacientes por nome (usando índice de texto para busca parcial)
+-- Índice para buscas de pacientes por prefixo do nome (LIKE 'Maria%'); buscas por
+-- qualquer trecho do nome usam idx_pacientes_nome_trgm (schema.sql)
 CREATE INDEX IF NOT EXISTS idx_pacientes_nome ON pacientes(nome text_pattern_ops);
 
--- Índice para pesquisa de histórico por intervalo de datas
-CREATE INDEX IF NOT EXISTS idx_historico_acesso_data ON historico_acesso(data_acesso);
+-- Índice para pesquisa de histórico por intervalo de datas: idx_historico_acesso_data,
+-- criado em ddl/schema.sql (replicado em cada partição)
 
 -- Índice para prescrições por data
 CREATE INDEX IF NOT EXISTS idx_prescricoes_data ON prescricoes(data_prescricao);
@@ -340,6 +303,8 @@ CREATE INDEX IF NOT EXISTS idx_prescricoes_data ON prescricoes(data_prescricao);
 ----------------------------------------------
 -- FUNÇÃO: Obter prontuário completo de um paciente
 -- Otimização: Função PL/pgSQL para simplificar a obtenção de dados complexos
+-- Atenção: as junções ON TRUE multiplicam as linhas (atendimentos x prescrições x exames
+-- x vacinações). A API usa GET /prontuarios/completo, que lê cada coleção separadamente.
 ----------------------------------------------
 
 CREATE OR REPLACE FUNCTION obter_prontuario_completo(p_cpf VARCHAR)